@@ -0,0 +1,195 @@
+"""
+오디오 디코딩과 전처리
+- 업로드된 오디오 바이트를 임시 파일 없이 메모리에서 바로 디코딩
+  WAV/FLAC/OGG/MP3는 soundfile(libsndfile)로, webm(MediaRecorder 녹음)과 libsndfile이 읽지 못하는 형식은 ffmpeg 파이프로 디코딩
+- (원본 레이트, 목표 레이트, dtype, 디바이스)별로 캐시한 리샘플러와 모노 변환/정규화 전처리
+"""
+import io
+import shutil
+import subprocess
+import threading
+
+import numpy as np
+import torch
+import torchaudio
+
+try:
+    import soundfile as sf
+except ImportError:  # soundfile이 없으면 모든 형식을 ffmpeg로 디코딩
+    sf = None
+
+# webm/mkv(EBML) 컨테이너 시작 바이트
+EBML_MAGIC = b'\x1a\x45\xdf\xa3'
+
+
+def _decode_soundfile(audio_bytes):
+    """soundfile로 디코딩 -> ([채널, 샘플] float32, 샘플링 레이트)"""
+    audio, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype='float32', always_2d=True)
+    return np.ascontiguousarray(audio.T), sample_rate
+
+
+def _decode_ffmpeg(audio_bytes, sample_rate):
+    """ffmpeg 표준 입출력 파이프로 모노 float32 PCM 디코딩 (sample_rate로 리샘플링)"""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to decode this audio format but was not found on PATH")
+
+    command = [
+        ffmpeg, '-nostdin', '-hide_banner', '-loglevel', 'error',
+        '-i', 'pipe:0',
+        '-ac', '1', '-ar', str(sample_rate),
+        '-f', 'f32le', 'pipe:1',
+    ]
+    process = subprocess.run(command, input=audio_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode audio: {process.stderr.decode(errors='replace').strip()}")
+
+    audio = np.frombuffer(process.stdout, dtype='<f4')
+    return audio.reshape(1, -1), sample_rate
+
+
+def decode_audio_bytes(audio_bytes, sample_rate: int = 16000):
+    """
+    오디오 바이트를 메모리에서 디코딩 (디스크에 파일을 쓰지 않음)
+    형식은 파일 이름이 아니라 내용으로 판별
+
+    Args:
+        audio_bytes: bytes, bytearray 또는 memoryview
+        sample_rate: ffmpeg로 디코딩할 때의 출력 샘플링 레이트 (soundfile은 원본 레이트 유지)
+
+    Returns:
+        (np.ndarray, int): [채널, 샘플] float32 오디오 (-1 ~ 1), 샘플링 레이트
+    """
+    if len(audio_bytes) == 0:
+        raise ValueError("empty audio data")
+
+    if sf is not None and bytes(memoryview(audio_bytes)[:4]) != EBML_MAGIC:
+        try:
+            return _decode_soundfile(audio_bytes)
+        except RuntimeError:
+            # libsndfile이 지원하지 않는 코덱 (예: 오래된 버전의 Opus)
+            pass
+
+    return _decode_ffmpeg(audio_bytes, sample_rate)
+
+
+# (orig_sr, target_sr, dtype, device) -> torchaudio.transforms.Resample (sinc 커널을 한 번만 계산)
+_resamplers = {}
+_resamplers_lock = threading.Lock()
+
+
+def get_resampler(orig_sr: int, target_sr: int, dtype=torch.float32, device="cpu"):
+    """캐시된 리샘플러 (처음 요청된 조합만 커널을 만들어 디바이스로 옮김)"""
+    key = (int(orig_sr), int(target_sr), dtype, torch.device(device))
+    resampler = _resamplers.get(key)
+    if resampler is None:
+        with _resamplers_lock:
+            resampler = _resamplers.get(key)
+            if resampler is None:
+                resampler = torchaudio.transforms.Resample(key[0], key[1], dtype=dtype).to(key[3])
+                _resamplers[key] = resampler
+    return resampler
+
+
+def resample(waveform: torch.Tensor, orig_sr: int, target_sr: int = 16000) -> torch.Tensor:
+    """waveform의 dtype과 디바이스에서 캐시된 리샘플러로 리샘플링 (레이트가 같으면 그대로 반환)"""
+    if orig_sr == target_sr:
+        return waveform
+    return get_resampler(orig_sr, target_sr, waveform.dtype, waveform.device)(waveform)
+
+
+def prepare_waveform(waveform, sample_rate: int, target_sr: int = 16000, device=None) -> torch.Tensor:
+    """
+    모델 입력용 전처리: float32 변환, 모노 변환, 리샘플링, 피크 정규화
+    리샘플링은 선형 연산이므로 모노로 먼저 합쳐 계산량을 줄이고, 새로 만든 텐서에는 제자리 연산을 써서 추가 복사를 하지 않음
+    (입력 텐서는 수정하지 않음)
+    
+    Args:
+        waveform: [채널, 샘플] 또는 [샘플] torch.Tensor / np.ndarray
+        sample_rate: 입력 샘플링 레이트
+        target_sr: 목표 샘플링 레이트
+        device: 전처리를 수행할 디바이스 (None이면 입력 텐서의 디바이스)
+    
+    Returns:
+        torch.Tensor: [샘플] float32 (-1 ~ 1)
+    """
+    if isinstance(waveform, np.ndarray):
+        waveform = torch.from_numpy(waveform)
+
+    source = waveform
+    device = torch.device(device) if device is not None else waveform.device
+    waveform = waveform.to(device=device, dtype=torch.float32)
+    owned = waveform is not source
+
+    # 스테레오를 모노로 변환 (단일 채널이면 복사 없이 뷰 사용)
+    if waveform.dim() > 1:
+        if waveform.shape[0] == 1:
+            waveform = waveform[0]
+        else:
+            waveform = waveform.mean(dim=0)
+            owned = True
+
+    if sample_rate != target_sr:
+        waveform = get_resampler(sample_rate, target_sr, torch.float32, device)(waveform)
+        owned = True
+
+    # 볼륨 정규화 (abs() 임시 텐서 없이 최솟값/최댓값으로 피크 계산)
+    if waveform.numel() > 0:
+        low, high = torch.aminmax(waveform)
+        peak = torch.maximum(-low, high)
+        if peak > 0:
+            waveform = waveform.div_(peak) if owned else waveform / peak
+
+    return waveform
+
+
+def frame_energy_db(audio: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """프레임별 RMS 에너지 (dB), 복사 없는 프레임 뷰로 한 번에 계산"""
+    if len(audio) < frame_length:
+        audio = np.pad(audio, (0, frame_length - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_length)[::hop_length]
+    energy = np.einsum('ij,ij->i', frames, frames) / frame_length
+    return 10 * np.log10(energy + 1e-10)
+
+
+def speech_segments(audio: np.ndarray, sample_rate: int, threshold_db: float = -35, pad_ms: float = 200,
+                    min_pause_ms: float = None, frame_ms: float = 30, hop_ms: float = 10) -> list:
+    """
+    에너지 기반 VAD로 찾은 음성 구간
+    가장 큰 프레임보다 threshold_db 이상 작지 않은 프레임을 음성으로 보고, 앞뒤로 pad_ms만큼 넓힘
+    
+    Args:
+        audio: [샘플] 오디오
+        sample_rate: 샘플링 레이트
+        threshold_db: 가장 큰 프레임 대비 음성으로 보는 에너지 (dB, 음수)
+        pad_ms: 음성 구간 앞뒤로 남기는 여유 (ms)
+        min_pause_ms: 이보다 긴 쉼에서 구간을 나눔 (None이면 앞뒤 무음만 자른 구간 하나)
+    
+    Returns:
+        list[(int, int)]: 음성 구간 (시작, 끝) 샘플 위치, 음성이 없으면 빈 목록
+    """
+    frame_length = int(sample_rate * frame_ms / 1000)
+    hop_length = int(sample_rate * hop_ms / 1000)
+    energy = frame_energy_db(audio, frame_length, hop_length)
+    speech = energy > energy.max() + threshold_db
+
+    # 앞뒤 여유만큼 음성 프레임 확장 (짧은 쉼은 이 과정에서 메워짐)
+    pad = int(pad_ms / hop_ms)
+    if pad:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode='same') > 0
+    if not speech.any():
+        return []
+
+    # 음성 구간의 시작/끝 프레임 (끝은 포함하지 않음)
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], speech.astype(np.int8), [0]])))
+    starts, ends = edges[::2], edges[1::2]
+    if min_pause_ms is None:
+        starts, ends = starts[:1], ends[-1:]
+    else:
+        long_pause = (starts[1:] - ends[:-1]) * hop_ms >= min_pause_ms
+        starts = starts[np.concatenate([[True], long_pause])]
+        ends = ends[np.concatenate([long_pause, [True]])]
+
+    sample_starts = starts * hop_length
+    sample_ends = np.minimum((ends - 1) * hop_length + frame_length, len(audio))
+    return list(zip(sample_starts.tolist(), sample_ends.tolist()))
@@ -0,0 +1,208 @@
+"""
+Wav2Vec2 전사 요청 마이크로 배칭 스케줄러
+동시에 들어온 요청을 최대 max_wait_ms 동안 또는 max_batch_seconds 분량의 오디오가 모일 때까지 모아
+Wav2Vec2.transcribe_batch 한 번으로 추론하고, 요청마다 자기 future로 결과를 받음
+배칭은 설정의 batch.micro_batching으로 켬 (끄면 요청을 하나씩 순서대로 추론)
+
+사용 예:
+    scheduler = BatchScheduler(Wav2Vec2(config))
+    async with scheduler:
+        text = await scheduler.transcribe_bytes(audio_bytes)
+"""
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_io import decode_audio_bytes
+from transcript_cache import audio_sha256
+
+
+class BatchScheduler:
+    """
+    asyncio 기반 동적 배치 스케줄러
+    추론은 단일 작업 스레드에서 실행하므로 이벤트 루프는 막히지 않고, 모델은 한 번에 한 배치만 처리
+    """
+
+    def __init__(self, model, max_wait_ms: float = 20, max_batch_seconds: float = None, max_batch_size: int = 32,
+                 micro_batching: bool = None):
+        self.model = model
+        self.max_batch_seconds = max_batch_seconds or model.max_batch_seconds
+
+        # 패딩이 늘리는 연산을 병렬로 흡수할 하드웨어(GPU 등)가 없으면 배칭이 더 느리므로 설정으로 켬
+        if micro_batching is None:
+            micro_batching = model.config.get("batch", {}).get("micro_batching", False)
+        self.micro_batching = micro_batching
+        self.max_wait = max_wait_ms / 1000 if micro_batching else 0
+        self.max_batch_size = max_batch_size if micro_batching else 1
+
+        self._queue = None
+        self._carry = None      # 예산을 넘어 다음 배치로 넘긴 요청
+        self._batch = []        # 모으는 중이거나 추론 중인 배치의 요청
+        self._worker = None
+        self._executor = None
+
+        # 배치를 만들 때의 대기열 길이와 배치 크기 분포
+        self.queue_depth_histogram = Counter()
+        self.batch_size_histogram = Counter()
+        self.batch_seconds_total = 0.0
+        self.requests_total = 0
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def start(self):
+        """배치 작업 태스크 시작 (실행 중인 이벤트 루프 안에서 호출)"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            # close()에서 종료한 작업 스레드는 다시 시작할 때 새로 만듦
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wav2vec2-batch")
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """배치 작업 태스크 종료 (모으는 중이거나 추론 중인 배치를 포함해 끝나지 않은 요청은 모두 취소)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        pending = list(self._batch)
+        if self._carry is not None:
+            pending.append(self._carry)
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for request in pending:
+            request[3].cancel()
+        self._batch = []
+        self._carry = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        """배치를 기다리는 요청 수"""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return depth + (self._carry is not None)
+
+    async def transcribe(self, waveform, sample_rate: int) -> str:
+        """waveform ([채널, 샘플] 또는 [샘플])을 다음 배치에 넣고 전사 결과를 기다림"""
+        if self._worker is None:
+            self.start()
+
+        seconds = waveform.shape[-1] / sample_rate
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((waveform, sample_rate, seconds, future))
+        return await future
+
+    async def transcribe_bytes(self, audio_bytes: bytes) -> str:
+        """업로드된 오디오 바이트를 디코딩해 다음 배치에 넣음 (전사 결과 캐시에 있으면 바로 반환)"""
+        audio_hash = audio_sha256(audio_bytes) if self.model.transcript_cache is not None else None
+        if audio_hash is not None:
+            cached = (await asyncio.to_thread(self.model.cached_transcripts, [audio_hash]))[0]
+            if cached is not None:
+                return cached
+
+        waveform, sample_rate = await asyncio.to_thread(decode_audio_bytes, audio_bytes, self.model.sampling_rate)
+        text = await self.transcribe(waveform, sample_rate)
+        if audio_hash is not None:
+            await asyncio.to_thread(self.model.store_transcripts, [audio_hash], [text])
+        return text
+
+    async def _next_batch(self):
+        """첫 요청을 기다린 뒤, max_wait 동안 또는 예산이 찰 때까지 요청을 모음"""
+        first = self._carry if self._carry is not None else await self._queue.get()
+        self._carry = None
+        self.queue_depth_histogram[self._queue.qsize() + 1] += 1
+
+        # close()에서 취소할 수 있도록 모으는 중인 배치도 self._batch에 둠
+        batch = self._batch = [first]
+        seconds = first[2]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if seconds + request[2] > self.max_batch_seconds:
+                self._carry = request
+                break
+            batch.append(request)
+            seconds += request[2]
+        return batch, seconds
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, seconds = await self._next_batch()
+
+            # 기다리는 동안 취소된 요청은 제외
+            batch = self._batch = [request for request in batch if not request[3].cancelled()]
+            if not batch:
+                continue
+            self.batch_size_histogram[len(batch)] += 1
+            self.batch_seconds_total += seconds
+            self.requests_total += len(batch)
+
+            try:
+                texts = await self._transcribe(loop, batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    if not batch[0][3].done():
+                        batch[0][3].set_exception(e)
+                else:
+                    # 손상된 업로드 하나가 같은 배치의 다른 요청까지 실패시키지 않도록 요청마다 다시 추론
+                    await self._retry_singly(loop, batch)
+                self._batch = []
+                continue
+
+            for request, text in zip(batch, texts):
+                if not request[3].done():
+                    request[3].set_result(text)
+            self._batch = []
+
+    def _transcribe(self, loop, batch):
+        return loop.run_in_executor(
+            self._executor,
+            self.model.transcribe_batch,
+            [request[0] for request in batch],
+            [request[1] for request in batch],
+            self.max_batch_seconds,
+        )
+
+    async def _retry_singly(self, loop, batch):
+        """배치 추론이 실패하면 요청을 하나씩 추론해 요청마다 결과나 예외를 따로 전달"""
+        for request in batch:
+            if request[3].done():
+                continue
+            try:
+                text = (await self._transcribe(loop, [request]))[0]
+            except Exception as e:
+                if not request[3].done():
+                    request[3].set_exception(e)
+                continue
+            if not request[3].done():
+                request[3].set_result(text)
+
+    def stats(self) -> dict:
+        """대기열 길이와 배치 크기 분포"""
+        batches = sum(self.batch_size_histogram.values())
+        return {
+            "queue_depth": self.queue_depth,
+            "requests": self.requests_total,
+            "batches": batches,
+            "mean_batch_size": self.requests_total / batches if batches else 0.0,
+            "mean_batch_seconds": self.batch_seconds_total / batches if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+            "queue_depth_histogram": dict(sorted(self.queue_depth_histogram.items())),
+        }
@@ -0,0 +1,111 @@
+"""
+BatchScheduler 부하 생성기
+동시 클라이언트 여러 개가 전사 요청을 보내는 상황에서 요청마다 forward를 한 번씩 하는 기존 방식과
+마이크로 배칭 스케줄러의 처리량(요청/초)과 지연 시간을 비교
+
+사용법: python bench_batch_scheduler.py [--requests 64] [--concurrency 8] [--audio data/stt_test.wav]
+                                       [--max-wait-ms 20] [--max-batch-seconds 60]
+"""
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+import yaml
+
+from audio_io import decode_audio_bytes
+from batch_scheduler import BatchScheduler
+from wav2vec2 import Wav2Vec2
+
+
+def make_requests(args, sampling_rate):
+    """요청 오디오 목록 (--audio가 있으면 파일 앞부분을 무작위 길이로 자름, 없으면 무작위 잡음)"""
+    rng = random.Random(0)
+    if args.audio:
+        with open(args.audio, 'rb') as f:
+            waveform, sample_rate = decode_audio_bytes(f.read(), sampling_rate)
+        waveform = torch.from_numpy(waveform)
+    else:
+        sample_rate = sampling_rate
+        waveform = torch.randn(1, int(args.max_seconds * sample_rate)) * 0.1
+
+    requests = []
+    for _ in range(args.requests):
+        seconds = rng.uniform(args.min_seconds, args.max_seconds)
+        requests.append((waveform[:, :int(seconds * sample_rate)], sample_rate))
+    return requests
+
+
+async def run_clients(requests, concurrency, transcribe):
+    """concurrency개 클라이언트가 요청을 나눠 보내고 (전체 시간, 요청별 지연 시간) 반환"""
+    queue = list(requests)
+    latencies = []
+
+    async def client():
+        while queue:
+            waveform, sample_rate = queue.pop()
+            start = time.perf_counter()
+            await transcribe(waveform, sample_rate)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(name, elapsed, latencies):
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:>12}: {len(latencies) / elapsed:7.2f} req/s, p50 {p50 * 1e3:7.1f}ms, p95 {p95 * 1e3:7.1f}ms")
+
+
+async def main_async(args):
+    with open(args.config, 'r') as file:
+        config = yaml.safe_load(file)
+    if args.device:
+        config["model"]["device"] = args.device
+    model = Wav2Vec2(config=config)
+    requests = make_requests(args, model.sampling_rate)
+
+    # 예열 (첫 forward의 초기화 비용 제외)
+    model.transcribe_batch([w for w, _ in requests[:2]], [sr for _, sr in requests[:2]])
+
+    # 기존 방식: 요청마다 한 번의 forward (모델은 한 스레드에서 순서대로 사용)
+    executor = ThreadPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+
+    async def per_request(waveform, sample_rate):
+        return await loop.run_in_executor(executor, model.transcribe_array, waveform, sample_rate)
+
+    report("per-request", *await run_clients(requests, args.concurrency, per_request))
+    executor.shutdown()
+
+    scheduler = BatchScheduler(model, max_wait_ms=args.max_wait_ms, max_batch_seconds=args.max_batch_seconds,
+                               micro_batching=True)
+    async with scheduler:
+        report("micro-batch", *await run_clients(requests, args.concurrency, scheduler.transcribe))
+        stats = scheduler.stats()
+
+    print(f"평균 배치 크기: {stats['mean_batch_size']:.2f}, 평균 배치 길이: {stats['mean_batch_seconds']:.1f}s")
+    print(f"배치 크기 분포: {stats['batch_size_histogram']}")
+    print(f"대기열 길이 분포: {stats['queue_depth_histogram']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BatchScheduler load generator")
+    parser.add_argument("--config", default="data/config/wav2vec2.yaml", help="Wav2Vec2 설정 파일")
+    parser.add_argument("--device", default=None, help="설정의 디바이스 대신 사용할 디바이스")
+    parser.add_argument("--audio", default=None, help="요청 오디오로 쓸 파일 (없으면 무작위 잡음)")
+    parser.add_argument("--requests", type=int, default=64, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--min-seconds", type=float, default=2.0, help="요청 오디오 최소 길이 (초)")
+    parser.add_argument("--max-seconds", type=float, default=8.0, help="요청 오디오 최대 길이 (초)")
+    parser.add_argument("--max-wait-ms", type=float, default=20, help="배치를 모으는 최대 대기 시간")
+    parser.add_argument("--max-batch-seconds", type=float, default=None, help="배치당 최대 오디오 길이 (초)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
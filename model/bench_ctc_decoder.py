@@ -0,0 +1,115 @@
+"""
+CTC 디코더 지연 시간 / CRR 벤치마크
+목표 문장에서 만든 모의 CTC 출력(일부 음절은 비슷한 음절이 더 높은 점수를 받도록 섞음)을
+greedy, 빔 크기별 beam search, 목표 문장 편향 beam search로 디코딩해 CRR과 발화당 디코딩 시간 비교
+('다른 문장 편향'은 학습자가 목표와 다른 문장을 읽었을 때 편향이 결과를 목표 쪽으로 끌어당기는 정도)
+
+사용법: python bench_ctc_decoder.py [--confusion 0.3] [--beams 4 8 16] [--repeat 5] [--model-id MODEL]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from cer_module import calculate_korean_crr_batch
+from ctc_decoder import CTCBeamSearchDecoder
+
+SENTENCES = [
+    "제가 스웨덴에서 왔고 한국에 공부하러 왔어요",
+    "밝기를 조절할게요",
+    "오늘 학교에서 밥을 먹고 집에 와서 게임을 했다",
+    "나의 친구가 파일 세 개를 다운받고 있다",
+    "물렁하게 해 줄게요",
+    "주말에 가족과 함께 바다에 갈 거예요",
+    "이 책은 생각보다 재미있었어요",
+    "지하철역까지 어떻게 가는지 알려 주세요",
+]
+
+
+def make_tokenizer(model_id=None):
+    """모델 어휘 또는 벤치마크 문장 음절로 만든 CTC 토크나이저"""
+    from transformers import Wav2Vec2CTCTokenizer
+
+    if model_id:
+        return Wav2Vec2CTCTokenizer.from_pretrained(model_id)
+
+    vocab = {"<pad>": 0, "<unk>": 1, "|": 2}
+    for char in sorted(set("".join(SENTENCES).replace(" ", ""))):
+        vocab[char] = len(vocab)
+    vocab_path = os.path.join(tempfile.mkdtemp(), "vocab.json")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        json.dump(vocab, f, ensure_ascii=False)
+    return Wav2Vec2CTCTokenizer(vocab_path, unk_token="<unk>", pad_token="<pad>", word_delimiter_token="|")
+
+
+def simulate_logits(sentence, tokenizer, confusion, rng):
+    """
+    음절마다 (blank, 음절 1~2프레임) 구간을 만든 모의 CTC 로짓
+    confusion 확률로 어휘에서 코드 포인트가 가까운 다른 음절이 정답보다 약간 높은 점수를 받음
+    """
+    vocab = tokenizer.get_vocab()
+    syllables = sorted(token for token in vocab if len(token) == 1 and "가" <= token <= "힣")
+    frames = []
+    for char in " ".join(sentence.split()):
+        token_id = vocab["|"] if char == " " else vocab.get(char, vocab["<unk>"])
+        blank = np.random.normal(0, 1, len(vocab))
+        blank[tokenizer.pad_token_id] += 8
+        frames.append(blank)
+        for _ in range(rng.choice((1, 2))):
+            frame = np.random.normal(0, 1, len(vocab))
+            frame[token_id] += 6
+            if char != " " and rng.random() < confusion:
+                position = syllables.index(char)
+                neighbor = syllables[min(len(syllables) - 1, max(0, position + rng.choice((-2, -1, 1, 2))))]
+                frame[vocab[neighbor]] += 7
+            frames.append(frame)
+    return np.stack(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CTC decoder latency / CRR benchmark")
+    parser.add_argument("--confusion", type=float, default=0.3, help="비슷한 음절이 정답보다 높은 점수를 받는 확률")
+    parser.add_argument("--beams", type=int, nargs="+", default=[4, 8, 16], help="측정할 빔 크기")
+    parser.add_argument("--repeat", type=int, default=5, help="문장별 모의 발화 수")
+    parser.add_argument("--model-id", default=None, help="어휘를 가져올 모델 (기본값: 벤치마크 문장 음절)")
+    args = parser.parse_args()
+
+    tokenizer = make_tokenizer(args.model_id)
+    rng = random.Random(0)
+    np.random.seed(0)
+    utterances = [(sentence, simulate_logits(sentence, tokenizer, args.confusion, rng))
+                  for sentence in SENTENCES for _ in range(args.repeat)]
+    references = [sentence for sentence, _ in utterances]
+    other_targets = [SENTENCES[(SENTENCES.index(sentence) + 1) % len(SENTENCES)] for sentence in references]
+
+    def greedy(logits, target):
+        ids = logits.argmax(axis=-1)
+        return tokenizer.decode(ids).strip()
+
+    decoders = [("greedy", greedy)]
+    for beam in args.beams:
+        decoder = CTCBeamSearchDecoder(tokenizer, beam_width=beam)
+        decoders.append((f"beam {beam}", lambda logits, target, d=decoder: d.decode(logits)))
+        decoders.append((f"beam {beam} + bias", lambda logits, target, d=decoder: d.decode(logits, targets=target)))
+
+    print(f"{'decoder':>18} {'CRR':>8} {'CRR(다른 문장 편향)':>18} {'ms/utt':>8}")
+    for name, decode in decoders:
+        start = time.perf_counter()
+        hypotheses = [decode(logits, sentence) for sentence, logits in utterances]
+        elapsed = (time.perf_counter() - start) / len(utterances)
+        crr = calculate_korean_crr_batch(references, hypotheses)["micro_crr"]
+
+        if name.endswith("bias"):
+            mismatched = [decode(logits, other) for (_, logits), other in zip(utterances, other_targets)]
+            mismatched_crr = f"{calculate_korean_crr_batch(references, mismatched)['micro_crr']:.2%}"
+        else:
+            mismatched_crr = "-"
+        print(f"{name:>18} {crr:>8.2%} {mismatched_crr:>18} {elapsed * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+EnhancedG2p 시작 시간 벤치마크
+새 프로세스마다 import, 인스턴스 생성, 첫 변환까지 걸리는 시간을 측정해
+g2pk2 G2p(생성 시 MeCab/규칙표/CMU 사전 로드)와 지연 로드 + 규칙표 스냅샷을 비교
+
+사용법: python bench_g2p_startup.py [--repeat 5] [--snapshot /tmp/g2p_rules.pkl]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SENTENCE = "밝기를 조절할게요"
+# 영어 단어가 있는 문장 (CMU 사전 로드 시점)
+ENGLISH_SENTENCE = "나의 친구가 mp3 file 3개를 다운받고 있다"
+
+# 측정용 자식 프로세스 코드 ({setup}: 인스턴스 생성 코드)
+CHILD_TEMPLATE = """
+import json, time
+start = time.perf_counter()
+from enhanced_g2pk import EnhancedG2p, OriginalG2p
+imported = time.perf_counter()
+g2p = {setup}
+created = time.perf_counter()
+g2p({sentence!r})
+converted = time.perf_counter()
+g2p({english_sentence!r})
+english = time.perf_counter()
+print(json.dumps({{"import": imported - start, "init": created - imported,
+                  "first_call": converted - created, "first_english": english - converted}}))
+"""
+
+
+def measure(setup, repeat):
+    """새 프로세스에서 repeat번 측정한 단계별 최소 시간 (초)"""
+    code = CHILD_TEMPLATE.format(setup=setup, sentence=SENTENCE, english_sentence=ENGLISH_SENTENCE)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True,
+                                capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {stage: min(run[stage] for run in runs) for stage in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EnhancedG2p startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="설정별 프로세스 실행 횟수")
+    parser.add_argument("--snapshot", default=None, help="규칙표 스냅샷 경로 (기본값: 임시 파일)")
+    args = parser.parse_args()
+
+    snapshot_path = args.snapshot or os.path.join(tempfile.gettempdir(), "bench_g2p_rules.pkl")
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+
+    # 첫 실행에서 스냅샷을 만들고 이후 실행은 스냅샷을 읽음
+    measure(f"EnhancedG2p(snapshot_path={snapshot_path!r})", 1)
+
+    configs = (
+        ("g2pk2 G2p", "OriginalG2p()"),
+        ("lazy", "EnhancedG2p()"),
+        ("lazy+snapshot", f"EnhancedG2p(snapshot_path={snapshot_path!r})"),
+    )
+    # total: import부터 첫 (한국어) 변환까지
+    print(f"{'':>14} {'import':>9} {'init':>9} {'first call':>11} {'total':>9} {'first english':>14}")
+    for name, setup in configs:
+        times = measure(setup, args.repeat)
+        total = times['import'] + times['init'] + times['first_call']
+        print(f"{name:>14} {times['import'] * 1e3:7.1f}ms {times['init'] * 1e3:7.1f}ms "
+              f"{times['first_call'] * 1e3:9.1f}ms {total * 1e3:7.1f}ms {times['first_english'] * 1e3:12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
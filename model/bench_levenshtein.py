@@ -0,0 +1,94 @@
+"""
+calculate_levenshtein 마이크로 벤치마크
+기존 순수 파이썬 구현(셀마다 튜플 할당)과 새 커널들을 10~500 음절 입력에서 비교
+
+사용법: python bench_levenshtein.py [--repeat 5]
+"""
+import argparse
+import random
+import timeit
+
+from cer_module import calculate_levenshtein, _levenshtein_python, _levenshtein_numpy
+
+LENGTHS = [10, 50, 100, 200, 500]
+
+
+def legacy_levenshtein(u, v):
+    """기존 calculate_levenshtein 구현 (비교 기준)"""
+    prev = None
+    curr = [0] + list(range(1, len(v) + 1))
+    prev_ops = None
+    curr_ops = [(0, 0, i) for i in range(len(v) + 1)]
+
+    for x in range(1, len(u) + 1):
+        prev, curr = curr, [x] + ([None] * len(v))
+        prev_ops, curr_ops = curr_ops, [(0, x, 0)] + ([None] * len(v))
+
+        for y in range(1, len(v) + 1):
+            delcost = prev[y] + 1
+            addcost = curr[y - 1] + 1
+            subcost = prev[y - 1] + int(u[x - 1] != v[y - 1])
+
+            curr[y] = min(subcost, delcost, addcost)
+
+            if curr[y] == subcost:
+                (n_s, n_d, n_i) = prev_ops[y - 1]
+                curr_ops[y] = (n_s + int(u[x - 1] != v[y - 1]), n_d, n_i)
+            elif curr[y] == delcost:
+                (n_s, n_d, n_i) = prev_ops[y]
+                curr_ops[y] = (n_s, n_d + 1, n_i)
+            else:
+                (n_s, n_d, n_i) = curr_ops[y - 1]
+                curr_ops[y] = (n_s, n_d, n_i + 1)
+
+    return curr[len(v)], curr_ops[len(v)]
+
+
+def make_pair(length, error_rate=0.15, seed=0):
+    """무작위 한글 음절 정답 문장과 일부 음절을 대체/삭제/삽입한 예측 문장 생성"""
+    rng = random.Random(seed + length)
+    syllables = [chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(40)]
+    ref = [rng.choice(syllables) for _ in range(length)]
+    hyp = []
+    for char in ref:
+        r = rng.random()
+        if r < error_rate / 3:
+            hyp.append(rng.choice(syllables))
+        elif r < error_rate * 2 / 3:
+            continue
+        elif r < error_rate:
+            hyp.extend([char, rng.choice(syllables)])
+        else:
+            hyp.append(char)
+    return hyp, ref
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Levenshtein kernel micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="입력 길이별 반복 횟수")
+    args = parser.parse_args()
+
+    kernels = [
+        ("legacy", legacy_levenshtein),
+        ("python", _levenshtein_python),
+        ("numpy", _levenshtein_numpy),
+        ("dispatch", calculate_levenshtein),
+    ]
+
+    print(f"{'length':>6} " + " ".join(f"{name:>12}" for name, _ in kernels) + f" {'speedup':>8}")
+    for length in LENGTHS:
+        hyp, ref = make_pair(length)
+        expected = legacy_levenshtein(hyp, ref)
+
+        timings = []
+        for name, kernel in kernels:
+            assert kernel(hyp, ref) == expected, f"{name} 결과 불일치 (length={length})"
+            seconds = min(timeit.repeat(lambda: kernel(hyp, ref), number=1, repeat=args.repeat))
+            timings.append(seconds)
+
+        speedup = timings[0] / timings[-1]
+        print(f"{length:>6} " + " ".join(f"{t * 1000:>10.3f}ms" for t in timings) + f" {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
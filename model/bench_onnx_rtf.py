@@ -0,0 +1,58 @@
+"""
+CPU 실시간 배율(RTF) 벤치마크
+torch(fp32), ONNX Runtime(fp32), ONNX Runtime(int8) 백엔드로 같은 오디오를 전사해 처리 시간 / 오디오 길이 비교
+(RTF < 1이면 실시간보다 빠름)
+
+사용법: python bench_onnx_rtf.py [--onnx-path data/onnx/wav2vec2-korean-finetuned2] [--seconds 5 10 30] [--repeat 3]
+"""
+import argparse
+import time
+
+import torch
+import yaml
+
+from wav2vec2 import Wav2Vec2
+
+
+def measure_rtf(model, waveform, sample_rate, repeat):
+    """repeat번 전사한 최소 시간 / 오디오 길이"""
+    model.transcribe_array(waveform, sample_rate)  # 예열
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.transcribe_array(waveform, sample_rate)
+        best = min(best, time.perf_counter() - start)
+    return best / (waveform.shape[-1] / sample_rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU real-time-factor benchmark for the wav2vec2 backends")
+    parser.add_argument("--config", default="data/config/wav2vec2.yaml", help="Wav2Vec2 설정 파일")
+    parser.add_argument("--onnx-path", default=None, help="ONNX 모델 디렉터리 (기본값: 설정의 onnx_path)")
+    parser.add_argument("--seconds", type=float, nargs="+", default=[5, 10, 30], help="측정할 오디오 길이 (초)")
+    parser.add_argument("--repeat", type=int, default=3, help="길이별 반복 횟수")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as file:
+        config = yaml.safe_load(file)
+    onnx_path = args.onnx_path or config["model"]["onnx_path"]
+
+    backends = {
+        "torch": {"backend": "torch", "device": "cpu"},
+        "onnx": {"backend": "onnx", "onnx_path": onnx_path, "quantize": False},
+        "onnx-int8": {"backend": "onnx", "onnx_path": onnx_path, "quantize": True},
+    }
+    models = {name: Wav2Vec2(config={**config, "model": {**config["model"], **options}})
+              for name, options in backends.items()}
+
+    sample_rate = config["model"]["sampling_rate"]
+    torch.manual_seed(0)
+    print(f"{'seconds':>8}" + "".join(f"{name:>12}" for name in models))
+    for seconds in args.seconds:
+        waveform = torch.randn(1, int(seconds * sample_rate)) * 0.1
+        rtfs = [measure_rtf(model, waveform, sample_rate, args.repeat) for model in models.values()]
+        print(f"{seconds:>8.1f}" + "".join(f"{rtf:>12.3f}" for rtf in rtfs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Wav2Vec2.transcribe_from_bytes 지연 시간 벤치마크
+기존 경로(NamedTemporaryFile에 쓰고 torchaudio.load로 다시 읽기)와 메모리 디코딩(audio_io.decode_audio_bytes) 비교
+디코딩 단계만 비교하고, --full이면 모델 추론까지 포함한 bytes -> text 전체 지연 시간도 측정
+
+사용법: python bench_transcribe_bytes.py [--audio data/stt_test.wav] [--repeat 20] [--full]
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+import torchaudio
+import yaml
+
+from audio_io import decode_audio_bytes
+
+
+def legacy_decode(audio_bytes):
+    """기존 transcribe_from_bytes의 디코딩 경로 (임시 파일 경유)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+        temp_file.write(audio_bytes)
+        temp_file_path = temp_file.name
+    try:
+        return torchaudio.load(temp_file_path)
+    finally:
+        os.unlink(temp_file_path)
+
+
+def legacy_transcribe_from_bytes(model, audio_bytes):
+    """기존 transcribe_from_bytes (임시 파일 경유 bytes -> text)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+        temp_file.write(audio_bytes)
+        temp_file_path = temp_file.name
+    try:
+        return model.transcribe(temp_file_path)
+    finally:
+        os.unlink(temp_file_path)
+
+
+def report(name, func, repeat):
+    seconds = timeit.timeit(func, number=repeat)
+    print(f"{name:>22}: {seconds / repeat * 1e3:8.2f} ms/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="transcribe_from_bytes latency benchmark")
+    parser.add_argument("--audio", default="data/stt_test.wav", help="측정에 쓸 오디오 파일")
+    parser.add_argument("--repeat", type=int, default=20, help="측정 반복 횟수")
+    parser.add_argument("--full", action="store_true", help="모델 추론까지 포함한 bytes -> text 측정")
+    parser.add_argument("--config", default="data/config/wav2vec2.yaml", help="Wav2Vec2 설정 파일")
+    args = parser.parse_args()
+
+    with open(args.audio, 'rb') as f:
+        audio_bytes = f.read()
+
+    report("decode (temp file)", lambda: legacy_decode(audio_bytes), args.repeat)
+    report("decode (in-memory)", lambda: decode_audio_bytes(audio_bytes), args.repeat)
+
+    if args.full:
+        from wav2vec2 import Wav2Vec2
+
+        with open(args.config, 'r') as file:
+            config = yaml.safe_load(file)
+        model = Wav2Vec2(config=config)
+
+        legacy_text = legacy_transcribe_from_bytes(model, audio_bytes)
+        text = model.transcribe_from_bytes(audio_bytes)
+        if legacy_text != text:
+            print(f"전사 결과가 다릅니다: {text!r} (기존: {legacy_text!r})")
+
+        report("bytes->text (temp file)", lambda: legacy_transcribe_from_bytes(model, audio_bytes), args.repeat)
+        report("bytes->text (in-memory)", lambda: model.transcribe_from_bytes(audio_bytes), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
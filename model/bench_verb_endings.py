@@ -0,0 +1,120 @@
+"""
+EnhancedG2p.process_verb_endings 벤치마크
+기존 구현(어간마다 while/replace + 마커 치환)과 한 번의 스캔으로 처리하는 현재 구현의 문장당 비용 비교
+
+사용법: python bench_verb_endings.py [--repeat 200]
+"""
+import argparse
+import re
+import timeit
+
+from enhanced_g2pk import EnhancedG2p
+
+# enhanced_g2pk.py 예제 문장
+SENTENCES = [
+    "밝기", "짧게", "줄게 있어", "할게", "볼게요", "만들게", "높게", "길게", "선명하게", "할 게 없어",
+    "곱게", "가냘프게", "고달프게", "서툴게", "굳게", "곧게", "주열이에게 알려줄게",
+    "내일 학교에 갈게", "이거 한번 먹을게", "내가 알려줄게", "이 책을 읽을게요", "그건 내가 할게",
+    "가지를 읽을게요", "책 앞에 있어요", "그 곳으로 갈게요", "길게 자르세요",
+    "포상은 열심히 한 아이에게만 주어지기 때문에 포상인 것입니다.",
+    "비록 요즘은 전염병 때문에 출입국이 쉽지 않지만", "인간 들을 내게 바쳐라.", "열심히 할 나이에",
+    "물 넣기", "달 너머", "술 남기지 마세요", "글 내용이 좋아요", "감탄을 내게, 지원을 나비에게"
+]
+
+
+def legacy_process_verb_endings(text):
+    """기존 process_verb_endings 구현 (비교 기준)"""
+    # 단독 '하게', '하게요' 패턴 직접 처리
+    if text == '하게' or text == '하게요':
+        return text
+
+    # 복사본 생성
+    result = text
+
+    # 보호할 세그먼트 저장을 위한 딕셔너리
+    protected_segments = {}
+    marker_counter = 0
+
+    # '에게', '내게' 조사 보호 (완전 대체)
+    for protect_pattern in ['에게', '내게']:
+        while protect_pattern in result:
+            marker = f"__PROTECTED_{marker_counter}__"
+            protected_segments[marker] = protect_pattern
+            result = result.replace(protect_pattern, marker, 1)  # 한 번에 하나씩 대체
+            marker_counter += 1
+
+    # 일반적인 형용사 + '게' 패턴 보호
+    adj_stems = ['가냘프', '가늘', '가파르', '거세', '거칠', '건조하', '검', '게으르', '고르', '고달프',
+                  '고맙', '곱', '고프', '곧', '굳', '굵', '귀엽', '기쁘', '길', '깊', '깨끗하', 
+                  '나쁘', '낮', '너그럽', '너르', '노랗', '높', '눅', '느리', '늦', '더럽', 
+                  '더웁', '둥글', '드물', '딱하', '뛰어나', '뜨겁', '많', '멀', '멋지', '메마르', 
+                  '메스껍', '못나', '못되', '못생기', '무겁', '무디', '무르', '무섭', '미끈하', ''
+                  '미워하', '미치', '반갑', '보드랍', '보람차', '보잘것없', '부드럽', '부르', 
+                  '붉', '비싸', '빠르', '뼈저리', '새롭', '서툴', '섣부르', '성가시', '세', 
+                  '수다스럽', '수줍', '쉽', '슬프', '싫', '싸', '쌀쌀맞', '쏜살같', '쓰디쓰', 
+                  '쓰리', '쓰', '아름답', '아쉽', '아프', '안쓰럽', '안타깝', '약삭빠르', 
+                  '약', '얇', '얕', '어둡', '어렵', '어리', '언짢', '없', '열띠', '예쁘', 
+                  '올바르', '외롭', '우습', '의심쩍', '이르', '익', '있', '작', '잘나', '잘빠지', 
+                  '재미있', '적', '젊', '점잖', '조그맣', '좁', '좋', '주제넘', '줄기차', '즐겁', 
+                  '지나치', '지혜롭', '질기', '짓궂', '짙', '케케묵', '크', '탐스럽', '턱없', 
+                  '푸르', '흐리', '희망차', '희', '힘겹', '힘차','만들']
+
+   # 형용사 어간 + '게' 패턴 보호 (완전 대체)
+    for stem in adj_stems:
+        pattern = stem + '게'
+        while pattern in result:
+            marker = f"__PROTECTED_{marker_counter}__"
+            protected_segments[marker] = pattern
+            result = result.replace(pattern, marker, 1)  # 한 번에 하나씩 대체
+            marker_counter += 1
+
+
+    # '하게'로 끝나는 모든 패턴 보호 (완전 대체)
+    hage_pattern = re.compile(r'([가-힣]+)하게')
+    for match in hage_pattern.finditer(result):
+        full_match = match.group(0)
+        marker = f"__PROTECTED_{marker_counter}__"
+        protected_segments[marker] = full_match
+
+        # 정확히 해당 위치의 문자열만 대체
+        start = match.start()
+        end = match.end()
+        result = result[:start] + marker + result[end:]
+
+        marker_counter += 1
+        # 위치가 바뀌었으므로 패턴 다시 찾아야 함
+        hage_pattern = re.compile(r'([가-힣]+)하게')
+
+    # 용언 어간 받침 'ㄹ' + '게' 패턴 변환 (의도/약속 표현)
+    result = re.sub(r'([갈-힐])\s*게(요)?', r'\1께\2', result)
+
+    # 보호된 세그먼트 복원
+    for marker, original in protected_segments.items():
+        result = result.replace(marker, original)
+
+    return result
+
+
+def process_verb_endings(text):
+    # 인스턴스 상태를 쓰지 않으므로 EnhancedG2p 생성(MeCab 로드) 없이 호출
+    return EnhancedG2p.process_verb_endings(None, text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="process_verb_endings benchmark")
+    parser.add_argument("--repeat", type=int, default=200, help="전체 예제 문장 반복 횟수")
+    args = parser.parse_args()
+
+    for sentence in SENTENCES:
+        expected = legacy_process_verb_endings(sentence)
+        actual = process_verb_endings(sentence)
+        assert actual == expected, f"결과 불일치: {sentence!r} -> {actual!r} (기존: {expected!r})"
+
+    calls = args.repeat * len(SENTENCES)
+    for name, func in (("legacy", legacy_process_verb_endings), ("single-pass", process_verb_endings)):
+        seconds = timeit.timeit(lambda: [func(s) for s in SENTENCES], number=args.repeat)
+        print(f"{name:>12}: {seconds / calls * 1e6:8.2f} us/sentence")
+
+
+if __name__ == "__main__":
+    main()
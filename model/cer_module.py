@@ -1,9 +1,23 @@
 import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 순수 파이썬 커널만 사용
+    np = None
 
-import numpy as np
 import torch
 import torchaudio
-from transformers import Wav2Vec2Processor, Wav2Vec2ForCTC
+
+from audio_io import resample
+from model_registry import get_model
+
+# 한글, 영문, 숫자, 공백을 제외한 문장부호 등
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# 정답 문장 전처리 결과 LRU 캐시 크기 (configure_reference_cache로 변경 가능)
+REFERENCE_CACHE_SIZE = 4096
 
 def preprocess_text(text, remove_spaces=False, remove_punctuation=False):
     """
@@ -19,7 +33,7 @@ def preprocess_text(text, remove_spaces=False, remove_punctuation=False):
     """
     if remove_punctuation:
         # 한글, 영문, 숫자를 제외한 문장부호 등 제거
-        text = re.sub(r'[^\w\s]', '', text)
+        text = PUNCTUATION_PATTERN.sub('', text)
     
     if remove_spaces:
         # 모든 공백 제거
@@ -27,9 +41,152 @@ def preprocess_text(text, remove_spaces=False, remove_punctuation=False):
     
     return text
 
+def _build_reference_cache(maxsize):
+    return lru_cache(maxsize=maxsize)(preprocess_text)
+
+_reference_cache = _build_reference_cache(REFERENCE_CACHE_SIZE)
+
+def normalize_reference(text, remove_spaces=False, remove_punctuation=False):
+    """
+    정답 문장 전처리 (LRU 캐시 사용)
+    게임 모드처럼 같은 정답 문장을 반복 채점할 때 전처리를 다시 하지 않음
+    """
+    return _reference_cache(text, remove_spaces, remove_punctuation)
+
+def configure_reference_cache(maxsize):
+    """정답 문장 캐시 크기를 변경 (기존 캐시와 통계는 초기화됨)"""
+    global _reference_cache
+    _reference_cache = _build_reference_cache(maxsize)
+
+def reference_cache_info():
+    """
+    정답 문장 캐시 통계
+    
+    Returns:
+        dict: 적중/실패 횟수, 최대 크기, 현재 크기
+    """
+    info = _reference_cache.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'maxsize': info.maxsize,
+        'currsize': info.currsize
+    }
+
+def warm_reference_cache(sentences, remove_spaces=True, remove_punctuation=True):
+    """
+    연습 문장 목록으로 정답 문장 캐시를 미리 채움 (서버 시작 시 호출)
+    
+    Args:
+        sentences (iterable[str]): 연습 문장 목록
+        remove_spaces (bool): 공백 제거 여부 (채점 시 옵션과 같아야 캐시가 적중함)
+        remove_punctuation (bool): 문장부호 제거 여부
+    
+    Returns:
+        int: 캐시에 넣은 문장 수
+    """
+    count = 0
+    for sentence in sentences:
+        normalize_reference(sentence, remove_spaces, remove_punctuation)
+        count += 1
+    return count
+
+# 이 셀 수(len(u) * len(v)) 이상이면 NumPy 행 단위 커널을 사용
+# (짧은 문장은 NumPy 호출 오버헤드가 더 커서 순수 파이썬 경로가 빠름)
+NUMPY_MIN_CELLS = 10000
+
+def _ops_from_counts(n, m, distance, substitutions):
+    """
+    편집 거리와 대체 수로부터 삭제/삽입 수를 복원
+    (n = S + H + D, m = S + H + I, distance = S + D + I)
+    """
+    deletions = (distance - substitutions + n - m) // 2
+    insertions = (distance - substitutions - n + m) // 2
+    return distance, (substitutions, deletions, insertions)
+
+def _levenshtein_python(u, v):
+    """
+    순수 파이썬 레벤슈타인 커널
+    셀마다 튜플을 만들지 않고 거리와 대체 수만 정수 리스트로 추적
+    """
+    n, m = len(u), len(v)
+    prev_cost = list(range(m + 1))
+    prev_sub = [0] * (m + 1)
+
+    for x in range(1, n + 1):
+        u_char = u[x - 1]
+        curr_cost = [x] + [0] * m
+        curr_sub = [0] * (m + 1)
+
+        for y in range(1, m + 1):
+            mismatch = u_char != v[y - 1]
+            subcost = prev_cost[y - 1] + mismatch
+            delcost = prev_cost[y] + 1
+            addcost = curr_cost[y - 1] + 1
+
+            # 동점일 때 대체 > 삭제 > 삽입 순으로 선택 (기존 구현과 동일)
+            if subcost <= delcost and subcost <= addcost:
+                curr_cost[y] = subcost
+                curr_sub[y] = prev_sub[y - 1] + mismatch
+            elif delcost <= addcost:
+                curr_cost[y] = delcost
+                curr_sub[y] = prev_sub[y]
+            else:
+                curr_cost[y] = addcost
+                curr_sub[y] = curr_sub[y - 1]
+
+        prev_cost, prev_sub = curr_cost, curr_sub
+
+    return _ops_from_counts(n, m, prev_cost[m], prev_sub[m])
+
+def _encode_tokens(u, v):
+    """두 시퀀스의 토큰을 공통 정수 코드 배열로 변환"""
+    codes = {}
+    u_codes = np.fromiter((codes.setdefault(c, len(codes)) for c in u), dtype=np.int32, count=len(u))
+    v_codes = np.fromiter((codes.setdefault(c, len(codes)) for c in v), dtype=np.int32, count=len(v))
+    return u_codes, v_codes
+
+def _levenshtein_numpy(u, v):
+    """
+    NumPy 행 단위 레벤슈타인 커널
+    같은 행 안의 삽입 의존성(curr[y-1] + 1)은
+    curr[y] - y = min(base[y] - y, curr[y-1] - (y-1)) 이므로 누적 최소값 한 번으로 계산
+    """
+    n, m = len(u), len(v)
+    u_codes, v_codes = _encode_tokens(u, v)
+    idx = np.arange(m + 1, dtype=np.int32)
+
+    prev_cost = idx.copy()
+    prev_sub = np.zeros(m + 1, dtype=np.int32)
+    base_cost = np.empty(m + 1, dtype=np.int32)
+    base_sub = np.empty(m + 1, dtype=np.int32)
+    base_sub[0] = 0
+
+    for x in range(1, n + 1):
+        mismatch = (v_codes != u_codes[x - 1]).astype(np.int32)
+        subcost = prev_cost[:-1] + mismatch
+        delcost = prev_cost[1:] + 1
+        use_sub = subcost <= delcost
+
+        base_cost[0] = x
+        base_cost[1:] = np.where(use_sub, subcost, delcost)
+        base_sub[1:] = np.where(use_sub, prev_sub[:-1] + mismatch, prev_sub[1:])
+
+        # 삽입 경로 반영
+        curr_cost = np.minimum.accumulate(base_cost - idx) + idx
+
+        # 삽입은 대체/삭제보다 엄격히 작을 때만 선택되므로,
+        # 각 칸의 대체 수는 왼쪽으로 가장 가까운 대체/삭제 칸에서 이어받음
+        source = np.maximum.accumulate(np.where(curr_cost == base_cost, idx, 0))
+        prev_sub = base_sub[source]
+        prev_cost = curr_cost
+
+    return _ops_from_counts(n, m, int(prev_cost[m]), int(prev_sub[m]))
+
 def calculate_levenshtein(u, v):
     """
     두 문자열 간의 레벤슈타인 거리와 작업 세부 정보(대체, 삭제, 삽입)를 계산
+    긴 입력은 NumPy 커널, 짧은 입력(또는 NumPy가 없는 환경)은 순수 파이썬 커널 사용
     
     Args:
         u (list): 첫 번째 문자열(문자 리스트)
@@ -38,34 +195,171 @@ def calculate_levenshtein(u, v):
     Returns:
         tuple: (편집 거리, (대체 수, 삭제 수, 삽입 수))
     """
-    prev = None
-    curr = [0] + list(range(1, len(v) + 1))
-    # 작업: (대체, 삭제, 삽입)
-    prev_ops = None
-    curr_ops = [(0, 0, i) for i in range(len(v) + 1)]
-    
-    for x in range(1, len(u) + 1):
-        prev, curr = curr, [x] + ([None] * len(v))
-        prev_ops, curr_ops = curr_ops, [(0, x, 0)] + ([None] * len(v))
-        
-        for y in range(1, len(v) + 1):
-            delcost = prev[y] + 1
-            addcost = curr[y - 1] + 1
-            subcost = prev[y - 1] + int(u[x - 1] != v[y - 1])
-            
-            curr[y] = min(subcost, delcost, addcost)
-            
-            if curr[y] == subcost:
-                (n_s, n_d, n_i) = prev_ops[y - 1]
-                curr_ops[y] = (n_s + int(u[x - 1] != v[y - 1]), n_d, n_i)
-            elif curr[y] == delcost:
-                (n_s, n_d, n_i) = prev_ops[y]
-                curr_ops[y] = (n_s, n_d + 1, n_i)
-            else:
-                (n_s, n_d, n_i) = curr_ops[y - 1]
-                curr_ops[y] = (n_s, n_d, n_i + 1)
-                
-    return curr[len(v)], curr_ops[len(v)]
+    if np is not None and len(u) * len(v) >= NUMPY_MIN_CELLS:
+        return _levenshtein_numpy(u, v)
+    return _levenshtein_python(u, v)
+
+# 정렬 결과 한 칸: 정답 문자, 예측 문자, 작업('equal', 'substitute', 'delete', 'insert'), 원문 내 위치
+# 'delete'는 정답 문자가 예측에서 빠진 경우, 'insert'는 예측에만 있는 문자 (해당 쪽 문자/위치는 None)
+AlignedChar = namedtuple('AlignedChar', ['ref_char', 'hyp_char', 'op', 'ref_pos', 'hyp_pos'])
+
+# Hirschberg 분할을 멈추고 전체 DP 행렬로 역추적할 최대 셀 수
+HIRSCHBERG_BASE_CELLS = 4096
+
+def _last_row(a, b):
+    """a 전체와 b의 각 접두사 사이 편집 거리 (DP 행렬의 마지막 행만 O(len(b)) 메모리로 계산)"""
+    m = len(b)
+    if np is not None and len(a) * m >= NUMPY_MIN_CELLS:
+        a_codes, b_codes = _encode_tokens(a, b)
+        idx = np.arange(m + 1, dtype=np.int32)
+        prev = idx.copy()
+        base = np.empty(m + 1, dtype=np.int32)
+        for i in range(1, len(a) + 1):
+            base[0] = i
+            base[1:] = np.minimum(prev[:-1] + (b_codes != a_codes[i - 1]), prev[1:] + 1)
+            prev = np.minimum.accumulate(base - idx) + idx
+        return prev.tolist()
+
+    prev = list(range(m + 1))
+    for i in range(1, len(a) + 1):
+        a_char = a[i - 1]
+        curr = [i] + [0] * m
+        for j in range(1, m + 1):
+            curr[j] = min(prev[j - 1] + (a_char != b[j - 1]), prev[j] + 1, curr[j - 1] + 1)
+        prev = curr
+    return prev
+
+def _align_full(a, b, a_offset, b_offset, out):
+    """작은 구간은 전체 DP 행렬을 만들고 역추적 (대체 > 삭제 > 삽입 순으로 선택)"""
+    n, m = len(a), len(b)
+    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        dp[i][0] = i
+    for j in range(m + 1):
+        dp[0][j] = j
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            dp[i][j] = min(dp[i - 1][j - 1] + (a[i - 1] != b[j - 1]), dp[i - 1][j] + 1, dp[i][j - 1] + 1)
+
+    ops = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and dp[i][j] == dp[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            op = 'equal' if a[i - 1] == b[j - 1] else 'substitute'
+            ops.append(AlignedChar(a[i - 1], b[j - 1], op, a_offset + i - 1, b_offset + j - 1))
+            i, j = i - 1, j - 1
+        elif i > 0 and dp[i][j] == dp[i - 1][j] + 1:
+            ops.append(AlignedChar(a[i - 1], None, 'delete', a_offset + i - 1, None))
+            i -= 1
+        else:
+            ops.append(AlignedChar(None, b[j - 1], 'insert', None, b_offset + j - 1))
+            j -= 1
+
+    out.extend(reversed(ops))
+
+def _hirschberg(a, b, a_offset, b_offset, out):
+    """Hirschberg 분할 정복 정렬 (O(len(a) + len(b)) 메모리)"""
+    n, m = len(a), len(b)
+    if n == 0:
+        out.extend(AlignedChar(None, b[j], 'insert', None, b_offset + j) for j in range(m))
+    elif m == 0:
+        out.extend(AlignedChar(a[i], None, 'delete', a_offset + i, None) for i in range(n))
+    elif n == 1 or m == 1 or n * m <= HIRSCHBERG_BASE_CELLS:
+        _align_full(a, b, a_offset, b_offset, out)
+    else:
+        # a를 반으로 나누고, 앞/뒤 절반의 편집 거리 합이 최소가 되는 b의 분할 지점 선택
+        mid = n // 2
+        forward = _last_row(a[:mid], b)
+        backward = _last_row(a[mid:][::-1], b[::-1])
+        split = min(range(m + 1), key=lambda j: forward[j] + backward[m - j])
+
+        _hirschberg(a[:mid], b[:split], a_offset, b_offset, out)
+        _hirschberg(a[mid:], b[split:], a_offset + mid, b_offset + split, out)
+
+def _kept_positions(text, remove_spaces, remove_punctuation):
+    """preprocess_text 후에도 남는 문자들의 원문 내 위치"""
+    positions = []
+    for i, char in enumerate(text):
+        if remove_punctuation and PUNCTUATION_PATTERN.match(char):
+            continue
+        if remove_spaces and char == ' ':
+            continue
+        positions.append(i)
+    return positions
+
+def align_korean_text(reference, hypothesis, remove_spaces=True, remove_punctuation=True):
+    """
+    정답/예측 문장을 음절 단위로 정렬한 편집 스크립트 반환
+    Hirschberg 방식이라 긴 문단도 전체 DP 행렬을 만들지 않음
+    
+    Args:
+        reference (str): 정답 문장
+        hypothesis (str): 예측 문장
+        remove_spaces (bool): 공백 제거 여부
+        remove_punctuation (bool): 문장부호 제거 여부
+    
+    Returns:
+        list[AlignedChar]: 정렬 결과 (위치는 전처리 전 원문 기준)
+    """
+    ref_positions = _kept_positions(reference, remove_spaces, remove_punctuation)
+    hyp_positions = _kept_positions(hypothesis, remove_spaces, remove_punctuation)
+    ref_chars = [reference[i] for i in ref_positions]
+    hyp_chars = [hypothesis[i] for i in hyp_positions]
+
+    alignment = []
+    _hirschberg(ref_chars, hyp_chars, 0, 0, alignment)
+
+    return [
+        entry._replace(
+            ref_pos=ref_positions[entry.ref_pos] if entry.ref_pos is not None else None,
+            hyp_pos=hyp_positions[entry.hyp_pos] if entry.hyp_pos is not None else None
+        )
+        for entry in alignment
+    ]
+
+def get_error_spans(alignment):
+    """
+    정렬 결과에서 연속된 오류 구간을 밑줄 표시용 span으로 묶음
+    
+    Args:
+        alignment (list[AlignedChar]): align_korean_text 결과
+    
+    Returns:
+        list[dict]: 구간별 정답/예측 원문 위치 범위(끝은 미포함, 해당 문자가 없으면 None)와 작업 목록
+    """
+    spans = []
+    run = []
+    for entry in alignment + [None]:
+        if entry is not None and entry.op != 'equal':
+            run.append(entry)
+            continue
+        if run:
+            ref_pos = [e.ref_pos for e in run if e.ref_pos is not None]
+            hyp_pos = [e.hyp_pos for e in run if e.hyp_pos is not None]
+            spans.append({
+                'ref_start': ref_pos[0] if ref_pos else None,
+                'ref_end': ref_pos[-1] + 1 if ref_pos else None,
+                'hyp_start': hyp_pos[0] if hyp_pos else None,
+                'hyp_end': hyp_pos[-1] + 1 if hyp_pos else None,
+                'ops': [e.op for e in run]
+            })
+            run = []
+    return spans
+
+def _count_errors(ref, hyp):
+    """
+    전처리된 정답/예측 문장의 오류 수 계산
+    
+    Returns:
+        tuple: (대체 수, 삭제 수, 삽입 수, 전체 수)
+    """
+    _, (substitutions, deletions, insertions) = calculate_levenshtein(list(hyp), list(ref))
+
+    # 전체 = 대체 + 삭제 + 정답(hits) + 삽입 = 정답 문장 길이 + 삽입
+    hits = len(ref) - (substitutions + deletions)
+    total = substitutions + deletions + hits + insertions
+
+    return substitutions, deletions, insertions, total
 
 def calculate_korean_cer(reference, hypothesis, remove_spaces=True, remove_punctuation=True):
     """
@@ -81,17 +375,11 @@ def calculate_korean_cer(reference, hypothesis, remove_spaces=True, remove_punct
         dict: CER 값과 세부 정보 (대체, 삭제, 삽입 수)
     """
     # preprocessing
-    ref = preprocess_text(reference, remove_spaces, remove_punctuation)
+    ref = normalize_reference(reference, remove_spaces, remove_punctuation)
     hyp = preprocess_text(hypothesis, remove_spaces, remove_punctuation)
 
-    ref_chars = list(ref)
-    hyp_chars = list(hyp)
-    
-    _, (substitutions, deletions, insertions) = calculate_levenshtein(hyp_chars, ref_chars)
-
-    hits = len(ref_chars) - (substitutions + deletions)
+    substitutions, deletions, insertions, total = _count_errors(ref, hyp)
     incorrect = substitutions + deletions + insertions
-    total = substitutions + deletions + hits + insertions
 
     cer = round(incorrect / total, 4) if total > 0 else 0
     
@@ -130,15 +418,329 @@ def calculate_korean_crr(reference, hypothesis, remove_spaces=True, remove_punct
 
     return result
 
+def _count_errors_chunk(pairs):
+    """프로세스 풀 작업 단위: (정답, 예측) 쌍 묶음의 오류 수 계산"""
+    return [_count_errors(ref, hyp) for ref, hyp in pairs]
+
+def calculate_korean_crr_batch(references, hypotheses, remove_spaces=True, remove_punctuation=True,
+                               num_workers=1, chunk_size=256):
+    """
+    여러 (정답, 예측) 쌍의 CRR을 한 번에 계산
+    문장 전처리는 중복 제거 후 한 번씩만 수행하고, 같은 쌍은 한 번만 채점하며,
+    num_workers > 1이면 편집 거리 계산을 프로세스 풀로 분산
+    
+    Args:
+        references (list[str]): 정답 문장 리스트
+        hypotheses (list[str]): 예측 문장 리스트
+        remove_spaces (bool): 공백 제거 여부
+        remove_punctuation (bool): 문장부호 제거 여부
+        num_workers (int): 프로세스 수 (1이면 현재 프로세스에서 계산)
+        chunk_size (int): 프로세스 풀에 한 번에 넘길 쌍의 수
+    
+    Returns:
+        dict: 쌍별 결과 리스트(calculate_korean_crr와 동일한 형식)와
+              코퍼스 단위 micro CRR(오류 수 합 기준), macro CRR(쌍별 CRR 평균)
+    """
+    if len(references) != len(hypotheses):
+        raise ValueError(f"references({len(references)})와 hypotheses({len(hypotheses)})의 길이가 다릅니다.")
+
+    # 전처리 (고유 문장당 한 번)
+    normalized = {text: preprocess_text(text, remove_spaces, remove_punctuation)
+                  for text in set(references) | set(hypotheses)}
+    pairs = [(normalized[ref], normalized[hyp]) for ref, hyp in zip(references, hypotheses)]
+
+    # 채점 (고유 쌍당 한 번)
+    unique_pairs = list(dict.fromkeys(pairs))
+    if num_workers > 1 and len(unique_pairs) > chunk_size:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [unique_pairs[i:i + chunk_size] for i in range(0, len(unique_pairs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            counts = [c for chunk_counts in executor.map(_count_errors_chunk, chunks) for c in chunk_counts]
+    else:
+        counts = _count_errors_chunk(unique_pairs)
+    counts_by_pair = dict(zip(unique_pairs, counts))
+
+    results = []
+    total_incorrect, total_count = 0, 0
+    for pair in pairs:
+        substitutions, deletions, insertions, total = counts_by_pair[pair]
+        incorrect = substitutions + deletions + insertions
+        total_incorrect += incorrect
+        total_count += total
+
+        # calculate_korean_cer / calculate_korean_crr와 동일한 반올림
+        cer = round(incorrect / total, 4) if total > 0 else 0
+        results.append({
+            'crr': round(1 - cer, 4),
+            'substitutions': substitutions,
+            'deletions': deletions,
+            'insertions': insertions
+        })
+
+    micro_crr = round(1 - total_incorrect / total_count, 4) if total_count > 0 else 1.0
+    macro_crr = round(sum(r['crr'] for r in results) / len(results), 4) if results else 1.0
+
+    return {
+        'results': results,
+        'micro_crr': micro_crr,
+        'macro_crr': macro_crr
+    }
+
+def _levenshtein_banded(u, v, max_distance):
+    """
+    Ukkonen 밴드 레벤슈타인 커널
+    |x - y| <= max_distance인 대각선 띠 안의 칸만 계산하고, 한 행의 최솟값이 max_distance를 넘으면
+    최종 거리도 넘을 수밖에 없으므로 즉시 중단
+    
+    Returns:
+        tuple | None: 거리가 max_distance 이하이면 calculate_levenshtein과 같은 결과, 아니면 None
+    """
+    n, m = len(u), len(v)
+    k = max_distance
+    if abs(n - m) > k:
+        return None
+
+    # 띠 밖의 칸 (어떤 경로의 비용보다도 큼)
+    inf = n + m + 1
+    prev_cost = [y if y <= k else inf for y in range(m + 1)]
+    prev_sub = [0] * (m + 1)
+
+    for x in range(1, n + 1):
+        u_char = u[x - 1]
+        curr_cost = [inf] * (m + 1)
+        curr_sub = [0] * (m + 1)
+        curr_cost[0] = x if x <= k else inf
+        row_min = curr_cost[0]
+
+        for y in range(max(1, x - k), min(m, x + k) + 1):
+            mismatch = u_char != v[y - 1]
+            subcost = prev_cost[y - 1] + mismatch
+            delcost = prev_cost[y] + 1
+            addcost = curr_cost[y - 1] + 1
+
+            # 거리가 k 이하인 칸은 띠 밖을 거치지 않으므로 전체 DP와 같은 값/선택이 나옴
+            if subcost <= delcost and subcost <= addcost:
+                curr_cost[y] = subcost
+                curr_sub[y] = prev_sub[y - 1] + mismatch
+            elif delcost <= addcost:
+                curr_cost[y] = delcost
+                curr_sub[y] = prev_sub[y]
+            else:
+                curr_cost[y] = addcost
+                curr_sub[y] = curr_sub[y - 1]
+
+            if curr_cost[y] < row_min:
+                row_min = curr_cost[y]
+
+        if row_min > k:
+            return None
+        prev_cost, prev_sub = curr_cost, curr_sub
+
+    if prev_cost[m] > k:
+        return None
+    return _ops_from_counts(n, m, prev_cost[m], prev_sub[m])
+
+def crr_at_least(reference, hypothesis, threshold, remove_spaces=True, remove_punctuation=True):
+    """
+    CRR이 threshold 이상인지만 빠르게 판정 (발음 성장 게임용)
+    CER = 편집 거리 / (정답 길이 + 삽입 수) >= d / (정답 길이 + d) 이므로,
+    통과 가능한 최대 편집 거리를 넘는 순간 계산을 중단
+    
+    Args:
+        reference (str): 정답 문장
+        hypothesis (str): 예측 문장
+        threshold (float): 통과 기준 CRR
+        remove_spaces (bool): 공백 제거 여부
+        remove_punctuation (bool): 문장부호 제거 여부
+    
+    Returns:
+        tuple: (통과 여부, 통과 시 calculate_korean_crr와 같은 결과 dict / 실패 시 None)
+    """
+    ref = normalize_reference(reference, remove_spaces, remove_punctuation)
+    hyp = preprocess_text(hypothesis, remove_spaces, remove_punctuation)
+
+    # 반올림(소수점 4자리) 오차만큼 여유를 둔 CER 상한
+    max_cer = 1 - threshold + 1e-4
+    if len(ref) == 0 or max_cer >= 1:
+        ops = calculate_levenshtein(list(hyp), list(ref))
+    else:
+        max_distance = int(max_cer * len(ref) / (1 - max_cer))
+        ops = _levenshtein_banded(list(hyp), list(ref), max_distance)
+        if ops is None:
+            return False, None
+
+    _, (substitutions, deletions, insertions) = ops
+    incorrect = substitutions + deletions + insertions
+    total = len(ref) + insertions
+
+    cer = round(incorrect / total, 4) if total > 0 else 0
+    crr = round(1 - cer, 4)
+    if crr < threshold:
+        return False, None
+
+    result = {
+        'crr': crr,
+        'substitutions': substitutions,
+        'deletions': deletions,
+        'insertions': insertions
+    }
+
+    return True, result
+
+HANGUL_BASE = 0xAC00   # '가'
+HANGUL_COUNT = 11172   # 19(초성) * 21(중성) * 28(종성 없음 포함)
+
+def _build_jamo_table():
+    """
+    완성형 음절 11,172개의 (초성, 중성, 종성) 조합형 자모 코드 포인트 표를 미리 계산
+    초성 U+1100~, 중성 U+1161~, 종성 U+11A8~ (종성이 없으면 0)
+    """
+    syllable = np.arange(HANGUL_COUNT, dtype=np.int32)
+    table = np.empty((HANGUL_COUNT, 3), dtype=np.int32)
+    table[:, 0] = 0x1100 + syllable // 588
+    table[:, 1] = 0x1161 + (syllable % 588) // 28
+    final = syllable % 28
+    table[:, 2] = np.where(final > 0, 0x11A7 + final, 0)
+    return table
+
+JAMO_TABLE = _build_jamo_table() if np is not None else None
+
+def decompose_to_jamo(texts):
+    """
+    여러 문장을 한 번의 표 조회로 자모 단위로 분해
+    한글 음절이 아닌 문자는 그대로 유지
+    
+    Args:
+        texts (list[str]): 분해할 문장 리스트
+    
+    Returns:
+        list[np.ndarray]: 문장별 자모 코드 포인트 배열 (int32)
+    """
+    if JAMO_TABLE is None:
+        raise ImportError("자모 단위 분해에는 NumPy가 필요합니다.")
+    if not texts:
+        return []
+
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32).astype(np.int32)
+
+    # 음절당 3칸(초성, 중성, 종성)으로 펼친 뒤 빈 칸(0) 제거
+    expanded = np.zeros((len(codes), 3), dtype=np.int32)
+    expanded[:, 0] = codes
+    is_hangul = (codes >= HANGUL_BASE) & (codes < HANGUL_BASE + HANGUL_COUNT)
+    expanded[is_hangul] = JAMO_TABLE[codes[is_hangul] - HANGUL_BASE]
+    keep = expanded != 0
+
+    # 문장별 자모 개수로 다시 분할
+    text_ids = np.repeat(np.arange(len(texts)), lengths)
+    counts = np.bincount(text_ids, weights=keep.sum(axis=1), minlength=len(texts)).astype(np.int64)
+    return np.split(expanded[keep], np.cumsum(counts)[:-1])
+
+def _align_jamo_sequences(ref_jamo, hyp_jamo):
+    """자모 코드 포인트 리스트를 정렬하고 결과를 문자로 변환 (위치는 자모 시퀀스 기준)"""
+    alignment = []
+    _hirschberg(ref_jamo, hyp_jamo, 0, 0, alignment)
+    return [
+        e._replace(
+            ref_char=chr(e.ref_char) if e.ref_char is not None else None,
+            hyp_char=chr(e.hyp_char) if e.hyp_char is not None else None
+        )
+        for e in alignment
+    ]
+
+def align_korean_jamo(reference, hypothesis, remove_spaces=True, remove_punctuation=True):
+    """
+    정답/예측 문장을 자모 단위로 정렬한 편집 스크립트 반환
+    
+    Args:
+        reference (str): 정답 문장
+        hypothesis (str): 예측 문장
+        remove_spaces (bool): 공백 제거 여부
+        remove_punctuation (bool): 문장부호 제거 여부
+    
+    Returns:
+        list[AlignedChar]: 정렬 결과 (문자는 조합형 자모, 위치는 자모 시퀀스 기준)
+    """
+    ref = normalize_reference(reference, remove_spaces, remove_punctuation)
+    hyp = preprocess_text(hypothesis, remove_spaces, remove_punctuation)
+    ref_jamo, hyp_jamo = (jamo.tolist() for jamo in decompose_to_jamo([ref, hyp]))
+    return _align_jamo_sequences(ref_jamo, hyp_jamo)
+
+def calculate_korean_jamo_cer(reference, hypothesis, remove_spaces=True, remove_punctuation=True):
+    """
+    한국어 문장의 자모(초성/중성/종성) 단위 CER을 계산
+    음절 단위와 달리 "박" vs "발"은 종성 하나의 대체로 계산됨
+    
+    Args:
+        reference (str): 정답 문장
+        hypothesis (str): 예측 문장
+        remove_spaces (bool): 공백 제거 여부
+        remove_punctuation (bool): 문장부호 제거 여부
+    
+    Returns:
+        dict: CER 값과 세부 정보 (대체, 삭제, 삽입 수; 삭제는 예측에서 빠진 정답 자모),
+              자모 혼동 횟수 (Counter[(정답 자모, 예측 자모)], 삭제/삽입은 한쪽이 None)
+    """
+    ref = normalize_reference(reference, remove_spaces, remove_punctuation)
+    hyp = preprocess_text(hypothesis, remove_spaces, remove_punctuation)
+    ref_jamo, hyp_jamo = (jamo.tolist() for jamo in decompose_to_jamo([ref, hyp]))
+
+    # 오류 수와 혼동 쌍을 같은 자모 정렬 하나에서 집계 (두 값이 서로 다른 경로를 가리키지 않도록)
+    alignment = _align_jamo_sequences(ref_jamo, hyp_jamo)
+    confusions = Counter((e.ref_char, e.hyp_char) for e in alignment if e.op != 'equal')
+    ops = Counter(e.op for e in alignment)
+    substitutions, deletions, insertions = ops['substitute'], ops['delete'], ops['insert']
+
+    # 전체 = 정답 자모 수 + 삽입 수
+    total = len(ref_jamo) + insertions
+    incorrect = substitutions + deletions + insertions
+
+    cer = round(incorrect / total, 4) if total > 0 else 0
+
+    result = {
+        'cer': cer,
+        'substitutions': substitutions,
+        'deletions': deletions,
+        'insertions': insertions,
+        'confusions': confusions
+    }
+
+    return result
+
+def calculate_korean_jamo_crr(reference, hypothesis, remove_spaces=True, remove_punctuation=True):
+    """
+    한국어 문장의 자모 단위 CRR(정확도)을 계산
+    CRR = 1 - CER
+    
+    Args:
+        reference (str): 정답 문장
+        hypothesis (str): 예측 문장
+        remove_spaces (bool): 공백 제거 여부
+        remove_punctuation (bool): 문장부호 제거 여부
+    
+    Returns:
+        dict: CRR 값과 세부 정보 (대체, 삭제, 삽입 수, 자모 혼동 횟수)
+    """
+    cer_result = calculate_korean_jamo_cer(reference, hypothesis, remove_spaces, remove_punctuation)
+
+    result = {
+        'crr': round(1 - cer_result['cer'], 4),
+        'substitutions': cer_result['substitutions'],
+        'deletions': cer_result['deletions'],
+        'insertions': cer_result['insertions'],
+        'confusions': cer_result['confusions']
+    }
+
+    return result
+
 def transcribe_audio(file_path, model_name="daeunn/wav2vec2-korean-finetuned2"):
-    # 모델 및 프로세서 로드
-    processor = Wav2Vec2Processor.from_pretrained(model_name)
-    model = Wav2Vec2ForCTC.from_pretrained(model_name)
+    # 모델 및 프로세서 (레지스트리에서 한 번만 로드)
+    processor, model = get_model(model_name)
 
     # 오디오 파일 로드 및 16kHz 리샘플링
     waveform, sample_rate = torchaudio.load(file_path)
-    if sample_rate != 16000:
-        waveform = torchaudio.transforms.Resample(orig_freq=sample_rate, new_freq=16000)(waveform)
+    waveform = resample(waveform, sample_rate, 16000)
     input_values = processor(waveform.squeeze().numpy(), sampling_rate=16000, return_tensors="pt", padding=True)
 
     # 추론
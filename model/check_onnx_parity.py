@@ -0,0 +1,93 @@
+"""
+ONNX 백엔드 CRR 동등성 검사
+파인튜닝 때와 같은 방식으로 나눈 daeunn/g2pk2_dataset 테스트 split을 torch 백엔드와 onnx 백엔드로 전사해
+micro/macro CRR 차이와 전사 결과 일치율을 비교 (CRR 하락이 --max-crr-drop보다 크면 종료 코드 1)
+
+사용법: python check_onnx_parity.py [--onnx-path data/onnx/wav2vec2-korean-finetuned2] [--quantize] [--limit 200]
+"""
+import argparse
+import sys
+
+import numpy as np
+import yaml
+
+from cer_module import calculate_korean_crr_batch
+from wav2vec2 import Wav2Vec2
+
+BATCH_SIZE = 16
+
+
+def load_test_split(limit=None):
+    """finetune_wav2vec2.py와 같은 필터/시드로 나눈 테스트 split -> [(오디오, 샘플링 레이트, 정답)]"""
+    from datasets import Audio, load_dataset
+
+    dataset = load_dataset("daeunn/g2pk2_dataset", split="train")
+    dataset = dataset.cast_column("audio", Audio(sampling_rate=16_000))
+    dataset = dataset.filter(lambda batch: 1.0 < len(batch["audio"]["array"]) / batch["audio"]["sampling_rate"] < 15.0)
+    test = dataset.train_test_split(test_size=0.1, seed=42)["test"]
+    if limit:
+        test = test.select(range(min(limit, len(test))))
+
+    return [(np.asarray(row["audio"]["array"], dtype=np.float32), row["audio"]["sampling_rate"], row["text"])
+            for row in test]
+
+
+def transcribe_all(model, samples):
+    transcriptions = []
+    for start in range(0, len(samples), BATCH_SIZE):
+        batch = samples[start:start + BATCH_SIZE]
+        transcriptions.extend(model.transcribe_batch([s[0] for s in batch], [s[1] for s in batch]))
+    return transcriptions
+
+
+def compare_backends(torch_model, onnx_model, samples):
+    """
+    두 백엔드의 전사 결과와 CRR 비교
+    
+    Returns:
+        dict: 'torch', 'onnx' (calculate_korean_crr_batch 결과), 'identical' (전사 결과가 같은 비율)
+    """
+    references = [s[2] for s in samples]
+    torch_hyps = transcribe_all(torch_model, samples)
+    onnx_hyps = transcribe_all(onnx_model, samples)
+    return {
+        "torch": calculate_korean_crr_batch(references, torch_hyps),
+        "onnx": calculate_korean_crr_batch(references, onnx_hyps),
+        "identical": sum(a == b for a, b in zip(torch_hyps, onnx_hyps)) / len(samples) if samples else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX backend CRR parity check")
+    parser.add_argument("--config", default="data/config/wav2vec2.yaml", help="Wav2Vec2 설정 파일")
+    parser.add_argument("--onnx-path", default=None, help="ONNX 모델 디렉터리 (기본값: 설정의 onnx_path)")
+    parser.add_argument("--quantize", action="store_true", help="int8 양자화 모델 검사")
+    parser.add_argument("--limit", type=int, default=None, help="검사할 테스트 샘플 수")
+    parser.add_argument("--max-crr-drop", type=float, default=0.005, help="허용하는 micro CRR 하락 폭")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as file:
+        config = yaml.safe_load(file)
+    torch_config = {**config, "model": {**config["model"], "backend": "torch", "device": "cpu"}}
+    onnx_config = {**config, "model": {**config["model"], "backend": "onnx", "quantize": args.quantize}}
+    if args.onnx_path:
+        onnx_config["model"]["onnx_path"] = args.onnx_path
+
+    samples = load_test_split(args.limit)
+    result = compare_backends(Wav2Vec2(config=torch_config), Wav2Vec2(config=onnx_config), samples)
+
+    drop = result["torch"]["micro_crr"] - result["onnx"]["micro_crr"]
+    name = "onnx-int8" if args.quantize else "onnx"
+    print(f"테스트 샘플: {len(samples)}개")
+    print(f"{'torch':>10}: micro CRR {result['torch']['micro_crr']:.2%}, macro CRR {result['torch']['macro_crr']:.2%}")
+    print(f"{name:>10}: micro CRR {result['onnx']['micro_crr']:.2%}, macro CRR {result['onnx']['macro_crr']:.2%}")
+    print(f"전사 결과 일치율: {result['identical']:.2%}, micro CRR 하락: {drop:+.4f}")
+
+    if drop > args.max_crr_drop:
+        print(f"❌ CRR 하락이 허용 범위({args.max_crr_drop})를 넘었습니다")
+        sys.exit(1)
+    print("✅ 동등성 검사 통과")
+
+
+if __name__ == "__main__":
+    main()
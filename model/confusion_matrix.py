@@ -0,0 +1,174 @@
+import numpy as np
+
+from cer_module import (
+    HANGUL_BASE, HANGUL_COUNT,
+    align_korean_jamo, align_korean_text
+)
+
+# 자모 id: 0 = 빈칸(삽입/삭제), 1~19 초성, 20~40 중성, 41~67 종성, 68 = 기타 문자
+# 음절 id: 0 = 빈칸(삽입/삭제), 1~11172 완성형 음절, 11173 = 기타 문자
+_JAMO_RANGES = [(0x1100, 19), (0x1161, 21), (0x11A8, 27)]
+JAMO_LABELS = [''] + [chr(start + k) for start, count in _JAMO_RANGES for k in range(count)] + ['?']
+SYLLABLE_LABELS = [''] + [chr(HANGUL_BASE + k) for k in range(HANGUL_COUNT)] + ['?']
+
+UNIT_LABELS = {
+    'jamo': JAMO_LABELS,
+    'syllable': SYLLABLE_LABELS
+}
+
+
+def _to_ids(code_points, unit):
+    """문자 코드 포인트 배열(빈칸은 0)을 혼동 행렬 id로 변환"""
+    size = len(UNIT_LABELS[unit])
+    ids = np.full(len(code_points), size - 1, dtype=np.int64)
+    ids[code_points == 0] = 0
+
+    if unit == 'jamo':
+        offset = 1
+        for start, count in _JAMO_RANGES:
+            mask = (code_points >= start) & (code_points < start + count)
+            ids[mask] = code_points[mask] - start + offset
+            offset += count
+    else:
+        mask = (code_points >= HANGUL_BASE) & (code_points < HANGUL_BASE + HANGUL_COUNT)
+        ids[mask] = code_points[mask] - HANGUL_BASE + 1
+
+    return ids
+
+
+class ConfusionMatrix:
+    """
+    학습자 그룹별 발음 혼동 행렬 누적기
+    (정답 id, 예측 id) 쌍을 ref_id * size + hyp_id 키의 희소 int32 카운트로 저장
+    """
+
+    # 이 개수 이상 쌓이면 대기 중인 키를 카운트 배열로 합침
+    COMPACT_THRESHOLD = 1_000_000
+
+    def __init__(self, unit: str = 'jamo'):
+        if unit not in UNIT_LABELS:
+            raise ValueError(f"지원하지 않는 단위입니다: {unit} (jamo 또는 syllable)")
+
+        self.unit = unit
+        self.labels = UNIT_LABELS[unit]
+        self.size = len(self.labels)
+
+        # 그룹별 (정렬된 키 배열, int32 카운트 배열)과 아직 합치지 않은 키 목록
+        self._keys = {}
+        self._counts = {}
+        self._pending = {}
+        self._pending_size = 0
+
+    @property
+    def groups(self) -> list:
+        return sorted(set(self._keys) | set(self._pending))
+
+    def add_alignment(self, alignment, group: str = 'all'):
+        """align_korean_text / align_korean_jamo 정렬 결과를 누적"""
+        if not alignment:
+            return
+
+        ref_codes = np.fromiter((ord(e.ref_char) if e.ref_char else 0 for e in alignment),
+                                dtype=np.int64, count=len(alignment))
+        hyp_codes = np.fromiter((ord(e.hyp_char) if e.hyp_char else 0 for e in alignment),
+                                dtype=np.int64, count=len(alignment))
+        keys = _to_ids(ref_codes, self.unit) * self.size + _to_ids(hyp_codes, self.unit)
+
+        self._pending.setdefault(group, []).append(keys)
+        self._pending_size += len(keys)
+        if self._pending_size >= self.COMPACT_THRESHOLD:
+            self._compact()
+
+    def add(self, reference: str, hypothesis: str, group: str = 'all'):
+        """정답/예측 문장을 정렬해 누적"""
+        if self.unit == 'jamo':
+            alignment = align_korean_jamo(reference, hypothesis)
+        else:
+            alignment = align_korean_text(reference, hypothesis)
+        self.add_alignment(alignment, group)
+
+    def _add_counts(self, group: str, keys: np.ndarray, counts: np.ndarray):
+        """그룹의 기존 카운트에 (키, 카운트) 배열을 더함"""
+        if group in self._keys:
+            keys = np.concatenate([self._keys[group], keys])
+            counts = np.concatenate([self._counts[group], counts])
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        self._keys[group] = unique_keys
+        self._counts[group] = np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.int32)
+
+    def _compact(self):
+        """대기 중인 키들을 그룹별 카운트 배열로 합침"""
+        for group, key_list in self._pending.items():
+            keys = np.concatenate(key_list)
+            self._add_counts(group, keys, np.ones(len(keys), dtype=np.int32))
+        self._pending = {}
+        self._pending_size = 0
+
+    def merge(self, other: "ConfusionMatrix"):
+        """다른 프로세스에서 누적한 혼동 행렬을 합침"""
+        if other.unit != self.unit:
+            raise ValueError(f"단위가 다른 혼동 행렬은 합칠 수 없습니다: {self.unit} != {other.unit}")
+
+        self._compact()
+        other._compact()
+        for group in other._keys:
+            self._add_counts(group, other._keys[group], other._counts[group])
+        return self
+
+    def to_dense(self, group: str = 'all') -> tuple:
+        """
+        그룹의 int32 혼동 행렬 (행: 정답, 열: 예측)
+        음절 단위 전체 표는 11174 x 11174 (약 500MB)이므로 정답이나 예측에 한 번이라도 나온 id만 남김
+
+        Returns:
+            (행렬, 행/열 순서의 라벨 목록) 튜플
+        """
+        self._compact()
+        if group not in self._keys:
+            return np.zeros((0, 0), dtype=np.int32), []
+
+        keys, counts = self._keys[group], self._counts[group]
+        ids, inverse = np.unique(np.concatenate([keys // self.size, keys % self.size]), return_inverse=True)
+        rows, cols = inverse[:len(keys)], inverse[len(keys):]
+
+        matrix = np.zeros((len(ids), len(ids)), dtype=np.int32)
+        matrix[rows, cols] = counts
+        return matrix, [self.labels[i] for i in ids]
+
+    def most_confused(self, group: str = 'all', top_k: int = 20) -> list:
+        """가장 많이 혼동한 (정답, 예측, 횟수) 목록 (빈칸은 ''로 표시)"""
+        self._compact()
+        if group not in self._keys:
+            return []
+
+        keys, counts = self._keys[group], self._counts[group]
+        errors = (keys // self.size) != (keys % self.size)
+        keys, counts = keys[errors], counts[errors]
+        order = np.argsort(-counts, kind='stable')[:top_k]
+
+        return [(self.labels[key // self.size], self.labels[key % self.size], int(count))
+                for key, count in zip(keys[order], counts[order])]
+
+    def save(self, path: str):
+        """.npz 파일로 저장"""
+        self._compact()
+        groups = sorted(self._keys)
+        arrays = {
+            'unit': np.array(self.unit),
+            'groups': np.array(groups, dtype=str)
+        }
+        for i, group in enumerate(groups):
+            arrays[f'keys_{i}'] = self._keys[group]
+            arrays[f'counts_{i}'] = self._counts[group]
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ConfusionMatrix":
+        """save로 저장한 .npz 파일 로드"""
+        with np.load(path) as data:
+            matrix = cls(unit=str(data['unit']))
+            for i, group in enumerate(data['groups'].tolist()):
+                matrix._keys[group] = data[f'keys_{i}']
+                matrix._counts[group] = data[f'counts_{i}']
+        return matrix
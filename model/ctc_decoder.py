@@ -0,0 +1,217 @@
+"""
+CTC prefix beam search 디코더
+프레임마다 (빔 x 후보 토큰) 확장 점수, 접두사 해시, 편향 점수를 NumPy 행렬 연산으로 한 번에 계산하고,
+같은 접두사끼리 먼저 합친 뒤 상위 beam_width개만 남김
+목표 문장(학습자가 읽어야 하는 문장)의 음절 n-gram에 가중치를 주는 shallow fusion 방식의 편향 지원
+"""
+import numpy as np
+
+# 빔 탐색 기본값
+DEFAULT_BEAM_WIDTH = 8
+DEFAULT_BIAS_WEIGHT = 2.0
+DEFAULT_BIAS_ORDER = 3
+# blank 확률이 이보다 높은 프레임은 새 토큰 후보를 만들지 않음
+BLANK_SKIP_THRESHOLD = 0.999
+
+# 접두사 해시 (splitmix64 섞기 함수, uint64 곱셈은 2^64로 나눈 나머지로 순환)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _log_softmax(logits):
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    return logits - np.log(np.exp(logits).sum(axis=-1, keepdims=True))
+
+
+def _extend_hash(hashes, tokens):
+    """접두사 해시 배열에 토큰 하나씩을 이어 붙인 접두사의 해시"""
+    z = hashes * _HASH_MULTIPLIER + (tokens.astype(np.uint64) + np.uint64(1))
+    z ^= z >> np.uint64(30)
+    z *= _MIX_1
+    z ^= z >> np.uint64(27)
+    z *= _MIX_2
+    z ^= z >> np.uint64(31)
+    return z
+
+
+class CTCBeamSearchDecoder:
+    """
+    Wav2Vec2CTCTokenizer 어휘를 쓰는 CTC prefix beam search 디코더
+
+    Args:
+        tokenizer: Wav2Vec2CTCTokenizer (blank는 pad 토큰, 공백은 word_delimiter_token)
+        beam_width: 빔 크기 (프레임마다 확장하는 후보 토큰 수도 같음)
+        bias_weight: 목표 문장 n-gram과 일치하는 토큰에 더하는 로그 점수 (최고 차수 일치 기준)
+        bias_order: 목표 문장 음절 n-gram 최대 차수
+    """
+
+    def __init__(self, tokenizer, beam_width: int = DEFAULT_BEAM_WIDTH, bias_weight: float = DEFAULT_BIAS_WEIGHT,
+                 bias_order: int = DEFAULT_BIAS_ORDER):
+        vocab = tokenizer.get_vocab()
+        self.tokenizer = tokenizer
+        self.token_to_id = vocab
+        self.blank_id = tokenizer.pad_token_id
+        self.delimiter_id = vocab.get(tokenizer.word_delimiter_token)
+        self.vocab_size = max(vocab.values()) + 1
+        self.beam_width = beam_width
+        self.bias_weight = bias_weight
+        self.bias_order = bias_order
+
+        # n-gram은 (어휘 크기 + 1)진수 정수 하나로 표현 (자리값 0은 '토큰 없음')
+        self._base = self.vocab_size + 1
+        if self._base ** bias_order >= 2 ** 63:
+            raise ValueError(f"bias_order {bias_order} is too large for a vocabulary of {self.vocab_size} tokens")
+
+    def _target_ngram_keys(self, targets):
+        """
+        목표 문장들의 토큰 n-gram 키 (공백은 단어 구분 토큰, 어휘에 없는 문자는 건너뜀)
+
+        Returns:
+            list[np.ndarray]: n(1 ~ bias_order)차 n-gram 키의 정렬된 배열 (인덱스 n-1)
+        """
+        if isinstance(targets, str):
+            targets = [targets]
+
+        keys = [set() for _ in range(self.bias_order)]
+        for target in targets:
+            ids = [self.delimiter_id if char.isspace() else self.token_to_id.get(char)
+                   for char in ' '.join(target.split())]
+            ids = [i for i in ids if i is not None]
+            for n in range(1, self.bias_order + 1):
+                for k in range(len(ids) - n + 1):
+                    key = 0
+                    for token in ids[k:k + n]:
+                        key = key * self._base + token + 1
+                    keys[n - 1].add(key)
+        return [np.array(sorted(k), dtype=np.int64) for k in keys]
+
+    def _bias(self, history, tokens, target_keys):
+        """
+        접두사 끝 문맥(history) 다음에 토큰이 올 때의 편향 점수
+        (목표 문장과 일치하는 가장 긴 n-gram 차수 / 최대 차수 x bias_weight)
+        """
+        bias = np.zeros(len(tokens))
+        key = tokens.astype(np.int64) + 1
+        scale = 1
+        for n in range(1, self.bias_order + 1):
+            if n > 1:
+                scale *= self._base
+                key = key + (history[:, -(n - 1)] + 1) * scale
+            keys = target_keys[n - 1]
+            if len(keys):
+                found = keys[np.minimum(np.searchsorted(keys, key), len(keys) - 1)] == key
+                bias[found] = self.bias_weight * n / self.bias_order
+        return bias
+
+    def decode(self, logits, targets=None) -> str:
+        """
+        [프레임, 어휘] 로짓 (또는 로그 확률)을 빔 탐색으로 디코딩
+
+        Args:
+            logits: np.ndarray 또는 torch.Tensor
+            targets: 편향을 줄 목표 문장 (문자열 또는 문자열 목록), None이면 편향 없음
+
+        Returns:
+            str: 디코딩 결과 (greedy 디코딩과 같은 tokenizer.decode 형식)
+        """
+        if hasattr(logits, "detach"):
+            logits = logits.detach().float().cpu().numpy()
+        log_probs = _log_softmax(np.asarray(logits, dtype=np.float64))
+        target_keys = self._target_ngram_keys(targets) if targets else None
+
+        # 접두사 트리 노드 (부모 노드, 마지막 토큰), 노드 0 = 빈 접두사; 프레임마다 새 노드를 배열로 추가
+        node_parents, node_tokens = [np.array([-1])], [np.array([-1])]
+        node_count = 1
+
+        # 빔 상태 (모두 빔 축 배열)
+        nodes = np.array([0])                                         # 접두사 노드
+        last = np.array([-1])                                         # 접두사의 마지막 토큰 (빈 접두사는 -1)
+        hashes = np.zeros(1, dtype=np.uint64)                         # 접두사 해시 (같은 접두사 합치기용)
+        history = np.full((1, max(self.bias_order - 1, 0)), -1)       # 접두사 끝 토큰들 (오래된 순, 없으면 -1)
+        blank_scores = np.array([0.0])            # 접두사가 blank로 끝나는 경로의 로그 확률
+        token_scores = np.array([-np.inf])        # 접두사의 마지막 토큰으로 끝나는 경로의 로그 확률
+        bias_scores = np.array([0.0])             # 접두사에 누적된 편향 점수
+        candidates = min(self.beam_width, log_probs.shape[1])
+        log_skip = np.log(BLANK_SKIP_THRESHOLD)
+
+        for frame in log_probs:
+            total = np.logaddexp(blank_scores, token_scores)
+            # 같은 토큰 반복은 접두사를 바꾸지 않음
+            repeat = token_scores + np.where(last >= 0, frame[np.maximum(last, 0)], -np.inf)
+
+            if frame[self.blank_id] > log_skip:
+                blank_scores, token_scores = total + frame[self.blank_id], repeat
+                continue
+
+            # 후보 토큰 확장: 마지막 토큰과 같으면 blank를 사이에 둔 경로만 가능
+            top = np.argpartition(-frame, candidates - 1)[:candidates]
+            top = top[top != self.blank_id]
+            beam_count = len(nodes)
+            source = np.where(top[None, :] == last[:, None], blank_scores[:, None], total[:, None])
+            extend = (source + frame[top][None, :]).ravel()
+            ext_beam = np.repeat(np.arange(beam_count), len(top))
+            ext_token = np.tile(top, beam_count)
+            ext_bias = bias_scores[ext_beam]
+            if target_keys is not None:
+                ext_bias = ext_bias + self._bias(history[ext_beam], ext_token, target_keys)
+
+            # 기존 빔(blank/반복)과 모든 확장 후보를 같은 접두사(해시)끼리 먼저 합침
+            all_hashes = np.concatenate([hashes, _extend_hash(hashes[ext_beam], ext_token)])
+            order = np.argsort(all_hashes, kind="stable")
+            sorted_hashes = all_hashes[order]
+            group_start = np.concatenate([[True], sorted_hashes[1:] != sorted_hashes[:-1]])
+            first = order[group_start]                    # 접두사별 첫 항목 (stable 정렬이므로 기존 빔이 먼저)
+            inverse = np.empty(len(order), dtype=np.int64)
+            inverse[order] = np.cumsum(group_start) - 1
+            merged_blank = np.full(len(first), -np.inf)
+            merged_token = np.full(len(first), -np.inf)
+            merged_bias = np.full(len(first), -np.inf)
+            np.logaddexp.at(merged_blank, inverse, np.concatenate([total + frame[self.blank_id],
+                                                                   np.full(len(extend), -np.inf)]))
+            np.logaddexp.at(merged_token, inverse, np.concatenate([repeat, extend]))
+            np.maximum.at(merged_bias, inverse, np.concatenate([bias_scores, ext_bias]))
+
+            # 합친 뒤 점수 상위 beam_width개 빔 유지
+            scores = np.logaddexp(merged_blank, merged_token) + merged_bias
+            keep = np.argsort(-scores, kind="stable")[:self.beam_width]
+
+            # 대표 항목: 기존 빔이 포함된 접두사는 기존 빔(앞쪽 인덱스), 아니면 첫 확장 후보
+            representative = first[keep]
+            is_new = representative >= beam_count
+            extension = representative[is_new] - beam_count
+            new_beams, new_tokens = ext_beam[extension], ext_token[extension]
+
+            kept_nodes = np.empty(len(keep), dtype=np.int64)
+            kept_nodes[~is_new] = nodes[representative[~is_new]]
+            kept_nodes[is_new] = np.arange(node_count, node_count + len(extension))
+            node_parents.append(nodes[new_beams])
+            node_tokens.append(new_tokens)
+            node_count += len(extension)
+
+            kept_history = np.empty((len(keep), history.shape[1]), dtype=history.dtype)
+            kept_history[~is_new] = history[representative[~is_new]]
+            if history.shape[1]:
+                kept_history[is_new] = np.concatenate([history[new_beams, 1:], new_tokens[:, None]], axis=1)
+
+            kept_hashes = np.empty(len(keep), dtype=np.uint64)
+            kept_hashes[~is_new] = hashes[representative[~is_new]]
+            kept_hashes[is_new] = all_hashes[representative[is_new]]
+
+            kept_last = np.empty(len(keep), dtype=np.int64)
+            kept_last[~is_new] = last[representative[~is_new]]
+            kept_last[is_new] = new_tokens
+
+            nodes, hashes, history, last = kept_nodes, kept_hashes, kept_history, kept_last
+            blank_scores, token_scores, bias_scores = merged_blank[keep], merged_token[keep], merged_bias[keep]
+
+        best = nodes[np.argmax(np.logaddexp(blank_scores, token_scores) + bias_scores)]
+        return self._to_text(best, np.concatenate(node_parents), np.concatenate(node_tokens))
+
+    def _to_text(self, node, parents, tokens):
+        """접두사 노드의 토큰 ID를 greedy 디코딩과 같은 tokenizer.decode로 변환 (접두사는 이미 CTC 축약됨)"""
+        ids = []
+        while node > 0:
+            ids.append(int(tokens[node]))
+            node = parents[node]
+        return self.tokenizer.decode(ids[::-1], group_tokens=False).strip()
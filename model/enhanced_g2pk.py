@@ -1,17 +1,266 @@
+import gc
+import os
+import pickle
 import re
+import threading
+from collections import OrderedDict
 
+import numpy as np
+import g2pk2
 from g2pk2 import G2p as OriginalG2p
+from g2pk2.utils import gloss, parse_table, get_rule_id2text
+from nltk.corpus import cmudict
+
+from g2p_lexicon import PronunciationLexicon
+
+# 미리 계산한 발음 사전 경로 (g2p_lexicon.py로 생성, 없으면 사용하지 않음)
+G2P_LEXICON_PATH = os.environ.get("G2P_LEXICON_PATH")
+
+# g2pk2 규칙표 스냅샷 경로 (지정하면 파싱한 규칙표와 CMU 사전을 pickle로 저장해 다음 프로세스부터 재사용)
+G2P_SNAPSHOT_PATH = os.environ.get("G2P_SNAPSHOT_PATH")
+SNAPSHOT_VERSION = 1
+
+# 스냅샷 유효성 확인에 쓰는 g2pk2 규칙 파일
+G2PK_DIR = os.path.dirname(os.path.abspath(g2pk2.__file__))
+G2PK_RULE_FILES = ('table.csv', 'rules.txt', 'idioms.txt')
+
+# 한글 음절 범위 ('가' ~ '힣')
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+
+# 유음화 교정 대상: 왼쪽 단어의 끝 음절 [갈-힐], 공백 뒤의 초성 ㄹ 음절 [라-맇]
+RHOT_LEFT_FIRST, RHOT_LEFT_LAST = ord('갈'), ord('힐')
+RHOTACIZED_ONSET_PATTERN = re.compile(r'\s[라-맇]')
+
+# 정규식 \s와 같은 공백 문자 여부 표 (U+3000 이후에는 공백 문자가 없음)
+WHITESPACE_TABLE = np.array([chr(c).isspace() for c in range(0x3002)])
+WHITESPACE_TABLE[-1] = False
+
+# 일반적인 형용사 어간 ('-게'가 부사형 어미이므로 '-께'로 바꾸지 않음)
+ADJ_STEMS = ['가냘프', '가늘', '가파르', '거세', '거칠', '건조하', '검', '게으르', '고르', '고달프',
+             '고맙', '곱', '고프', '곧', '굳', '굵', '귀엽', '기쁘', '길', '깊', '깨끗하', 
+             '나쁘', '낮', '너그럽', '너르', '노랗', '높', '눅', '느리', '늦', '더럽', 
+             '더웁', '둥글', '드물', '딱하', '뛰어나', '뜨겁', '많', '멀', '멋지', '메마르', 
+             '메스껍', '못나', '못되', '못생기', '무겁', '무디', '무르', '무섭', '미끈하',
+             '미워하', '미치', '반갑', '보드랍', '보람차', '보잘것없', '부드럽', '부르', 
+             '붉', '비싸', '빠르', '뼈저리', '새롭', '서툴', '섣부르', '성가시', '세', 
+             '수다스럽', '수줍', '쉽', '슬프', '싫', '싸', '쌀쌀맞', '쏜살같', '쓰디쓰', 
+             '쓰리', '쓰', '아름답', '아쉽', '아프', '안쓰럽', '안타깝', '약삭빠르', 
+             '약', '얇', '얕', '어둡', '어렵', '어리', '언짢', '없', '열띠', '예쁘', 
+             '올바르', '외롭', '우습', '의심쩍', '이르', '익', '있', '작', '잘나', '잘빠지', 
+             '재미있', '적', '젊', '점잖', '조그맣', '좁', '좋', '주제넘', '줄기차', '즐겁', 
+             '지나치', '지혜롭', '질기', '짓궂', '짙', '케케묵', '크', '탐스럽', '턱없', 
+             '푸르', '흐리', '희망차', '희', '힘겹', '힘차','만들']
+
+# '-게'를 그대로 두는 단어: '에게', '내게' 조사와 형용사 어간 + '게'
+PROTECTED_WORDS = ['에게', '내게'] + [stem + '게' for stem in ADJ_STEMS]
+
+
+def _trie_pattern(words):
+    """단어 목록을 접두사 트리 형태의 정규식으로 변환 (Aho-Corasick처럼 공통 접두사를 한 번만 비교)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    # 첫 글자 문자 집합으로 먼저 걸러서 대부분의 위치에서는 분기를 하나씩 시도하지 않음
+    first_chars = ''.join(sorted(char for char in trie if char))
+    return f'(?=[{re.escape(first_chars)}])' + build(trie)
+
+
+# 보호 단어는 목록 순서대로 우선하므로, '게으르게'보다 뒤에 있는 단어는
+# 자신의 '게'가 '게으르게'의 시작과 겹치면 보호하지 않음 (예: '세게으르게'는 '게으르게'가 보호됨)
+_GEUREUGE_INDEX = PROTECTED_WORDS.index('게으르게')
+_PROTECTED_WORD_PATTERN = (
+    _trie_pattern(PROTECTED_WORDS[:_GEUREUGE_INDEX + 1])
+    + '|(?:' + _trie_pattern(PROTECTED_WORDS[_GEUREUGE_INDEX + 1:]) + ')(?!으르게)'
+)
+
+# 보호 구간: 보호 단어, 또는 보호 단어와 겹치지 않는 한글 + '하게'
+_PROTECTED_PATTERN = (
+    rf'(?:{_PROTECTED_WORD_PATTERN})'
+    rf'|(?:(?!{_PROTECTED_WORD_PATTERN})[가-힣])+하(?!{_PROTECTED_WORD_PATTERN})게'
+)
+
+# 한 번의 스캔으로 처리하는 패턴 (먼저 맞는 쪽이 우선)
+# 1. protected: 보호 구간은 그대로 유지
+#    ('하게' 구간은 한글 연속 구간의 시작이나 보호 단어 바로 뒤에서만 시도해 같은 구간을 반복 탐색하지 않음)
+# 2. 용언 어간 + (공백) + '게(요)' -> '께(요)' (뒤따르는 '게'가 보호 구간의 시작이면 제외)
+VERB_ENDING_PATTERN = re.compile(
+    rf'(?P<protected>(?:{_PROTECTED_WORD_PATTERN})'
+    rf'|(?:(?<![가-힣])|(?<=게))(?:(?!{_PROTECTED_WORD_PATTERN})[가-힣])+하(?!{_PROTECTED_WORD_PATTERN})게)'
+    rf'|(?P<stem>[갈-힐])\s*(?=게)(?!{_PROTECTED_PATTERN})게(?P<yo>요)?'
+)
+
+
+def _rewrite_verb_ending(match):
+    if match.group('protected') is not None:
+        return match.group(0)
+    return match.group('stem') + '께' + (match.group('yo') or '')
+
+
+def _rule_table_signature():
+    """g2pk2 규칙 파일의 (이름, 크기, 수정 시각) 목록 (파일이 바뀌면 스냅샷을 다시 만듦)"""
+    signature = [SNAPSHOT_VERSION]
+    for name in G2PK_RULE_FILES:
+        stat = os.stat(os.path.join(G2PK_DIR, name))
+        signature.append((name, stat.st_size, stat.st_mtime_ns))
+    return signature
+
+
+def _parse_idioms():
+    """idioms.txt를 (패턴, 대체 문자열) 목록으로 파싱 (g2pk2는 매 호출마다 파일을 다시 읽음)"""
+    rules = []
+    with open(os.path.join(G2PK_DIR, 'idioms.txt'), 'r', encoding='utf8') as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if "===" in line:
+                str1, str2 = line.split("===")
+                rules.append((str1, str2))
+    return rules
+
+
+def _read_snapshot(snapshot_path, with_cmu=False):
+    """
+    스냅샷 파일 읽기 (앞쪽 레코드: 서명 + 규칙표, 뒤쪽 레코드: CMU 사전)
+    CMU 사전이 필요 없으면 앞쪽 레코드만 읽음
+    
+    Returns:
+        (dict, dict|None) | None: (규칙표, CMU 사전), 파일이 없거나 오래되었으면 None
+    """
+    if not snapshot_path or not os.path.exists(snapshot_path):
+        return None
+
+    # 큰 dict를 만드는 동안 GC가 반복해서 도는 것을 막음
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(snapshot_path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('signature') != _rule_table_signature():
+                return None
+            cmu = pickle.load(f) if with_cmu else None
+        return header['tables'], cmu
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as e:
+        print(f"G2P 규칙표 스냅샷을 읽지 못했습니다 ({snapshot_path}): {e}")
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _write_snapshot(snapshot_path, tables, cmu):
+    """규칙표와 CMU 사전을 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'signature': _rule_table_signature(), 'tables': tables}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(cmu, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+
+def load_rule_tables(snapshot_path=None):
+    """
+    g2pk2 규칙표, 규칙 설명, 관용구 규칙 로드
+    snapshot_path가 주어지면 유효한 스냅샷을 읽고, 없거나 오래되었으면 새로 파싱해 CMU 사전과 함께 저장
+    
+    Returns:
+        dict: 'table', 'rule2text', 'idioms'
+    """
+    snapshot = _read_snapshot(snapshot_path)
+    if snapshot is not None:
+        return snapshot[0]
+
+    tables = {
+        'table': parse_table(),
+        'rule2text': get_rule_id2text(),
+        'idioms': _parse_idioms(),
+    }
+    if snapshot_path:
+        _write_snapshot(snapshot_path, tables, cmudict.dict())
+    return tables
+
+
+class LazyCmuDict:
+    """영어 단어가 처음 나올 때 로드하는 CMU 발음 사전 (convert_eng에서 쓰는 in / [] 만 지원)"""
+
+    def __init__(self, snapshot_path=None):
+        self.snapshot_path = snapshot_path
+        self._cmu = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._cmu is None:
+            with self._lock:
+                if self._cmu is None:
+                    snapshot = _read_snapshot(self.snapshot_path, with_cmu=True)
+                    self._cmu = snapshot[1] if snapshot is not None else cmudict.dict()
+        return self._cmu
+
+    def __contains__(self, word):
+        return word in self._load()
+
+    def __getitem__(self, word):
+        return self._load()[word]
 
 
 class EnhancedG2p(OriginalG2p):
-    """Enhanced version of G2p with improved pattern matching"""
+    """
+    Enhanced version of G2p with improved pattern matching
+    MeCab과 규칙표는 첫 변환 때, CMU 사전은 영어 단어가 처음 나올 때 로드 (서버에서는 warmup()으로 미리 로드)
+    """
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, lexicon_path=None, snapshot_path=None, use_konlpy=False, mecab_path=None):
+        # g2pk2 자원은 warmup()에서 로드하므로 G2p.__init__은 호출하지 않음
+        self.use_konlpy = use_konlpy
+        self.mecab_path = mecab_path
+        self.snapshot_path = snapshot_path
+        self.idioms_path = os.path.join(G2PK_DIR, 'idioms.txt')
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # 미리 계산한 발음 사전 (있으면 g2pk 처리 전에 먼저 조회)
+        self.lexicon = PronunciationLexicon(lexicon_path) if lexicon_path else None
         # 개별 단어 패턴 (직접 대체가 필요한 예외 케이스)
         self.word_patterns = {
             "밝기": "발끼",
         }
+
+    def warmup(self, load_cmu=False):
+        """MeCab과 규칙표를 로드하고, load_cmu=True면 CMU 사전까지 로드 (이미 로드되었으면 건너뜀)"""
+        if self._loaded:
+            return self
+
+        with self._load_lock:
+            if not self._loaded:
+                self.check_mecab()
+                self.mecab = self.get_mecab()
+                tables = load_rule_tables(self.snapshot_path)
+                self.table = tables['table']
+                self.rule2text = tables['rule2text']
+                self.cmu = LazyCmuDict(self.snapshot_path)
+                self.idiom_rules = [(re.compile(str1), str2) for str1, str2 in tables['idioms']]
+                self._loaded = True
+
+        if load_cmu:
+            self.cmu._load()
+        return self
+
+    def idioms(self, string, descriptive=False, verbose=False):
+        """idioms.txt 규칙 적용 (파일을 매번 읽지 않고 미리 파싱한 규칙 사용)"""
+        out = string
+        for pattern, replacement in self.idiom_rules:
+            out = pattern.sub(replacement, out)
+        gloss(verbose, out, string, "from idioms.txt")
+
+        return out
         
     def restore_spacing(self, text):
         """특수 문자로 처리된 공백을 복원"""
@@ -30,124 +279,79 @@ class EnhancedG2p(OriginalG2p):
         # 단독 '하게', '하게요' 패턴 직접 처리
         if text == '하게' or text == '하게요':
             return text
-        
-        # 복사본 생성
-        result = text
-        
-        # 보호할 세그먼트 저장을 위한 딕셔너리
-        protected_segments = {}
-        marker_counter = 0
-
-        # '에게', '내게' 조사 보호 (완전 대체)
-        for protect_pattern in ['에게', '내게']:
-            while protect_pattern in result:
-                marker = f"__PROTECTED_{marker_counter}__"
-                protected_segments[marker] = protect_pattern
-                result = result.replace(protect_pattern, marker, 1)  # 한 번에 하나씩 대체
-                marker_counter += 1
-
-        # 일반적인 형용사 + '게' 패턴 보호
-        adj_stems = ['가냘프', '가늘', '가파르', '거세', '거칠', '건조하', '검', '게으르', '고르', '고달프',
-                      '고맙', '곱', '고프', '곧', '굳', '굵', '귀엽', '기쁘', '길', '깊', '깨끗하', 
-                      '나쁘', '낮', '너그럽', '너르', '노랗', '높', '눅', '느리', '늦', '더럽', 
-                      '더웁', '둥글', '드물', '딱하', '뛰어나', '뜨겁', '많', '멀', '멋지', '메마르', 
-                      '메스껍', '못나', '못되', '못생기', '무겁', '무디', '무르', '무섭', '미끈하', ''
-                      '미워하', '미치', '반갑', '보드랍', '보람차', '보잘것없', '부드럽', '부르', 
-                      '붉', '비싸', '빠르', '뼈저리', '새롭', '서툴', '섣부르', '성가시', '세', 
-                      '수다스럽', '수줍', '쉽', '슬프', '싫', '싸', '쌀쌀맞', '쏜살같', '쓰디쓰', 
-                      '쓰리', '쓰', '아름답', '아쉽', '아프', '안쓰럽', '안타깝', '약삭빠르', 
-                      '약', '얇', '얕', '어둡', '어렵', '어리', '언짢', '없', '열띠', '예쁘', 
-                      '올바르', '외롭', '우습', '의심쩍', '이르', '익', '있', '작', '잘나', '잘빠지', 
-                      '재미있', '적', '젊', '점잖', '조그맣', '좁', '좋', '주제넘', '줄기차', '즐겁', 
-                      '지나치', '지혜롭', '질기', '짓궂', '짙', '케케묵', '크', '탐스럽', '턱없', 
-                      '푸르', '흐리', '희망차', '희', '힘겹', '힘차','만들']
-        
-       # 형용사 어간 + '게' 패턴 보호 (완전 대체)
-        for stem in adj_stems:
-            pattern = stem + '게'
-            while pattern in result:
-                marker = f"__PROTECTED_{marker_counter}__"
-                protected_segments[marker] = pattern
-                result = result.replace(pattern, marker, 1)  # 한 번에 하나씩 대체
-                marker_counter += 1
 
-        
-        # '하게'로 끝나는 모든 패턴 보호 (완전 대체)
-        hage_pattern = re.compile(r'([가-힣]+)하게')
-        for match in hage_pattern.finditer(result):
-            full_match = match.group(0)
-            marker = f"__PROTECTED_{marker_counter}__"
-            protected_segments[marker] = full_match
-            
-            # 정확히 해당 위치의 문자열만 대체
-            start = match.start()
-            end = match.end()
-            result = result[:start] + marker + result[end:]
-            
-            marker_counter += 1
-            # 위치가 바뀌었으므로 패턴 다시 찾아야 함
-            hage_pattern = re.compile(r'([가-힣]+)하게')
-        
-        # 용언 어간 받침 'ㄹ' + '게' 패턴 변환 (의도/약속 표현)
-        result = re.sub(r'([갈-힐])\s*게(요)?', r'\1께\2', result)
-        
-        # 보호된 세그먼트 복원
-        for marker, original in protected_segments.items():
-            result = result.replace(marker, original)
-        
-        return result
+        # '게'가 없으면 바꿀 것이 없음
+        if '게' not in text:
+            return text
+
+        # 보호 구간은 그대로 두고 나머지 '-게'만 한 번의 좌→우 스캔으로 변환
+        return VERB_ENDING_PATTERN.sub(_rewrite_verb_ending, text)
     
     def fix_rhotacization(self, original_text, g2p_text):
         """
         종성 ㄹ + 띄어쓰기 + 초성 ㄴ 패턴에서 유음화가 발생한 경우를 원래대로 복원
         """
-        # G2p 텍스트에서 유음화된 패턴 직접 찾기 (종성 ㄹ + 공백 + 초성 ㄹ)
-        rhot_pattern = re.compile(r'([가-힣]*[갈-힐])\s+([라-맇][가-힣]*)')
-        result = g2p_text
-        
-        # 모든 유음화된 패턴 찾기
-        rhot_matches = list(rhot_pattern.finditer(result))
-        
-        for i, rhot_match in enumerate(rhot_matches):
-            # 유음화된 패턴
-            rhot_full = rhot_match.group(0)
-            l_word = rhot_match.group(1)
-            r_word = rhot_match.group(2)
-        
-            # 초성 ㄹ 음절을 초성 ㄴ 음절로 변환
-            r_syllable = r_word[0]  # 첫 음절 (ㄹ 초성)
-            
-            char_code = ord(r_syllable) - ord('가')
-            initial = char_code // 588
-            medial = (char_code % 588) // 28
-            final = char_code % 28
-            
-            # 초성이 'ㄹ'인지 확인 (초성 코드 5가 'ㄹ'에 해당)
-            if initial == 5:
-                # 'ㄴ'으로 바꾼 문자 계산 (초성 코드 2가 'ㄴ'에 해당)
-                new_char_code = (2 * 588) + (medial * 28) + final
-                new_char = chr(new_char_code + ord('가'))
-                
-                # 변환된 첫 글자를 가진 단어 생성
-                n_word = new_char + r_word[1:]
-                
-                # 유음화 패턴 교정
-                start = rhot_match.start(2)  # 두 번째 그룹의 시작 위치
-                end = rhot_match.end(2)      # 두 번째 그룹의 끝 위치
-                result = result[:start] + n_word + result[end:]
-        
-        return result
+        # 공백 뒤에 초성 ㄹ 음절이 없으면 바꿀 것이 없음
+        if not RHOTACIZED_ONSET_PATTERN.search(g2p_text):
+            return g2p_text
+
+        codes = np.frombuffer(g2p_text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        idx = np.arange(len(codes))
+
+        # 음절 코드에서 초성/중성/종성 일괄 계산
+        syllable = codes - HANGUL_BASE
+        is_hangul = (syllable >= 0) & (syllable < HANGUL_COUNT)
+        initial = np.where(is_hangul, syllable // 588, -1)
+
+        is_space = WHITESPACE_TABLE[np.minimum(codes, len(WHITESPACE_TABLE) - 1)]
+        prev_is_space = np.concatenate([[False], is_space[:-1]])
+        prev_is_hangul = np.concatenate([[False], is_hangul[:-1]])
+
+        # 각 위치 앞의 공백이 아닌 마지막 문자 (왼쪽 단어의 끝 음절)
+        last_non_space = np.maximum.accumulate(np.where(is_space, -1, idx))
+        left_end = np.concatenate([[-1], last_non_space[:-1]])
+        left_code = np.where(left_end >= 0, codes[np.maximum(left_end, 0)], 0)
+
+        # 유음화 후보: [갈-힐] 음절 + 공백 + 초성 ㄹ 음절
+        candidate = (
+            (initial == 5) & prev_is_space & (left_end >= 0)
+            & (left_code >= RHOT_LEFT_FIRST) & (left_code <= RHOT_LEFT_LAST)
+        )
+
+        # 각 위치가 속한 한글 연속 구간의 시작 위치
+        run_start = np.maximum.accumulate(np.where(is_hangul & ~prev_is_hangul, idx, -1))
+
+        # 앞선 후보에서 교정된 단어는 다음 후보의 왼쪽 단어가 될 수 없으므로 ('갈 랄 랄 랄' -> '갈 날 랄 날')
+        # 바로 앞 단어도 후보인 후보들이 이어진 사슬에서 짝수 번째만 교정
+        positions = idx[candidate]
+        if len(positions) == 0:
+            return g2p_text
+        chained = candidate[run_start[left_end[positions]]]
+        chain_start = np.maximum.accumulate(np.where(chained, -1, np.arange(len(positions))))
+        fix = positions[(np.arange(len(positions)) - chain_start) % 2 == 0]
+
+        # 초성 ㄹ(5) -> ㄴ(2)
+        codes[fix] -= (5 - 2) * 588
+
+        return codes.astype(np.uint32).tobytes().decode('utf-32-le')
         
     def __call__(self, string, descriptive=False, verbose=False, group_vowels=False, to_syl=True):
         """기존 G2p를 호출하되, 특정 패턴을 처리"""
         
+        # 0. 미리 계산한 발음 사전 조회
+        if self.lexicon is not None and not verbose:
+            cached = self.lexicon.lookup(string, descriptive, group_vowels, to_syl)
+            if cached is not None:
+                return cached
+
         # 1. 발음 패턴 처리 (g2pk 처리 전)
         result = self.process_patterns(string)
         
         # 2. 원본 문자열 저장 (나중에 유음화 처리에 사용)
         original_string = result
         
-        # 3. g2pk 원본 처리
+        # 3. g2pk 원본 처리 (처음 호출 시 MeCab, 규칙표 로드)
+        self.warmup()
         result = super().__call__(result, descriptive, verbose, group_vowels, to_syl)
         
         # 4. 특수 공백 복원
@@ -162,10 +366,122 @@ class EnhancedG2p(OriginalG2p):
         return result
 
 
-def convert_text(text, **kwargs):
-    """Helper function to convert text using EnhancedG2p"""
-    g2p = EnhancedG2p()
-    return g2p(text, **kwargs)
+class ConversionCache:
+    """(text, descriptive, group_vowels, to_syl) -> 변환 결과 LRU 캐시 (적중률 집계 포함)"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "maxsize": self.maxsize,
+            "currsize": len(self._entries)
+        }
+
+
+# 프로세스 전역 EnhancedG2p 인스턴스와 변환 결과 캐시
+_shared_g2p = None
+_shared_g2p_lock = threading.Lock()
+conversion_cache = ConversionCache()
+
+
+def get_shared_g2p():
+    """프로세스 전역 EnhancedG2p 인스턴스 (g2pk2 사전과 MeCab은 처음 한 번만 로드)"""
+    global _shared_g2p
+    with _shared_g2p_lock:
+        if _shared_g2p is None:
+            _shared_g2p = EnhancedG2p(lexicon_path=G2P_LEXICON_PATH, snapshot_path=G2P_SNAPSHOT_PATH)
+        return _shared_g2p
+
+
+def convert_text(text, descriptive=False, verbose=False, group_vowels=False, to_syl=True):
+    """Helper function to convert text using the shared EnhancedG2p (결과는 LRU 캐시)"""
+    if verbose:
+        # 변환 과정을 출력해야 하므로 캐시를 쓰지 않음
+        return get_shared_g2p()(text, descriptive, verbose, group_vowels, to_syl)
+
+    key = (text, descriptive, group_vowels, to_syl)
+    result = conversion_cache.get(key)
+    if result is None:
+        result = get_shared_g2p()(text, descriptive=descriptive, group_vowels=group_vowels, to_syl=to_syl)
+        conversion_cache.put(key, result)
+    return result
+
+
+def _convert_chunk(args):
+    """프로세스 풀 작업 단위: 문장 묶음 변환 (변환에 실패한 문장은 오류를 출력하고 None, 나머지 문장은 계속 변환)"""
+    texts, descriptive, group_vowels, to_syl = args
+    g2p = get_shared_g2p()
+    results = []
+    for text in texts:
+        try:
+            results.append(g2p(text, descriptive=descriptive, group_vowels=group_vowels, to_syl=to_syl))
+        except Exception as e:
+            print(f"[G2PK 오류] {str(text)[:30]}...: {e}")
+            results.append(None)
+    return results
+
+
+def convert_batch(texts, descriptive=False, group_vowels=False, to_syl=True, num_workers=1, chunk_size=64):
+    """
+    여러 문장을 한 번에 변환
+    중복 문장과 이미 캐시된 문장은 다시 변환하지 않고, num_workers > 1이면 나머지를 프로세스 풀로 분산
+    변환에 실패한 문장은 원문을 그대로 반환 (캐시하지 않으므로 다음 호출에서 다시 변환)
+    
+    Returns:
+        list[str]: 입력 순서대로의 변환 결과
+    """
+    results = {}
+    pending = []
+    for text in dict.fromkeys(texts):
+        cached = conversion_cache.get((text, descriptive, group_vowels, to_syl))
+        if cached is None:
+            pending.append(text)
+        else:
+            results[text] = cached
+
+    chunks = [(pending[i:i + chunk_size], descriptive, group_vowels, to_syl)
+              for i in range(0, len(pending), chunk_size)]
+    if num_workers > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            converted = [c for chunk in executor.map(_convert_chunk, chunks) for c in chunk]
+    else:
+        converted = [c for chunk in chunks for c in _convert_chunk(chunk)]
+
+    for text, result in zip(pending, converted):
+        if result is None:
+            results[text] = text
+            continue
+        conversion_cache.put((text, descriptive, group_vowels, to_syl), result)
+        results[text] = result
+
+    return [results[text] for text in texts]
 
 '''
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+"""
+데이터셋 평가 파이프라인 구성 요소
+- ResultWriter: 채점 결과를 JSONL로 한 줄씩 추가 저장 (일정 개수/시간마다 flush + fsync)
+- read_results / scored_file_names: 이전 실행의 결과 파일을 읽어 재시작 시 건너뛸 발화 확인
+- score_records: G2P 변환 + CRR 채점 (프로세스 풀 작업 단위)
+- write_result_table: 채점 결과를 모델별 열로 된 Parquet/Arrow 표로 저장
+"""
+import json
+import os
+import time
+
+from cer_module import calculate_korean_crr_batch, preprocess_text
+from enhanced_g2pk import convert_text, conversion_cache
+
+
+class ResultWriter:
+    """
+    결과 레코드를 JSONL 파일 끝에 추가하는 기록기
+    flush_every개 레코드 또는 flush_seconds초마다 디스크에 반영하므로, 중단되어도 그 전까지의 결과는 남음
+    """
+
+    def __init__(self, path: str, flush_every: int = 32, flush_seconds: float = 10.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._file = None
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            # 이전 실행이 줄 중간에서 끊겼으면 다음 레코드가 그 줄에 이어 붙지 않도록 줄바꿈 추가
+            if self._file.tell() > 0:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._file.write("\n")
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self._file is not None and self._unflushed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+def read_results(path: str) -> dict:
+    """
+    JSONL 결과 파일 읽기 (중단으로 잘린 줄은 무시, 같은 file_name은 마지막 레코드 사용)
+
+    Returns:
+        dict: file_name -> 레코드
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["file_name"]] = record
+    return records
+
+
+def scored_file_names(path: str, prefixes) -> set:
+    """모든 모델(prefixes)의 CRR이 기록된 file_name 집합"""
+    return {file_name for file_name, record in read_results(path).items()
+            if all(f"{prefix}_crr" in record for prefix in prefixes)}
+
+
+def _g2pk_convert(text):
+    try:
+        return convert_text(text)
+    except Exception as e:
+        print(f"[G2PK 오류] {text[:30]}...: {e}")
+        return text
+
+
+def score_records(records, prefixes):
+    """
+    전사 결과가 담긴 레코드들의 정답/예측 문장을 G2P 변환하고 모델별 CRR 채점
+
+    Args:
+        records (list[dict]): original_text와 {prefix}_result가 있는 레코드
+        prefixes (list[str]): 채점할 모델 접두사 (예: ["ft", "pt"])
+
+    Returns:
+        tuple: (채점 필드를 채운 레코드 리스트, (프로세스 ID, G2PK 캐시 통계))
+    """
+    for r in records:
+        r["ground_truth_g2pk"] = _g2pk_convert(r["original_text"])
+        # micro CRR 계산용 정답 글자 수 (CRR과 같은 전처리 기준)
+        r["ref_len"] = len(preprocess_text(r["ground_truth_g2pk"], True, True))
+
+    gt_texts = [r["ground_truth_g2pk"] for r in records]
+    for prefix in prefixes:
+        for r in records:
+            r[f"{prefix}_g2pk"] = _g2pk_convert(r[f"{prefix}_result"])
+        batch = calculate_korean_crr_batch(gt_texts, [r[f"{prefix}_g2pk"] for r in records])
+        for r, crr in zip(records, batch["results"]):
+            r.update({
+                f"{prefix}_crr": crr['crr'],
+                f"{prefix}_sub": crr['substitutions'],
+                f"{prefix}_del": crr['deletions'],
+                f"{prefix}_ins": crr['insertions']
+            })
+    return records, (os.getpid(), conversion_cache.info())
+
+
+def write_result_table(records, prefixes, path: str):
+    """
+    채점 결과를 발화당 한 행, 모델별 전사 결과/CRR/S/D/I를 열로 담은 표로 저장 (pyarrow 필요)
+    확장자가 .parquet이면 Parquet, 그 외(.arrow, .feather)는 Arrow IPC 파일
+
+    Returns:
+        pyarrow.Table: 저장한 표
+    """
+    import pyarrow as pa
+
+    fields = [
+        pa.field("split", pa.string()),
+        pa.field("file_name", pa.string()),
+        pa.field("original_text", pa.string()),
+        pa.field("ground_truth_g2pk", pa.string()),
+        pa.field("ref_len", pa.int64()),
+    ]
+    for prefix in prefixes:
+        fields += [
+            pa.field(f"{prefix}_result", pa.string()),
+            pa.field(f"{prefix}_g2pk", pa.string()),
+            pa.field(f"{prefix}_crr", pa.float64()),
+            pa.field(f"{prefix}_sub", pa.int64()),
+            pa.field(f"{prefix}_del", pa.int64()),
+            pa.field(f"{prefix}_ins", pa.int64()),
+        ]
+    schema = pa.schema(fields)
+    table = pa.Table.from_pydict({name: [r.get(name) for r in records] for name in schema.names}, schema=schema)
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path)
+    return table
@@ -1,27 +1,38 @@
 import os
 import json
-import torch
-import torchaudio
-from cer_module import calculate_korean_crr
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from confusion_matrix import ConfusionMatrix
 from wav2vec2 import Wav2Vec2
-from enhanced_g2pk import EnhancedG2p
-from transformers import Wav2Vec2Processor, Wav2Vec2ForCTC
+from audio_io import decode_audio_bytes, prepare_waveform
+from transcript_cache import audio_sha256
+from eval_pipeline import ResultWriter, read_results, score_records, scored_file_names, write_result_table
 import yaml
 
-# config 로드
-config_path = "data/config/wav2vec2.yaml"
+# config 로드 (실행 디렉터리와 관계없이 저장소의 설정 파일)
+config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "config", "wav2vec2.yaml")
 with open(config_path, 'r') as file:
     config = yaml.safe_load(file)
 
-finetuned_model = Wav2Vec2(config=config)
-g2p = EnhancedG2p()
-
 pretrained_model_name = "kresnik/wav2vec2-large-xlsr-korean"
-pretrained_processor = Wav2Vec2Processor.from_pretrained(pretrained_model_name)
-pretrained_model = Wav2Vec2ForCTC.from_pretrained(pretrained_model_name).to("cuda")
 
-USE_FINETUNED = False
-USE_PRETRAINED = True
+# 평가할 모델 등록 (접두사 -> 기본 설정의 model 항목에 덮어쓸 값), 비교할 모델은 여기에 추가
+EVAL_MODELS = {
+    "ft": {},
+    "pt": {"id": pretrained_model_name, "device": "cuda"},
+}
+ENABLED_MODELS = ["pt"] # 이번 실행에서 평가할 모델 접두사
+SHARED_AUDIO = True # 파일마다 한 번만 디코딩/리샘플링해 모든 모델에 같은 텐서 전달 (False면 모델마다 따로 디코딩)
+NUM_WORKERS = os.cpu_count() or 1 # G2P/CRR 채점에 사용할 프로세스 수
+IO_WORKERS = 4 # 오디오 파일 읽기/디코딩 스레드 수
+EVAL_BATCH_SIZE = 32 # transcribe_batch에 한 번에 넘길 발화 수 (버킷 크기는 설정의 max_audio_seconds로 제한)
+PREFETCH_BATCHES = 2 # 추론 중에 미리 읽어 둘 배치 수
+MAX_PENDING_SCORES = 2 * NUM_WORKERS # 채점 대기 배치가 이보다 많으면 추론을 잠시 멈춤
+RESULTS_PATH = "evaluation_results.jsonl" # 발화별 채점 결과 (재시작 시 이미 채점된 발화는 건너뜀)
+FLUSH_EVERY = 64 # 이 개수의 레코드마다 결과 파일 flush
+FLUSH_SECONDS = 30 # 또는 이 시간(초)마다 flush
+RESULTS_TABLE_PATH = "evaluation_results.parquet" # 모델별 CRR과 S/D/I를 열로 담은 결과 표 (.parquet 또는 .arrow)
 
 CATEGORY_MAP = {
     "중국어": "chinese", # 중국인 데이터
@@ -32,42 +43,167 @@ CATEGORY_MAP = {
     "기타": "others" # 기타 데이터
 }
 
-def transcribe_finetuned(audio_bytes, filename):
-    try:
-        return finetuned_model.transcribe_from_bytes(audio_bytes, filename)
-    except Exception as e:
-        print(f"[FT 오류] {filename}: {e}")
-        return ""
+def load_models():
+    """
+    ENABLED_MODELS의 모델 목록 (스크립트를 import하는 채점 프로세스에서는 모델을 만들지 않도록 함수로 분리)
+
+    Returns:
+        list[tuple]: (접두사, Wav2Vec2) 리스트
+    """
+    return [(prefix, Wav2Vec2(config={**config, "model": {**config["model"], **EVAL_MODELS[prefix]}}))
+            for prefix in ENABLED_MODELS]
 
-def transcribe_pretrained(audio_path):
+def load_item_audio(item, models):
+    """
+    I/O 스레드 작업 단위: 파일을 한 번 읽어 해시로 모델별 전사 결과 캐시를 조회하고,
+    캐시에 없는 모델이 있을 때만 디코딩 (읽기나 디코딩에 실패하면 error에 이유를 남기고 해당 모델의 오디오는 None)
+    SHARED_AUDIO면 디코딩과 모노 변환/리샘플링/정규화를 샘플링 레이트별로 한 번만 하고 모든 모델이 같은 텐서 사용
+    """
+    loaded = {"sha256": None, "cached": {}, "audio": {}, "error": None}
     try:
-        waveform, sr = torchaudio.load(audio_path)
-        if sr != 16000:
-            waveform = torchaudio.transforms.Resample(sr, 16000)(waveform)
-
-        inputs = pretrained_processor(
-            waveform.squeeze().numpy(),
-            sampling_rate=16000,
-            return_tensors="pt",
-            padding=True
-        )
-        inputs = {k: v.to("cuda") for k, v in inputs.items()}
-        with torch.no_grad():
-            logits = pretrained_model(**inputs).logits
-
-        predicted_ids = torch.argmax(logits, dim=-1)
-        return pretrained_processor.decode(predicted_ids[0])
+        with open(item["audio_path"], "rb") as f:
+            audio_bytes = f.read()
+        loaded["sha256"] = audio_sha256(audio_bytes)
 
-    except Exception as e:
-        print(f"[PT 오류] {audio_path}: {e}")
-        return ""
+        missing = []
+        for prefix, model in models:
+            loaded["cached"][prefix] = model.cached_transcripts([loaded["sha256"]])[0]
+            if loaded["cached"][prefix] is None:
+                missing.append((prefix, model))
 
-def g2pk_convert(text):
-    try:
-        return g2p(text)
+        if missing and SHARED_AUDIO:
+            waveform, sample_rate = decode_audio_bytes(audio_bytes, missing[0][1].sampling_rate)
+            shared = {}
+            for prefix, model in missing:
+                if model.sampling_rate not in shared:
+                    shared[model.sampling_rate] = prepare_waveform(waveform, sample_rate, model.sampling_rate)
+                loaded["audio"][prefix] = (shared[model.sampling_rate], model.sampling_rate)
+        else:
+            for prefix, model in missing:
+                loaded["audio"][prefix] = decode_audio_bytes(audio_bytes, model.sampling_rate)
     except Exception as e:
-        print(f"[G2PK 오류] {text[:30]}...: {e}")
-        return text
+        print(f"[오디오 오류] {item['file_name']}: {e}")
+        loaded["error"] = f"audio: {e}"
+        loaded["audio"] = {}
+    return loaded
+
+def transcribe_chunk(chunk, loaded, models):
+    """
+    미리 읽은 배치를 모델별 transcribe_batch로 추론해 채점 전 레코드 생성
+    캐시에 있던 발화는 저장된 결과를 쓰고, 새로 추론한 결과는 캐시에 저장
+    읽기나 추론에 실패한 발화는 error에 이유를 남김 (채점/기록하지 않으므로 다음 실행에서 다시 시도)
+    """
+    records = [{
+        "split": item["split"],
+        "file_name": item["file_name"],
+        "original_text": item["text"]
+    } for item in chunk]
+
+    for prefix, model in models:
+        indices = []
+        for i, (r, audio) in enumerate(zip(records, loaded)):
+            r[f"{prefix}_result"] = audio["cached"].get(prefix)
+            if audio["audio"].get(prefix) is not None:
+                indices.append(i)
+        if not indices:
+            continue
+        try:
+            texts = model.transcribe_batch([loaded[i]["audio"][prefix][0] for i in indices],
+                                           [loaded[i]["audio"][prefix][1] for i in indices])
+        except Exception as e:
+            print(f"[{prefix.upper()} 오류] {', '.join(chunk[i]['file_name'] for i in indices)}: {e}")
+            for i in indices:
+                records[i]["error"] = f"{prefix}: {e}"
+            continue
+        for i, text in zip(indices, texts):
+            records[i][f"{prefix}_result"] = text
+        model.store_transcripts([loaded[i]["sha256"] for i in indices], texts)
+
+    for r, audio in zip(records, loaded):
+        if audio["error"] is not None:
+            r["error"] = audio["error"]
+        elif "error" not in r and any(r[f"{prefix}_result"] is None for prefix, _ in models):
+            r["error"] = "no transcript"
+    return records
+
+def run_pipeline(items, models, results_path):
+    """
+    읽기(I/O 스레드 풀) -> 배치 추론(현재 스레드) -> G2P/CRR 채점(프로세스 풀) -> JSONL 기록 순의 파이프라인
+    다음 배치의 오디오를 읽는 동안 현재 배치를 추론하고, 채점은 추론과 겹쳐서 진행
+    """
+    prefixes = [prefix for prefix, _ in models]
+    chunks = [items[i:i + EVAL_BATCH_SIZE] for i in range(0, len(items), EVAL_BATCH_SIZE)]
+    cache_stats = {}
+    done_count = 0
+    failed_count = 0
+
+    def write_scored(future):
+        nonlocal done_count
+        try:
+            records, (pid, stats) = future.result()
+        except Exception as e:
+            # 기록되지 않은 발화는 다음 실행에서 다시 채점됨
+            print(f"[채점 오류] {e}")
+            return
+        cache_stats[pid] = stats
+        for r in records:
+            writer.write(r)
+            for prefix in prefixes:
+                print(f"[{prefix.upper()}-{r['split']}] {r['file_name']} - CRR: {r[f'{prefix}_crr']:.2%}")
+        done_count += len(records)
+        print(f"진행: {done_count}/{len(items)}" + (f" (실패 {failed_count}개)" if failed_count else ""))
+
+    # 채점 프로세스는 spawn으로 시작 (CUDA와 I/O 스레드가 있는 프로세스를 fork하지 않도록)
+    mp_context = multiprocessing.get_context("spawn")
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as io_pool, \
+            ProcessPoolExecutor(max_workers=NUM_WORKERS, mp_context=mp_context) as score_pool, \
+            ResultWriter(results_path, flush_every=FLUSH_EVERY, flush_seconds=FLUSH_SECONDS) as writer:
+
+        def prefetch(chunk):
+            return [io_pool.submit(load_item_audio, item, models) for item in chunk]
+
+        loading = deque(prefetch(chunk) for chunk in chunks[:PREFETCH_BATCHES])
+        scoring = set()
+        try:
+            for index, chunk in enumerate(chunks):
+                futures = loading.popleft()
+                if index + PREFETCH_BATCHES < len(chunks):
+                    loading.append(prefetch(chunks[index + PREFETCH_BATCHES]))
+
+                records = transcribe_chunk(chunk, [f.result() for f in futures], models)
+                failed = [r for r in records if "error" in r]
+                if failed:
+                    # 실패한 발화는 결과 파일에 남기지 않아 다음 실행에서 다시 시도
+                    failed_count += len(failed)
+                    records = [r for r in records if "error" not in r]
+                if records:
+                    scoring.add(score_pool.submit(score_records, records, prefixes))
+
+                # 끝난 채점 결과를 기록하고, 채점이 밀리면 추론을 멈추고 기다림
+                while scoring:
+                    done, _ = wait(scoring, timeout=0 if len(scoring) <= MAX_PENDING_SCORES else None,
+                                   return_when=FIRST_COMPLETED)
+                    if not done:
+                        break
+                    for future in done:
+                        write_scored(future)
+                    scoring -= done
+        finally:
+            # 중단되더라도 이미 넘긴 배치의 채점 결과는 기록
+            for future in wait(scoring).done:
+                write_scored(future)
+
+    if failed_count:
+        print(f"❗ 읽기/추론에 실패한 발화 {failed_count}개는 기록하지 않음 (다음 실행에서 다시 시도)")
+
+    for prefix, model in models:
+        if model.transcript_cache is not None:
+            info = model.transcript_cache.info()
+            print(f"[{prefix.upper()}] 전사 캐시 적중률: {info['hit_rate']:.2%} ({info['hits']}/{info['hits'] + info['misses']})")
+
+    hits = sum(stats["hits"] for stats in cache_stats.values())
+    total = hits + sum(stats["misses"] for stats in cache_stats.values())
+    print(f"G2PK 캐시 적중률: {hits / total if total else 0.0:.2%}")
 
 def load_data(base_dir):
     data = []
@@ -96,58 +232,42 @@ def load_data(base_dir):
             })
     return data
 
-def evaluate(data_dir):
+def evaluate(data_dir, results_path=RESULTS_PATH):
     dataset = load_data(data_dir)
-    results = []
+    prefixes = list(ENABLED_MODELS)
 
-    for item in dataset:
-        with open(item["audio_path"], "rb") as f:
-            audio_bytes = f.read()
+    # 재시작: 이미 채점된 발화는 건너뜀
+    scored = scored_file_names(results_path, prefixes)
+    pending = [item for item in dataset if item["file_name"] not in scored]
+    if scored:
+        print(f"이미 채점된 발화 {len(dataset) - len(pending)}개 건너뜀 ({results_path})")
+    if pending:
+        run_pipeline(pending, load_models(), results_path)
 
-        gt_text = item["text"]
-        gt_g2pk = g2pk_convert(gt_text)
-
-        result_record = {
-            "split": item["split"],
-            "file_name": item["file_name"],
-            "original_text": gt_text,
-            "ground_truth_g2pk": gt_g2pk
-        }
-
-        if USE_FINETUNED:
-            hyp_ft = transcribe_finetuned(audio_bytes, item["file_name"])
-            hyp_ft_g2pk = g2pk_convert(hyp_ft)
-            crr_ft = calculate_korean_crr(gt_g2pk, hyp_ft_g2pk)
-            result_record.update({
-                "ft_result": hyp_ft,
-                "ft_g2pk": hyp_ft_g2pk,
-                "ft_crr": crr_ft['crr'],
-                "ft_sub": crr_ft['substitutions'],
-                "ft_del": crr_ft['deletions'],
-                "ft_ins": crr_ft['insertions']
-            })
-            print(f"[FT-{item['split']}] {item['file_name']} - CRR: {crr_ft['crr']:.2%}")
-
-        if USE_PRETRAINED:
-            hyp_pt = transcribe_pretrained(item["audio_path"])
-            hyp_pt_g2pk = g2pk_convert(hyp_pt)
-            crr_pt = calculate_korean_crr(gt_g2pk, hyp_pt_g2pk)
-            result_record.update({
-                "pt_result": hyp_pt,
-                "pt_g2pk": hyp_pt_g2pk,
-                "pt_crr": crr_pt['crr'],
-                "pt_sub": crr_pt['substitutions'],
-                "pt_del": crr_pt['deletions'],
-                "pt_ins": crr_pt['insertions']
-            })
-            print(f"[PT-{item['split']}] {item['file_name']} - CRR: {crr_pt['crr']:.2%}")
+    # 결과 파일에서 데이터셋 순서대로 보고서 생성
+    records = read_results(results_path)
+    results = [records[item["file_name"]] for item in dataset if item["file_name"] in records]
+    results = [r for r in results if all(f"{prefix}_crr" in r for prefix in prefixes)]
 
-        results.append(result_record)
+    for prefix in prefixes:
+        crrs = [r[f"{prefix}_crr"] for r in results]
+        errors = sum(r[f"{prefix}_sub"] + r[f"{prefix}_del"] + r[f"{prefix}_ins"] for r in results)
+        # calculate_korean_crr_batch와 같은 기준: 전체 = 정답 글자 수 + 삽입 수
+        total = sum(r["ref_len"] + r[f"{prefix}_ins"] for r in results)
+        micro_crr = round(1 - errors / total, 4) if total > 0 else 1.0
+        macro_crr = round(sum(crrs) / len(crrs), 4) if crrs else 1.0
+        print(f"[{prefix.upper()}] micro CRR: {micro_crr:.2%}, macro CRR: {macro_crr:.2%}")
+
+        # 언어별 자모 혼동 행렬 저장 (대시보드용)
+        confusion = ConfusionMatrix(unit="jamo")
+        for r in results:
+            confusion.add(r["ground_truth_g2pk"], r[f"{prefix}_g2pk"], group=r["split"])
+        confusion.save(f"evaluation_{prefix}_jamo_confusion.npz")
 
     # 저장
     with open("evaluation_model_comparison.txt", "w", encoding="utf-8") as f:
-        ft_scores, pt_scores = [], []
-        ft_split_scores, pt_split_scores = {}, {}
+        scores = {prefix: [] for prefix in prefixes}
+        split_scores = {prefix: {} for prefix in prefixes}
 
         for r in results:
             split = r["split"]
@@ -155,37 +275,33 @@ def evaluate(data_dir):
             f.write(f"Original: {r['original_text']}\n")
             f.write(f"Ground Truth G2PK: {r['ground_truth_g2pk']}\n")
 
-            if USE_FINETUNED:
-                f.write(f"FT Wav2Vec2: {r['ft_result']}\n")
-                f.write(f"FT G2PK: {r['ft_g2pk']}\n")
-                f.write(f"FT CRR: {r['ft_crr']:.2%} (sub={r['ft_sub']}, del={r['ft_del']}, ins={r['ft_ins']})\n")
-                ft_scores.append(r['ft_crr'])
-                ft_split_scores.setdefault(split, []).append(r['ft_crr'])
-
-            if USE_PRETRAINED:
-                f.write(f"PT Wav2Vec2: {r['pt_result']}\n")
-                f.write(f"PT G2PK: {r['pt_g2pk']}\n")
-                f.write(f"PT CRR: {r['pt_crr']:.2%} (sub={r['pt_sub']}, del={r['pt_del']}, ins={r['pt_ins']})\n")
-                pt_scores.append(r['pt_crr'])
-                pt_split_scores.setdefault(split, []).append(r['pt_crr'])
+            for prefix in prefixes:
+                tag = prefix.upper()
+                f.write(f"{tag} Wav2Vec2: {r[f'{prefix}_result']}\n")
+                f.write(f"{tag} G2PK: {r[f'{prefix}_g2pk']}\n")
+                f.write(f"{tag} CRR: {r[f'{prefix}_crr']:.2%} "
+                        f"(sub={r[f'{prefix}_sub']}, del={r[f'{prefix}_del']}, ins={r[f'{prefix}_ins']})\n")
+                scores[prefix].append(r[f'{prefix}_crr'])
+                split_scores[prefix].setdefault(split, []).append(r[f'{prefix}_crr'])
 
             f.write("-" * 60 + "\n")
 
-        if USE_FINETUNED:
-            avg_ft = sum(ft_scores) / len(ft_scores)
-            f.write(f"\n[✅ FT 전체 평균 CRR]: {avg_ft:.2%}\n")
-            f.write("[📊 FT 언어별 평균 CRR]\n")
-            for split, scores in ft_split_scores.items():
-                f.write(f"- {split}: {sum(scores)/len(scores):.2%} ({len(scores)}개)\n")
-
-        if USE_PRETRAINED:
-            avg_pt = sum(pt_scores) / len(pt_scores)
-            f.write(f"\n[✅ PT 전체 평균 CRR]: {avg_pt:.2%}\n")
-            f.write("[📊 PT 언어별 평균 CRR]\n")
-            for split, scores in pt_split_scores.items():
-                f.write(f"- {split}: {sum(scores)/len(scores):.2%} ({len(scores)}개)\n")
+        for prefix in prefixes:
+            tag = prefix.upper()
+            average = sum(scores[prefix]) / len(scores[prefix]) if scores[prefix] else 0.0
+            f.write(f"\n[✅ {tag} 전체 평균 CRR]: {average:.2%}\n")
+            f.write(f"[📊 {tag} 언어별 평균 CRR]\n")
+            for split, split_crrs in split_scores[prefix].items():
+                f.write(f"- {split}: {sum(split_crrs)/len(split_crrs):.2%} ({len(split_crrs)}개)\n")
 
     print("📄 결과 저장 완료: evaluation_model_comparison.txt")
 
+    # 발화당 한 행, 모델별 CRR/S/D/I 열로 된 결과 표 (pyarrow가 없으면 건너뜀)
+    try:
+        write_result_table(results, prefixes, RESULTS_TABLE_PATH)
+        print(f"📊 결과 표 저장 완료: {RESULTS_TABLE_PATH}")
+    except ImportError as e:
+        print(f"❗ 결과 표 저장 건너뜀 (pyarrow 필요): {e}")
+
 if __name__ == "__main__":
     evaluate("./data")
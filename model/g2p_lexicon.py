@@ -0,0 +1,110 @@
+import argparse
+import os
+import sqlite3
+import threading
+
+
+def normalize_key(text: str) -> str:
+    """사전 키 정규화 (저장과 조회에 같은 규칙 사용: 앞뒤 공백 제거)"""
+    return text.strip()
+
+
+class PronunciationLexicon:
+    """
+    미리 계산한 EnhancedG2p 변환 결과를 저장하는 SQLite 사전
+    (text, descriptive, group_vowels, to_syl) 기본 키의 B-tree 인덱스로 O(log n) 조회
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # fork된 워커 프로세스에서는 부모의 연결을 쓰지 않고 새로 연결
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lexicon ("
+                "text TEXT NOT NULL, descriptive INTEGER NOT NULL, group_vowels INTEGER NOT NULL, "
+                "to_syl INTEGER NOT NULL, pronunciation TEXT NOT NULL, "
+                "PRIMARY KEY (text, descriptive, group_vowels, to_syl)) WITHOUT ROWID"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def lookup(self, text: str, descriptive=False, group_vowels=False, to_syl=True):
+        """
+        저장된 발음 반환 (없으면 None)
+        정규화한 키로 조회하고, 입력의 앞뒤 공백은 변환 결과와 같도록 그대로 붙여 돌려줌
+        """
+        key = normalize_key(text)
+        if not key:
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT pronunciation FROM lexicon "
+                "WHERE text = ? AND descriptive = ? AND group_vowels = ? AND to_syl = ?",
+                (key, int(descriptive), int(group_vowels), int(to_syl))
+            ).fetchone()
+        if row is None:
+            return None
+        leading = text[:len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()):]
+        return leading + row[0] + trailing
+
+    def add_many(self, entries, descriptive=False, group_vowels=False, to_syl=True):
+        """(문장, 발음) 쌍들을 정규화한 키로 저장 (이미 있으면 덮어씀)"""
+        rows = [(normalize_key(text), int(descriptive), int(group_vowels), int(to_syl), normalize_key(pronunciation))
+                for text, pronunciation in entries]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO lexicon VALUES (?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM lexicon").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def build_lexicon(sentences, path: str, descriptive=False, group_vowels=False, to_syl=True,
+                  num_workers=1) -> PronunciationLexicon:
+    """연습 문장/단어 목록을 EnhancedG2p로 변환해 사전 파일에 저장"""
+    from enhanced_g2pk import convert_batch
+
+    sentences = list(dict.fromkeys(key for key in map(normalize_key, sentences) if key))
+    pronunciations = convert_batch(sentences, descriptive=descriptive, group_vowels=group_vowels,
+                                   to_syl=to_syl, num_workers=num_workers)
+
+    lexicon = PronunciationLexicon(path)
+    lexicon.add_many(zip(sentences, pronunciations), descriptive, group_vowels, to_syl)
+    return lexicon
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the precomputed EnhancedG2p pronunciation lexicon.")
+    parser.add_argument("--sentences", type=str, required=True, help="한 줄에 한 문장씩 적힌 연습 문장/단어 파일")
+    parser.add_argument("--output", type=str, default="g2p_lexicon.sqlite", help="생성할 사전 파일 경로")
+    parser.add_argument("--num_workers", type=int, default=1, help="변환에 사용할 프로세스 수")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    with open(args.sentences, "r", encoding="utf-8") as f:
+        sentences = f.readlines()
+
+    lexicon = build_lexicon(sentences, args.output, num_workers=args.num_workers)
+    print(f"사전 생성 완료: {args.output} ({len(lexicon)}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+import torch
+from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+
+
+def resolve_device(device: str) -> str:
+    """CUDA를 요청했지만 사용할 수 없으면 CPU로 대체"""
+    if device.startswith("cuda") and not torch.cuda.is_available():
+        return "cpu"
+    return device
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 Wav2Vec2 모델 레지스트리
+    (model_id, device, dtype) 별로 모델과 프로세서를 처음 요청될 때 한 번만 로드해 공유하고,
+    max_memory_bytes를 넘으면 가장 오래 사용하지 않은 모델부터 내림
+    """
+
+    def __init__(self, max_memory_bytes: int = None):
+        self.max_memory_bytes = max_memory_bytes
+        self._entries = OrderedDict()   # key -> (processor, model, 메모리 바이트)
+        self._load_times = {}           # key -> 로드 시간(초)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _model_bytes(model: torch.nn.Module) -> int:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def get(self, model_id: str, device: str = "cpu", dtype: torch.dtype = torch.float32):
+        """
+        모델과 프로세서 반환 (없으면 로드)
+        
+        Returns:
+            tuple: (Wav2Vec2Processor, Wav2Vec2ForCTC)
+        """
+        device = resolve_device(device)
+        key = (model_id, device, str(dtype))
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                processor, model, _ = self._entries[key]
+                return processor, model
+
+            start = time.perf_counter()
+            processor = Wav2Vec2Processor.from_pretrained(model_id)
+            model = Wav2Vec2ForCTC.from_pretrained(model_id, torch_dtype=dtype).to(device)
+            model.eval()
+            load_time = time.perf_counter() - start
+
+            self._entries[key] = (processor, model, self._model_bytes(model))
+            self._load_times[key] = load_time
+            print(f"[ModelRegistry] {model_id} ({device}, {dtype}) 로드 완료: {load_time:.2f}s")
+
+            self._evict_over_budget()
+            return processor, model
+
+    def _evict_over_budget(self):
+        """메모리 한도를 넘으면 LRU 순으로 모델을 내림 (방금 로드한 모델은 유지)"""
+        if self.max_memory_bytes is None:
+            return
+        while len(self._entries) > 1 and self.memory_bytes() > self.max_memory_bytes:
+            key, _ = self._entries.popitem(last=False)
+            print(f"[ModelRegistry] {key[0]} ({key[1]}, {key[2]}) 메모리 한도 초과로 해제")
+            if key[1].startswith("cuda"):
+                torch.cuda.empty_cache()
+
+    def evict(self, model_id: str, device: str = "cpu", dtype: torch.dtype = torch.float32) -> bool:
+        """특정 모델을 레지스트리에서 내림"""
+        key = (model_id, resolve_device(device), str(dtype))
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def memory_bytes(self) -> int:
+        return sum(size for _, _, size in self._entries.values())
+
+    def stats(self) -> dict:
+        """로드된 모델 목록, 모델별 로드 시간, 전체 메모리 사용량"""
+        return {
+            "loaded": [key for key in self._entries],
+            "load_times": dict(self._load_times),
+            "memory_bytes": self.memory_bytes()
+        }
+
+
+# 프로세스 전역 레지스트리
+registry = ModelRegistry()
+
+
+def get_model(model_id: str, device: str = "cpu", dtype: torch.dtype = torch.float32):
+    """전역 레지스트리에서 (processor, model) 조회"""
+    return registry.get(model_id, device, dtype)
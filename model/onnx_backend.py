@@ -0,0 +1,137 @@
+"""
+Wav2Vec2 CTC 모델의 ONNX Runtime CPU 백엔드
+- export_onnx: Hugging Face 모델을 ONNX로 내보내고, 선택적으로 int8 동적 양자화 모델도 생성
+- load_onnx_model: 내보낸 디렉터리에서 (프로세서, OnnxCTCModel) 로드
+  OnnxCTCModel은 Wav2Vec2 래퍼가 쓰는 부분(logits, device, 출력 길이 계산)만 Wav2Vec2ForCTC와 같게 제공
+
+사용법: python onnx_backend.py --model-id daeunn/wav2vec2-korean-finetuned2 \\
+                               --output data/onnx/wav2vec2-korean-finetuned2 [--quantize]
+"""
+import argparse
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import onnxruntime as ort
+import torch
+from transformers import Wav2Vec2Config, Wav2Vec2Processor
+
+from model_registry import get_model
+
+ONNX_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+OnnxCTCOutput = namedtuple("OnnxCTCOutput", ["logits"])
+
+
+class OnnxCTCModel:
+    """ONNX Runtime 세션을 Wav2Vec2ForCTC처럼 호출할 수 있게 감싼 래퍼"""
+
+    def __init__(self, model_path: str, config: Wav2Vec2Config, num_threads: int = None):
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.config = config
+        self.device = torch.device("cpu")
+
+    def __call__(self, input_values: torch.Tensor, attention_mask: torch.Tensor = None) -> OnnxCTCOutput:
+        feeds = {"input_values": input_values.numpy()}
+        if "attention_mask" in self.input_names:
+            if attention_mask is None:
+                attention_mask = torch.ones_like(input_values, dtype=torch.long)
+            feeds["attention_mask"] = attention_mask.numpy().astype(np.int64)
+
+        logits = self.session.run(["logits"], feeds)[0]
+        return OnnxCTCOutput(logits=torch.from_numpy(logits))
+
+    def _get_feat_extract_output_lengths(self, input_lengths: torch.Tensor) -> torch.Tensor:
+        """합성곱 특징 추출기를 거친 뒤의 프레임 수 (Wav2Vec2ForCTC와 같은 계산)"""
+        for kernel, stride in zip(self.config.conv_kernel, self.config.conv_stride):
+            input_lengths = torch.div(input_lengths - kernel, stride, rounding_mode="floor") + 1
+        return input_lengths
+
+
+def export_onnx(model_id: str, output_dir: str, quantize: bool = False, opset: int = 17) -> str:
+    """
+    Hugging Face Wav2Vec2ForCTC 모델을 ONNX로 내보내기 (배치 크기와 오디오 길이는 동적 축)
+
+    Args:
+        model_id: Hugging Face 모델 ID 또는 로컬 경로
+        output_dir: 모델, 프로세서, 설정을 저장할 디렉터리
+        quantize: True면 가중치를 int8로 동적 양자화한 모델도 함께 저장
+        opset: ONNX opset 버전
+
+    Returns:
+        str: output_dir
+    """
+    processor, model = get_model(model_id, "cpu")
+    model.eval()
+    os.makedirs(output_dir, exist_ok=True)
+
+    # attention mask는 프로세서가 만들어 주는 모델에서만 입력으로 받음
+    use_attention_mask = getattr(processor.feature_extractor, "return_attention_mask", False)
+    dummy_input = torch.randn(1, processor.feature_extractor.sampling_rate)
+    input_names = ["input_values"]
+    args = (dummy_input,)
+    dynamic_axes = {"input_values": {0: "batch", 1: "samples"}, "logits": {0: "batch", 1: "frames"}}
+    if use_attention_mask:
+        input_names.append("attention_mask")
+        args = (dummy_input, torch.ones_like(dummy_input, dtype=torch.long))
+        dynamic_axes["attention_mask"] = {0: "batch", 1: "samples"}
+
+    onnx_path = os.path.join(output_dir, ONNX_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model, args, onnx_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+    processor.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    print(f"ONNX 모델 저장 완료: {onnx_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(output_dir, INT8_FILE)
+        # 합성곱(ConvInteger)은 ONNX Runtime CPU에서 오히려 느리므로 트랜스포머의 MatMul만 양자화
+        quantize_dynamic(onnx_path, int8_path, op_types_to_quantize=["MatMul"], weight_type=QuantType.QInt8)
+        print(f"int8 양자화 모델 저장 완료: {int8_path}")
+
+    return output_dir
+
+
+@lru_cache(maxsize=None)
+def load_onnx_model(model_dir: str, quantized: bool = False, num_threads: int = None):
+    """
+    export_onnx로 내보낸 디렉터리에서 모델 로드 (같은 인자로는 프로세스당 한 번만 세션 생성)
+
+    Returns:
+        tuple: (Wav2Vec2Processor, OnnxCTCModel)
+    """
+    processor = Wav2Vec2Processor.from_pretrained(model_dir)
+    config = Wav2Vec2Config.from_pretrained(model_dir)
+    model_path = os.path.join(model_dir, INT8_FILE if quantized else ONNX_FILE)
+    return processor, OnnxCTCModel(model_path, config, num_threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a Wav2Vec2 CTC model to ONNX.")
+    parser.add_argument("--model-id", default="daeunn/wav2vec2-korean-finetuned2", help="Hugging Face 모델 ID")
+    parser.add_argument("--output", default="data/onnx/wav2vec2-korean-finetuned2", help="저장 디렉터리")
+    parser.add_argument("--quantize", action="store_true", help="int8 동적 양자화 모델도 저장")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset 버전")
+    args = parser.parse_args()
+
+    export_onnx(args.model_id, args.output, quantize=args.quantize, opset=args.opset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+batch_scheduler 테스트 (모델 대신 입력 배열의 합을 문자열로 돌려주는 가짜 모델 사용)
+
+사용법: cd model && python -m pytest -q test_batch_scheduler.py
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from batch_scheduler import BatchScheduler
+
+
+class FakeModel:
+    """transcribe_batch 호출을 기록하고, 값이 NaN인 오디오가 섞이면 배치 전체를 실패시키는 모델"""
+
+    def __init__(self, micro_batching=True):
+        self.config = {"batch": {"micro_batching": micro_batching}}
+        self.max_batch_seconds = 120
+        self.sampling_rate = 16000
+        self.transcript_cache = None
+        self.calls = []
+
+    def transcribe_batch(self, waveforms, sample_rates, max_batch_seconds=None):
+        self.calls.append(len(waveforms))
+        if any(np.isnan(w).any() for w in waveforms):
+            raise ValueError("corrupt upload")
+        return [str(int(w.sum())) for w in waveforms]
+
+
+def run_requests(scheduler, waveforms):
+    async def main():
+        async with scheduler:
+            return await asyncio.gather(*(scheduler.transcribe(w, 16000) for w in waveforms),
+                                        return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_failed_batch_is_retried_per_request():
+    model = FakeModel()
+    waveforms = [np.full(1600, 1.0), np.full(1600, np.nan), np.full(3200, 1.0)]
+    results = run_requests(BatchScheduler(model, max_wait_ms=50), waveforms)
+
+    assert results[0] == "1600"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "3200"
+    # 세 요청이 한 배치로 실패한 뒤 하나씩 다시 추론
+    assert model.calls == [3, 1, 1, 1]
+
+
+def test_micro_batching_groups_concurrent_requests():
+    model = FakeModel()
+    results = run_requests(BatchScheduler(model, max_wait_ms=50), [np.ones(1600)] * 4)
+
+    assert results == ["1600"] * 4
+    assert model.calls == [4]
+
+
+@pytest.mark.parametrize("micro_batching", [False, None])
+def test_micro_batching_is_opt_in(micro_batching):
+    model = FakeModel(micro_batching=False)
+    scheduler = BatchScheduler(model, max_wait_ms=50, micro_batching=micro_batching)
+    results = run_requests(scheduler, [np.ones(1600)] * 3)
+
+    assert results == ["1600"] * 3
+    assert model.calls == [1, 1, 1]
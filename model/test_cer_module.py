@@ -0,0 +1,45 @@
+"""
+cer_module 자모 CER 테스트
+
+사용법: cd model && python -m pytest -q test_cer_module.py
+"""
+import pytest
+
+from cer_module import calculate_korean_jamo_cer, calculate_levenshtein, decompose_to_jamo
+
+PAIRS = [
+    ("박", "발"),
+    ("가나", "가"),
+    ("가", "가나"),
+    ("사과를 먹었어요", "사가를 머거써요"),
+    ("학교에 갑니다", "하꾜에 감니다 요"),
+    ("", "안녕"),
+]
+
+
+@pytest.mark.parametrize("reference, hypothesis", PAIRS)
+def test_counts_and_confusions_come_from_one_alignment(reference, hypothesis):
+    result = calculate_korean_jamo_cer(reference, hypothesis)
+    confusions = result['confusions']
+
+    assert result['substitutions'] == sum(n for (r, h), n in confusions.items() if r and h)
+    assert result['deletions'] == sum(n for (r, h), n in confusions.items() if h is None)
+    assert result['insertions'] == sum(n for (r, h), n in confusions.items() if r is None)
+
+    # 정렬은 최소 편집 거리 경로
+    ref_jamo, hyp_jamo = (jamo.tolist() for jamo in decompose_to_jamo([reference.replace(' ', ''),
+                                                                       hypothesis.replace(' ', '')]))
+    distance, _ = calculate_levenshtein(hyp_jamo, ref_jamo)
+    assert sum(confusions.values()) == distance
+
+
+def test_final_consonant_is_one_substitution():
+    result = calculate_korean_jamo_cer("박", "발")
+    assert (result['substitutions'], result['deletions'], result['insertions']) == (1, 0, 0)
+    assert result['cer'] == round(1 / 3, 4)
+
+
+def test_missing_syllable_is_counted_as_deletion():
+    result = calculate_korean_jamo_cer("가나", "가")
+    assert (result['substitutions'], result['deletions'], result['insertions']) == (0, 2, 0)
+    assert result['cer'] == 0.5
@@ -0,0 +1,40 @@
+"""
+confusion_matrix 테스트
+
+사용법: cd model && python -m pytest -q test_confusion_matrix.py
+"""
+import numpy as np
+
+from confusion_matrix import ConfusionMatrix
+
+
+def test_dense_view_keeps_only_occurring_syllables():
+    confusion = ConfusionMatrix(unit='syllable')
+    confusion.add("가나다", "가나라")
+    confusion.add("가나", "가")
+
+    matrix, labels = confusion.to_dense()
+
+    assert labels == ['', '가', '나', '다', '라']
+    assert matrix.dtype == np.int32 and matrix.shape == (5, 5)
+    assert matrix[labels.index('가'), labels.index('가')] == 2
+    assert matrix[labels.index('다'), labels.index('라')] == 1
+    assert matrix[labels.index('나'), labels.index('')] == 1
+    assert matrix.sum() == 5
+
+
+def test_dense_view_matches_most_confused():
+    confusion = ConfusionMatrix(unit='jamo')
+    for reference, hypothesis in [("사과", "사가"), ("사과", "사가"), ("밥", "밤")]:
+        confusion.add(reference, hypothesis, group='thai')
+
+    matrix, labels = confusion.to_dense('thai')
+    errors = sorted((labels[r], labels[c], int(matrix[r, c]))
+                    for r, c in zip(*np.nonzero(matrix)) if r != c)
+
+    assert errors == sorted(confusion.most_confused('thai'))
+
+
+def test_dense_view_of_unknown_group_is_empty():
+    matrix, labels = ConfusionMatrix(unit='syllable').to_dense('missing')
+    assert matrix.shape == (0, 0) and labels == []
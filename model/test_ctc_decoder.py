@@ -0,0 +1,71 @@
+"""
+ctc_decoder 테스트: 가능한 모든 정렬 경로의 확률을 더한 정확한 CTC 최적 결과와 비교
+
+사용법: cd model && python -m pytest -q test_ctc_decoder.py
+"""
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("transformers")
+
+from transformers import Wav2Vec2CTCTokenizer
+
+from ctc_decoder import CTCBeamSearchDecoder
+
+VOCAB = {"<pad>": 0, "<unk>": 1, "|": 2, "가": 3, "나": 4}
+TOKENS = [0, 3, 4]  # blank와 실제로 점수를 주는 토큰
+
+
+@pytest.fixture(scope="module")
+def tokenizer(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ctc") / "vocab.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(VOCAB, f, ensure_ascii=False)
+    return Wav2Vec2CTCTokenizer(str(path), word_delimiter_token="|")
+
+
+def make_logits(values):
+    """[프레임, (blank, 가, 나)] 점수를 전체 어휘 로짓으로 (나머지 토큰은 매우 낮은 점수)"""
+    values = np.asarray(values, dtype=np.float64)
+    logits = np.full((len(values), len(VOCAB)), -30.0)
+    logits[:, TOKENS] = values
+    return logits
+
+
+def exact_best(tokenizer, logits):
+    """모든 정렬 경로를 CTC 축약해 같은 결과끼리 확률을 더한 뒤 가장 높은 결과"""
+    log_probs = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+    scores = {}
+    for path in itertools.product(TOKENS, repeat=len(log_probs)):
+        labels = tuple(t for i, t in enumerate(path) if t != 0 and (i == 0 or t != path[i - 1]))
+        score = sum(log_probs[i, t] for i, t in enumerate(path))
+        scores[labels] = np.logaddexp(scores.get(labels, -np.inf), score)
+    return tokenizer.decode(list(max(scores, key=scores.get)), group_tokens=False).strip()
+
+
+# 같은 접두사가 기존 빔의 blank/반복 경로와 확장 경로로 함께 만들어지는 경우:
+# 합치기 전에 확장 후보를 (확장 점수만으로) 먼저 잘라내면 그 경로의 확률이 빠져 정확한 최적 결과가 밀려남
+MERGE_CASES = [
+    (2, [[1.2, 4.6, -0.0], [0.7, -0.4, 0.0], [0.6, 2.1, -1.3], [-2.1, 0.1, 0.4]], "가가"),
+    (2, [[-0.6, 0.5, 1.1], [0.7, -1.1, 0.6], [-0.2, -0.2, -2.6], [1.0, -0.2, 2.6]], "나가나"),
+    (3, [[0.4, -1.2, 0.6], [2.1, -2.0, -0.3], [0.3, -0.2, -0.3], [2.6, 1.9, 1.3]], "나"),
+]
+
+
+@pytest.mark.parametrize("beam_width, values, expected", MERGE_CASES)
+def test_merges_duplicate_prefixes_before_pruning(tokenizer, beam_width, values, expected):
+    logits = make_logits(values)
+
+    assert exact_best(tokenizer, logits) == expected
+    assert CTCBeamSearchDecoder(tokenizer, beam_width=beam_width).decode(logits) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_wide_beam_matches_exact_ctc(tokenizer, seed):
+    # 프레임 4개에서 가능한 접두사는 31개 이하이므로 빔 64개면 가지치기 없이 정확한 결과
+    logits = make_logits(np.random.default_rng(seed).normal(0, 1.5, (4, 3)))
+
+    assert CTCBeamSearchDecoder(tokenizer, beam_width=64).decode(logits) == exact_best(tokenizer, logits)
@@ -0,0 +1,77 @@
+"""
+enhanced_g2pk 회귀 테스트 (g2pk2와 MeCab이 설치된 환경에서 실행)
+
+사용법: cd model && python -m pytest -q test_enhanced_g2pk.py
+"""
+import pytest
+
+pytest.importorskip("g2pk2")
+
+import enhanced_g2pk
+from enhanced_g2pk import EnhancedG2p, convert_batch, convert_text
+from g2p_lexicon import PronunciationLexicon
+
+
+# fix_rhotacization 문서 예시: (g2pk 출력, 교정 결과), 벡터화 이전 구현의 결과와 같음
+RHOTACIZATION_CASES = [
+    ("물 러키", "물 너키"),
+    ("달 러머", "달 너머"),
+    ("술 람기지 마세요", "술 남기지 마세요"),
+    ("글 래용이 조아요", "글 내용이 조아요"),
+    ("열씸히 할 라이에", "열씸히 할 나이에"),
+    ("라 라 라", "라 나 라"),
+    ("갈 랄 랄 랄", "갈 날 랄 날"),
+    ("알 라\t라", "알 나\t라"),
+    ("가나다", "가나다"),
+    ("밝기를 조절할께요", "밝기를 조절할께요"),
+]
+
+
+@pytest.mark.parametrize("g2p_text, expected", RHOTACIZATION_CASES)
+def test_fix_rhotacization(g2p_text, expected):
+    assert EnhancedG2p().fix_rhotacization("", g2p_text) == expected
+
+
+# __main__ 예시 문장의 전체 변환 결과
+CONVERSION_CASES = [
+    ("물 넣기", "물 너키"),
+    ("달 너머", "달 너머"),
+    ("술 남기지 마세요", "술 남기지 마세요"),
+    ("글 내용이 좋아요", "글 내용이 조아요"),
+    ("열심히 할 나이에", "열심히 할 나이에"),
+    ("감탄을 내게, 지원을 나비에게", "감타늘 내게, 지워늘 나비에게"),
+    ("인간 들을 내게 바쳐라.", "인간 드를 내게 바처라."),
+]
+
+
+@pytest.mark.parametrize("text, expected", CONVERSION_CASES)
+def test_rhotacization_examples(text, expected):
+    assert EnhancedG2p()(text) == expected
+
+
+# 발음 사전: 저장과 조회가 같은 키 정규화를 쓰므로 앞뒤 공백이 달라도 조회되고, 결과는 사전 없이 변환한 것과 같음
+LEXICON_QUERIES = ["물 넣기", "  물 넣기", "물 넣기\n", " 글 내용이 좋아요 \n"]
+
+
+@pytest.mark.parametrize("query", LEXICON_QUERIES)
+def test_lexicon_lookup_normalizes_keys(tmp_path, query):
+    path = str(tmp_path / "lexicon.sqlite")
+    lexicon = PronunciationLexicon(path)
+    lexicon.add_many([("물 넣기\n", "물 너키"), ("  글 내용이 좋아요", "글 내용이 조아요")])
+
+    assert lexicon.lookup(query) is not None
+    assert EnhancedG2p(lexicon_path=path)(query) == EnhancedG2p()(query)
+
+
+def test_convert_batch_keeps_chunk_when_one_sentence_fails(monkeypatch):
+    g2p = enhanced_g2pk.get_shared_g2p()
+
+    def failing_g2p(text, **kwargs):
+        if text == "실패할 문장":
+            raise ValueError("broken input")
+        return g2p(text, **kwargs)
+
+    monkeypatch.setattr(enhanced_g2pk, "get_shared_g2p", lambda: failing_g2p)
+    texts = ["물 넣기", "실패할 문장", "달 너머"]
+    assert convert_batch(texts) == [convert_text("물 넣기"), "실패할 문장", convert_text("달 너머")]
+    assert enhanced_g2pk.conversion_cache.get(("실패할 문장", False, False, True)) is None
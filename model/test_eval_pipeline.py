@@ -0,0 +1,206 @@
+"""
+평가 파이프라인 테스트: JSONL 결과 기록/재시작, 읽기·추론 실패 처리, 평가 모델 선택, 결과 표 저장 (모델 대신 가짜 모델 사용)
+
+사용법: cd model && python -m pytest -q test_eval_pipeline.py
+"""
+import json
+import sys
+
+import numpy as np
+import pytest
+
+import evaluate_dataset_crr
+from eval_pipeline import ResultWriter, read_results, scored_file_names, write_result_table
+from evaluate_dataset_crr import load_item_audio, transcribe_chunk
+
+
+def test_result_writer_appends_and_flushes(tmp_path):
+    path = str(tmp_path / "results" / "evaluation_results.jsonl")
+    with ResultWriter(path, flush_every=2, flush_seconds=3600) as writer:
+        writer.write({"file_name": "a.wav", "pt_crr": 0.5})
+        assert writer._unflushed == 1
+        writer.write({"file_name": "b.wav", "pt_crr": 1.0})
+        assert writer._unflushed == 0
+
+    with ResultWriter(path) as writer:
+        writer.write({"file_name": "a.wav", "pt_crr": 0.75})
+
+    records = read_results(path)
+    assert list(records) == ["a.wav", "b.wav"]
+    assert records["a.wav"]["pt_crr"] == 0.75
+
+
+def test_resume_after_truncated_line(tmp_path):
+    path = str(tmp_path / "evaluation_results.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"file_name": "a.wav", "ft_crr": 1.0, "pt_crr": 0.9}) + "\n")
+        f.write(json.dumps({"file_name": "b.wav", "pt_crr": 0.8}) + "\n")
+        f.write('{"file_name": "c.wav", "pt_')  # 기록 중 중단
+
+    assert scored_file_names(path, ["pt"]) == {"a.wav", "b.wav"}
+    assert scored_file_names(path, ["ft", "pt"]) == {"a.wav"}
+
+    # 잘린 줄 뒤에 이어 쓴 레코드는 새 줄에서 시작
+    with ResultWriter(path) as writer:
+        writer.write({"file_name": "c.wav", "pt_crr": 0.7})
+    assert scored_file_names(path, ["pt"]) == {"a.wav", "b.wav", "c.wav"}
+
+
+def test_scored_file_names_without_results_file(tmp_path):
+    assert scored_file_names(str(tmp_path / "missing.jsonl"), ["pt"]) == set()
+
+
+class FakeModel:
+    """캐시 없이 오디오 길이를 전사 결과로 돌려주는 모델 (fail이면 transcribe_batch가 실패)"""
+
+    sampling_rate = 16000
+    transcript_cache = None
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def cached_transcripts(self, audio_hashes, targets=None):
+        return [None] * len(audio_hashes)
+
+    def store_transcripts(self, audio_hashes, texts, targets=None):
+        pass
+
+    def transcribe_batch(self, waveforms, sample_rates=None):
+        if self.fail:
+            raise RuntimeError("CUDA out of memory")
+        return [str(np.asarray(w).shape[-1]) for w in waveforms]
+
+
+def make_item(name, audio_path):
+    return {"split": "thai", "file_name": name, "text": "안녕하세요", "audio_path": audio_path}
+
+
+def loaded_audio(samples):
+    return {"sha256": "0" * 64, "cached": {"pt": None}, "audio": {"pt": (np.zeros(samples), 16000)}, "error": None}
+
+
+def test_missing_file_is_reported_not_raised(tmp_path):
+    item = make_item("missing.wav", str(tmp_path / "missing.wav"))
+    loaded = load_item_audio(item, [("pt", FakeModel())])
+
+    assert loaded["error"].startswith("audio:")
+    records = transcribe_chunk([item], [loaded], [("pt", FakeModel())])
+    assert "error" in records[0]
+
+
+def test_failed_inference_is_marked_for_retry():
+    chunk = [make_item("a.wav", ""), make_item("b.wav", "")]
+    records = transcribe_chunk(chunk, [loaded_audio(1600), loaded_audio(3200)], [("pt", FakeModel(fail=True))])
+    assert all(r["error"].startswith("pt:") for r in records)
+
+    records = transcribe_chunk(chunk, [loaded_audio(1600), loaded_audio(3200)], [("pt", FakeModel())])
+    assert [r["pt_result"] for r in records] == ["1600", "3200"]
+    assert not any("error" in r for r in records)
+
+
+def test_partial_failure_marks_whole_record():
+    chunk = [make_item("a.wav", "")]
+    models = [("ft", FakeModel()), ("pt", FakeModel(fail=True))]
+    loaded = [{"sha256": "0" * 64, "cached": {"ft": None, "pt": None},
+               "audio": {"ft": (np.zeros(1600), 16000), "pt": (np.zeros(1600), 16000)}, "error": None}]
+
+    records = transcribe_chunk(chunk, loaded, models)
+    assert records[0]["ft_result"] == "1600"
+    assert records[0]["error"].startswith("pt:")
+
+
+@pytest.mark.parametrize("shared_audio", [True, False])
+def test_cached_transcripts_skip_decoding(tmp_path, monkeypatch, shared_audio):
+    audio_path = tmp_path / "a.wav"
+    audio_path.write_bytes(b"not a wav file")
+
+    class CachedModel(FakeModel):
+        def cached_transcripts(self, audio_hashes, targets=None):
+            return ["안녕하세요"] * len(audio_hashes)
+
+    monkeypatch.setattr(evaluate_dataset_crr, "SHARED_AUDIO", shared_audio)
+    item = make_item("a.wav", str(audio_path))
+    loaded = load_item_audio(item, [("pt", CachedModel())])
+
+    assert loaded["error"] is None and loaded["audio"] == {}
+    records = transcribe_chunk([item], [loaded], [("pt", CachedModel())])
+    assert records[0]["pt_result"] == "안녕하세요" and "error" not in records[0]
+
+
+def test_load_models_builds_enabled_models_in_order(monkeypatch):
+    monkeypatch.setattr(evaluate_dataset_crr, "Wav2Vec2", lambda config: config["model"])
+    monkeypatch.setattr(evaluate_dataset_crr, "EVAL_MODELS", {
+        "ft": {},
+        "pt": {"id": "kresnik/wav2vec2-large-xlsr-korean"},
+        "onnx": {"backend": "onnx", "onnx_path": "model.onnx"},
+    })
+    monkeypatch.setattr(evaluate_dataset_crr, "ENABLED_MODELS", ["onnx", "ft"])
+    base = evaluate_dataset_crr.config["model"]
+
+    models = evaluate_dataset_crr.load_models()
+
+    assert [prefix for prefix, _ in models] == ["onnx", "ft"]
+    # 등록한 값만 기본 설정의 model 항목에 덮어씀
+    assert models[0][1] == {**base, "backend": "onnx", "onnx_path": "model.onnx"}
+    assert models[1][1] == base
+
+
+def scored_record(file_name, prefixes):
+    record = {"split": "thai", "file_name": file_name, "original_text": "밥", "ground_truth_g2pk": "밥", "ref_len": 1}
+    for prefix in prefixes:
+        record.update({f"{prefix}_result": "밤", f"{prefix}_g2pk": "밤", f"{prefix}_crr": 0.0,
+                       f"{prefix}_sub": 1, f"{prefix}_del": 0, f"{prefix}_ins": 0})
+    return record
+
+
+@pytest.mark.parametrize("file_name", ["results.parquet", "results.arrow"])
+def test_result_table_has_a_column_set_per_model(tmp_path, file_name):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / file_name)
+
+    write_result_table([scored_record("a.wav", ["ft", "pt"])], ["ft", "pt"], path)
+
+    if file_name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path)
+    assert isinstance(table, pa.Table) and table.num_rows == 1
+    assert table.column("pt_sub").to_pylist() == [1]
+    assert [name for name in table.column_names if name.startswith("ft_")] == \
+        ["ft_result", "ft_g2pk", "ft_crr", "ft_sub", "ft_del", "ft_ins"]
+
+
+def make_scored_dataset(tmp_path, prefixes):
+    """모든 발화가 이미 채점된 데이터 디렉터리와 결과 파일 (evaluate가 추론 없이 보고서만 만듦)"""
+    data_dir = tmp_path / "data"
+    (data_dir / "thai" / "raw").mkdir(parents=True)
+    (data_dir / "thai" / "raw" / "a.wav").write_bytes(b"")
+    with open(data_dir / "thai" / "labels.json", "w", encoding="utf-8") as f:
+        json.dump([{"category": "태국어", "file_name": "a.wav", "text": ["밥"]}], f, ensure_ascii=False)
+
+    results_path = str(tmp_path / "evaluation_results.jsonl")
+    with ResultWriter(results_path) as writer:
+        writer.write(scored_record("a.wav", prefixes))
+    return str(data_dir), results_path
+
+
+@pytest.mark.parametrize("has_pyarrow", [True, False])
+def test_evaluate_writes_report_with_and_without_pyarrow(tmp_path, monkeypatch, has_pyarrow):
+    if has_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        # import pyarrow가 ImportError를 내도록 함
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setattr(evaluate_dataset_crr, "ENABLED_MODELS", ["ft", "pt"])
+    monkeypatch.setattr(evaluate_dataset_crr, "load_models", lambda: pytest.fail("모든 발화가 이미 채점됨"))
+    data_dir, results_path = make_scored_dataset(tmp_path, ["ft", "pt"])
+    monkeypatch.chdir(tmp_path)
+
+    evaluate_dataset_crr.evaluate(data_dir, results_path)
+
+    report = (tmp_path / "evaluation_model_comparison.txt").read_text(encoding="utf-8")
+    assert "FT CRR: 0.00% (sub=1, del=0, ins=0)" in report and "PT CRR" in report
+    assert (tmp_path / "evaluation_pt_jamo_confusion.npz").exists()
+    assert (tmp_path / evaluate_dataset_crr.RESULTS_TABLE_PATH).exists() == has_pyarrow
@@ -0,0 +1,71 @@
+"""
+transcript_cache 테스트 (임시 SQLite 파일 사용)
+
+사용법: cd model && python -m pytest -q test_transcript_cache.py
+"""
+import pytest
+
+import transcript_cache
+from transcript_cache import TranscriptCache, audio_sha256
+
+MODEL_ID = "daeunn/wav2vec2-korean-finetuned2"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "cache" / "transcripts.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_hit_and_miss_are_counted(cache):
+    hashes = [audio_sha256(b"a"), audio_sha256(b"b")]
+    cache.put_many([(hashes[0], "안녕하세요")], MODEL_ID, "rev1", "{}")
+
+    assert cache.get_many(hashes, MODEL_ID, "rev1", "{}") == ["안녕하세요", None]
+    info = cache.info()
+    assert (info["hits"], info["misses"], info["hit_rate"], info["entries"]) == (1, 1, 0.5, 1)
+
+
+@pytest.mark.parametrize("model_id, revision, params", [
+    ("kresnik/wav2vec2-large-xlsr-korean", "rev1", "{}"),
+    (MODEL_ID, "rev2", "{}"),
+    (MODEL_ID, "rev1", '{"beam_width": 4}'),
+])
+def test_key_separates_model_revision_and_params(cache, model_id, revision, params):
+    audio_hash = audio_sha256(b"a")
+    cache.put_many([(audio_hash, "안녕하세요")], MODEL_ID, "rev1", "{}")
+
+    assert cache.get_many([audio_hash], model_id, revision, params) == [None]
+
+
+def test_put_overwrites_same_key(cache):
+    audio_hash = audio_sha256(b"a")
+    cache.put_many([(audio_hash, "안녕")], MODEL_ID, "rev1", "{}")
+    cache.put_many([(audio_hash, "안녕하세요")], MODEL_ID, "rev1", "{}")
+
+    assert cache.get_many([audio_hash], MODEL_ID, "rev1", "{}") == ["안녕하세요"]
+    assert len(cache) == 1
+
+
+def test_prune_by_age_uses_creation_time(cache, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(transcript_cache.time, "time", lambda: clock[0])
+    cache.put_many([(audio_sha256(b"old"), "오래된")], MODEL_ID, "rev1", "{}")
+    clock[0] = 2000.0
+    cache.put_many([(audio_sha256(b"new"), "새로운")], MODEL_ID, "rev1", "{}")
+
+    # 조회해도 저장 시각은 바뀌지 않음
+    cache.get_many([audio_sha256(b"old")], MODEL_ID, "rev1", "{}")
+    assert cache.prune(older_than_seconds=500) == 1
+    assert cache.get_many([audio_sha256(b"old"), audio_sha256(b"new")], MODEL_ID, "rev1", "{}") == [None, "새로운"]
+
+
+def test_prune_keeps_only_given_revision(cache):
+    audio_hash = audio_sha256(b"a")
+    cache.put_many([(audio_hash, "이전")], MODEL_ID, "rev1", "{}")
+    cache.put_many([(audio_hash, "현재")], MODEL_ID, "rev2", "{}")
+    cache.put_many([(audio_hash, "다른 모델")], "other/model", "rev1", "{}")
+
+    assert cache.prune(model_id=MODEL_ID, keep_revision="rev2") == 1
+    assert sorted(cache.model_counts()) == [(MODEL_ID, "rev2", 1), ("other/model", "rev1", 1)]
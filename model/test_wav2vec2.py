@@ -0,0 +1,176 @@
+"""
+wav2vec2 래퍼 테스트 (작은 무작위 가중치 체크포인트를 임시 디렉터리에 만들어 CPU에서 실행)
+
+사용법: cd model && python -m pytest -q test_wav2vec2.py
+"""
+import json
+
+import numpy as np
+import pytest
+import torch
+
+pytest.importorskip("transformers")
+
+from transformers import (Wav2Vec2Config, Wav2Vec2CTCTokenizer, Wav2Vec2FeatureExtractor, Wav2Vec2ForCTC,
+                          Wav2Vec2Processor)
+
+from wav2vec2 import Wav2Vec2
+
+VOCAB = ["<pad>", "<s>", "</s>", "<unk>", "|"] + list("가나다라마바사아자차카타파하")
+
+
+def make_checkpoint(path, num_hidden_layers, return_attention_mask):
+    """
+    무작위 가중치 Wav2Vec2ForCTC 체크포인트 저장
+    특징 추출기는 프레임별 layer norm (group norm처럼 발화 전체 통계를 쓰지 않음)
+    """
+    path.mkdir()
+    with open(path / "vocab.json", "w", encoding="utf-8") as f:
+        json.dump({token: i for i, token in enumerate(VOCAB)}, f, ensure_ascii=False)
+    tokenizer = Wav2Vec2CTCTokenizer(str(path / "vocab.json"), word_delimiter_token="|")
+    feature_extractor = Wav2Vec2FeatureExtractor(do_normalize=return_attention_mask,
+                                                 return_attention_mask=return_attention_mask)
+    Wav2Vec2Processor(feature_extractor=feature_extractor, tokenizer=tokenizer).save_pretrained(str(path))
+
+    torch.manual_seed(0)
+    config = Wav2Vec2Config(
+        vocab_size=len(VOCAB), pad_token_id=0, hidden_size=32, num_hidden_layers=num_hidden_layers,
+        num_attention_heads=2, intermediate_size=64, conv_dim=(32,) * 7, feat_extract_norm="layer",
+        do_stable_layer_norm=True, num_conv_pos_embeddings=3, num_conv_pos_embedding_groups=1,
+    )
+    model = Wav2Vec2ForCTC(config)
+    with torch.no_grad():
+        # 무작위 모델이 blank만 내지 않도록 출력층을 크게 해 여러 토큰이 나오게 함
+        model.lm_head.weight.mul_(50)
+    model.save_pretrained(str(path))
+    return str(path)
+
+
+def make_model(model_dir, **config):
+    return Wav2Vec2({"model": {"id": model_dir, "device": "cpu", "sampling_rate": 16000}, **config})
+
+
+@pytest.fixture(scope="module")
+def local_model_dir(tmp_path_factory):
+    """프레임 밖 문맥을 보지 않는 모델 (트랜스포머 층 없음): 창 단위 추론이 전체 추론과 같은 프레임을 냄"""
+    return make_checkpoint(tmp_path_factory.mktemp("w2v") / "local", num_hidden_layers=0,
+                           return_attention_mask=False)
+
+
+@pytest.fixture(scope="module")
+def masked_model_dir(tmp_path_factory):
+    """attention mask를 쓰는 모델 (트랜스포머 층 1개): 길이가 다른 발화를 패딩해 한 버킷으로 묶을 수 있음"""
+    return make_checkpoint(tmp_path_factory.mktemp("w2v") / "masked", num_hidden_layers=1,
+                           return_attention_mask=True)
+
+
+def record_buckets(model, monkeypatch):
+    """_transcribe_bucket에 넘어간 버킷별 발화 길이(샘플) 기록"""
+    buckets = []
+    transcribe_bucket = model._transcribe_bucket
+
+    def spy(audios, indices, transcriptions, targets):
+        buckets.append([len(audios[i]) for i in indices])
+        return transcribe_bucket(audios, indices, transcriptions, targets)
+
+    monkeypatch.setattr(model, "_transcribe_bucket", spy)
+    return buckets
+
+
+def speech(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    return torch.from_numpy(rng.standard_normal(int(seconds * 16000)).astype(np.float32))[None]
+
+
+def test_stream_matches_full_transcription(local_model_dir):
+    model = make_model(local_model_dir)
+    audio = speech(5.3)
+
+    partials = list(model.transcribe_stream(audio, 16000, chunk_seconds=2, stride_seconds=0.5))
+    expected = model.transcribe_array(audio, 16000)
+
+    assert len(partials) == 5  # 창 시작: 0, 1, 2, 3, 4초
+    assert expected and partials[-1] == expected
+    # 부분 결과는 앞부분이 바뀌지 않고 이어 붙기만 함
+    assert all(later.startswith(earlier) for earlier, later in zip(partials, partials[1:]))
+
+
+def test_stream_ctc_pieces_merge_across_window_seams(local_model_dir):
+    model = make_model(local_model_dir)
+    ids = np.array([5, 5, 0, 6, 6, 4, 4, 7, 0, 7, 7])
+    expected = model.processor.decode(ids)
+
+    for cut in range(len(ids) + 1):
+        first, last_id = model._ctc_piece(ids[:cut], None)
+        second, _ = model._ctc_piece(ids[cut:], last_id)
+        assert (first + second).strip() == expected
+
+
+def test_beam_decoder_is_built_only_when_used(local_model_dir):
+    model = make_model(local_model_dir)
+    audio = speech(1.0)
+
+    model.transcribe_array(audio, 16000)
+    model.cache_params()
+    assert model._decoder is None
+
+    model.transcribe_array(audio, 16000, target="가나다")
+    assert model._decoder is not None and model._decoder.beam_width > 1
+
+
+def test_preprocessing_runs_on_cpu(local_model_dir, monkeypatch):
+    import wav2vec2
+
+    devices = []
+    prepare = wav2vec2.prepare_waveform
+
+    def spy(*args, device=None, **kwargs):
+        devices.append(device)
+        return prepare(*args, device=device, **kwargs)
+
+    monkeypatch.setattr(wav2vec2, "prepare_waveform", spy)
+    model = make_model(local_model_dir)
+    stereo = speech(1.0).repeat(2, 1)
+
+    audio = model.preprocess_audio(stereo, 44100)
+    segments, _ = model.preprocess_segments(stereo, 44100)
+
+    # 프로세서와 VAD가 numpy를 받으므로 모델 디바이스와 관계없이 CPU에서 전처리
+    assert devices == ["cpu", "cpu"]
+    assert isinstance(audio, np.ndarray) and np.array_equal(segments[0], audio)
+
+
+def test_batch_buckets_by_length_and_matches_single_transcription(masked_model_dir, monkeypatch):
+    model = make_model(masked_model_dir)
+    waveforms = [speech(seconds, seed) for seed, seconds in enumerate([1.5, 0.4, 2.0, 0.5, 1.0, 0.45])]
+    expected = [model.transcribe_array(w, 16000) for w in waveforms]
+
+    buckets = record_buckets(model, monkeypatch)
+    assert model.transcribe_batch(waveforms, 16000, max_batch_seconds=2.0) == expected
+
+    # 짧은 발화부터 길이순으로 묶고, 버킷마다 (발화 수 x 가장 긴 발화)가 예산 이하 (예산보다 긴 발화는 단독)
+    assert [n for bucket in buckets for n in bucket] == sorted(len(w[0]) for w in waveforms)
+    assert [len(bucket) for bucket in buckets] == [3, 1, 1, 1]
+    assert all(len(bucket) * max(bucket) <= 2 * 16000 for bucket in buckets if len(bucket) > 1)
+
+
+def test_padded_frames_are_not_decoded(masked_model_dir, monkeypatch):
+    model = make_model(masked_model_dir)
+    short, long = speech(0.3, seed=1), speech(3.0, seed=2)
+
+    buckets = record_buckets(model, monkeypatch)
+    texts = model.transcribe_batch([long, short], 16000, max_batch_seconds=60)
+
+    assert buckets == [[len(short[0]), len(long[0])]]
+    # 패딩된 2.7초 구간의 프레임을 디코딩했다면 짧은 발화 결과에 토큰이 더 붙음
+    assert texts == [model.transcribe_array(long, 16000), model.transcribe_array(short, 16000)]
+
+
+def test_unmasked_model_only_batches_equal_lengths(local_model_dir, monkeypatch):
+    model = make_model(local_model_dir)
+    waveforms = [speech(1.0, seed=1), speech(0.5, seed=2), speech(1.0, seed=3)]
+    expected = [model.transcribe_array(w, 16000) for w in waveforms]
+
+    buckets = record_buckets(model, monkeypatch)
+    assert model.transcribe_batch(waveforms, 16000, max_batch_seconds=60) == expected
+    assert buckets == [[8000], [16000, 16000]]
@@ -0,0 +1,172 @@
+"""
+오디오 내용 해시 기반 전사 결과 캐시 (SQLite)
+(오디오 바이트 sha256, 모델 ID, 모델 리비전, 디코딩 설정) 기본 키로 전사 결과를 저장해,
+같은 오디오를 같은 모델/설정으로 다시 추론하지 않음
+
+사용법 (오래되었거나 다른 리비전의 항목 정리):
+    python transcript_cache.py --db data/cache/transcripts.sqlite --stats
+    python transcript_cache.py --db data/cache/transcripts.sqlite --older-than-days 30
+    python transcript_cache.py --db data/cache/transcripts.sqlite --model-id daeunn/wav2vec2-korean-finetuned2 \\
+                               --keep-revision <커밋 해시>
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+def audio_sha256(audio_bytes: bytes) -> str:
+    """캐시 키로 쓰는 오디오 바이트의 sha256 (16진수)"""
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+class TranscriptCache:
+    """
+    전사 결과를 저장하는 SQLite 캐시
+    조회는 읽기만 하므로(쓰기 잠금 없음) 여러 프로세스가 동시에 조회할 수 있고, 정리는 저장 시각 기준
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # fork된 워커 프로세스에서는 부모의 연결을 쓰지 않고 새로 연결
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                "audio_sha256 TEXT NOT NULL, model_id TEXT NOT NULL, revision TEXT NOT NULL, "
+                "params TEXT NOT NULL, text TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (audio_sha256, model_id, revision, params)) WITHOUT ROWID"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def get_many(self, hashes, model_id: str, revision: str, params: str) -> list:
+        """
+        같은 모델/설정으로 저장된 전사 결과 조회
+
+        Returns:
+            list: 입력 순서대로의 전사 결과 (없으면 None)
+        """
+        results = []
+        with self._lock:
+            conn = self._connect()
+            for audio_hash in hashes:
+                row = conn.execute(
+                    "SELECT text FROM transcripts "
+                    "WHERE audio_sha256 = ? AND model_id = ? AND revision = ? AND params = ?",
+                    (audio_hash, model_id, revision, params)
+                ).fetchone()
+                results.append(row[0] if row else None)
+            found = sum(text is not None for text in results)
+            self.hits += found
+            self.misses += len(results) - found
+        return results
+
+    def put_many(self, entries, model_id: str, revision: str, params: str):
+        """(오디오 sha256, 전사 결과) 쌍들을 저장 (이미 있으면 덮어씀)"""
+        now = time.time()
+        rows = [(audio_hash, model_id, revision, params, text, now) for audio_hash, text in entries]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+    def prune(self, older_than_seconds: float = None, model_id: str = None, keep_revision: str = None) -> int:
+        """
+        오래되었거나 더 이상 쓰지 않는 항목 삭제
+
+        Args:
+            older_than_seconds: 저장한 지 이 시간이 지난 항목 삭제
+            model_id: 이 모델의 항목 중 keep_revision이 아닌 리비전 삭제 (keep_revision과 함께 사용)
+            keep_revision: model_id에서 남길 리비전
+
+        Returns:
+            int: 삭제한 항목 수
+        """
+        deleted = 0
+        with self._lock:
+            conn = self._connect()
+            if older_than_seconds is not None:
+                deleted += conn.execute("DELETE FROM transcripts WHERE created_at < ?",
+                                        (time.time() - older_than_seconds,)).rowcount
+            if model_id is not None and keep_revision is not None:
+                deleted += conn.execute("DELETE FROM transcripts WHERE model_id = ? AND revision != ?",
+                                        (model_id, keep_revision)).rowcount
+            conn.commit()
+        return deleted
+
+    def vacuum(self):
+        """삭제한 항목의 공간을 파일에서 회수"""
+        with self._lock:
+            self._connect().execute("VACUUM")
+
+    def model_counts(self) -> list:
+        """(모델 ID, 리비전, 항목 수) 목록"""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT model_id, revision, COUNT(*) FROM transcripts GROUP BY model_id, revision"
+            ).fetchall()
+
+    def info(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self)
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect and prune the Wav2Vec2 transcript cache.")
+    parser.add_argument("--db", type=str, default="data/cache/transcripts.sqlite", help="캐시 파일 경로")
+    parser.add_argument("--stats", action="store_true", help="모델/리비전별 항목 수 출력")
+    parser.add_argument("--older-than-days", type=float, default=None, help="저장한 지 이 기간이 지난 항목 삭제")
+    parser.add_argument("--model-id", type=str, default=None, help="리비전을 정리할 모델 ID")
+    parser.add_argument("--keep-revision", type=str, default=None, help="--model-id에서 남길 리비전 (나머지 삭제)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if (args.model_id is None) != (args.keep_revision is None):
+        raise SystemExit("--model-id와 --keep-revision은 함께 지정해야 합니다.")
+
+    cache = TranscriptCache(args.db)
+    if args.older_than_days is not None or args.model_id is not None:
+        older_than = args.older_than_days * 86400 if args.older_than_days is not None else None
+        deleted = cache.prune(older_than, args.model_id, args.keep_revision)
+        cache.vacuum()
+        print(f"캐시 정리 완료: {deleted}개 삭제, {len(cache)}개 남음")
+
+    if args.stats:
+        for model_id, revision, count in cache.model_counts():
+            print(f"{model_id} @ {revision}: {count}개")
+        print(f"전체: {len(cache)}개")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
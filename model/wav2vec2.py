@@ -1,7 +1,22 @@
+import hashlib
+import json
+import os
+
 import torch
 import torchaudio
 import numpy as np
-from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+
+from audio_io import decode_audio_bytes, prepare_waveform, speech_segments
+from ctc_decoder import CTCBeamSearchDecoder, DEFAULT_BEAM_WIDTH, DEFAULT_BIAS_WEIGHT, DEFAULT_BIAS_ORDER
+from model_registry import get_model
+from transcript_cache import TranscriptCache, audio_sha256
+
+# 버킷당 최대 오디오 길이 기본값 (초)
+DEFAULT_MAX_BATCH_SECONDS = 120
+
+# 스트리밍 전사 기본 창 길이와 양쪽 겹침(stride) 길이 (초)
+DEFAULT_CHUNK_SECONDS = 10
+DEFAULT_STRIDE_SECONDS = 1
 
 
 class Wav2Vec2:
@@ -10,95 +25,374 @@ class Wav2Vec2:
         self.model_id = config["model"]["id"]
         self.device = config["model"]["device"]
         self.sampling_rate = config["model"]["sampling_rate"]
+        # transcribe_batch에서 한 번의 forward에 넣을 최대 오디오 길이 (패딩 포함, 초)
+        self.max_batch_seconds = config.get("batch", {}).get("max_audio_seconds", DEFAULT_MAX_BATCH_SECONDS)
         
-        # 모델과 프로세서 로드
-        self.processor = Wav2Vec2Processor.from_pretrained(self.model_id)
-        self.model = Wav2Vec2ForCTC.from_pretrained(self.model_id)
+        self.backend = config["model"].get("backend", "torch")
         
-        # 디바이스 설정
-        if self.device == "cuda" and torch.cuda.is_available():
-            self.model = self.model.to("cuda")
+        # 모델과 프로세서
+        if self.backend == "torch":
+            # 레지스트리에서 공유, CUDA를 쓸 수 없으면 CPU
+            self.processor, self.model = get_model(self.model_id, self.device)
+        elif self.backend == "onnx":
+            # onnx_backend.py로 내보낸 모델을 ONNX Runtime CPU 세션으로 실행 (onnxruntime 필요)
+            from onnx_backend import load_onnx_model
+
+            self.processor, self.model = load_onnx_model(
+                config["model"]["onnx_path"], config["model"].get("quantize", False)
+            )
         else:
-            self.model = self.model.to("cpu")
-            
-        self.model.eval()
+            raise ValueError(f"Unknown backend: {self.backend} (expected 'torch' or 'onnx')")
+
+        # attention mask를 쓰지 않는 모델(group norm 특징 추출기)은 패딩이 결과를 바꾸므로 길이가 같은 발화만 묶음
+        self.pad_batches = getattr(self.processor.feature_extractor, "return_attention_mask", False)
+
+        # 디코딩: beam_width가 1이면 greedy(argmax), 2 이상이거나 목표 문장을 넘기면 CTC prefix beam search
+        decode_config = config.get("decode", {})
+        self.beam_width = decode_config.get("beam_width", 1)
+        self.bias_weight = decode_config.get("bias_weight", DEFAULT_BIAS_WEIGHT)
+        self.bias_order = decode_config.get("bias_order", DEFAULT_BIAS_ORDER)
+        self._decoder = None
+
+        # 무음 제거(VAD): 앞뒤 무음을 자르고, split_pause_ms가 있으면 그보다 긴 쉼에서 나눠 추론
+        self.vad = config.get("vad", {})
+        # 누적 통계 (요청별로 줄인 길이는 transcribe_batch(return_vad_savings=True)로 결과와 함께 받음)
+        self.vad_stats = {"requests": 0, "input_seconds": 0.0, "speech_seconds": 0.0}
+
+        # 전사 결과 캐시: 같은 오디오 바이트를 같은 모델 리비전/디코딩 설정으로 다시 추론하지 않음
+        cache_config = config.get("cache", {})
+        self.transcript_cache = TranscriptCache(cache_config["path"]) if cache_config.get("enabled", False) else None
+        self.revision = self._model_revision()
+        if self.revision is None and self.transcript_cache is not None:
+            # 리비전을 알 수 없으면 다시 학습한 모델에도 이전 전사 결과가 나올 수 있으므로 캐시를 쓰지 않음
+            print(f"[TranscriptCache] {self.model_id}의 리비전을 알 수 없어 전사 결과 캐시를 사용하지 않습니다.")
+            self.transcript_cache = None
         
+    @property
+    def decoder(self) -> CTCBeamSearchDecoder:
+        """CTC prefix beam search 디코더 (greedy만 쓰면 만들지 않도록 빔 탐색이나 목표 문장을 처음 쓸 때 생성)"""
+        if self._decoder is None:
+            self._decoder = CTCBeamSearchDecoder(
+                self.processor.tokenizer,
+                beam_width=self.beam_width if self.beam_width > 1 else DEFAULT_BEAM_WIDTH,
+                bias_weight=self.bias_weight,
+                bias_order=self.bias_order,
+            )
+        return self._decoder
+
+    def _model_revision(self):
+        """
+        캐시 키에 쓰는 모델 리비전
+        Hub 모델은 커밋 해시, ONNX와 로컬 체크포인트는 모델/가중치 파일의 크기와 수정 시각
+
+        Returns:
+            str | None: 리비전 (알 수 없으면 None)
+        """
+        if self.backend == "onnx":
+            stat = os.stat(self.model.model_path)
+            return f"onnx-{stat.st_size}-{int(stat.st_mtime)}"
+        commit_hash = getattr(self.model.config, "_commit_hash", None)
+        if commit_hash:
+            return commit_hash
+        if os.path.isdir(self.model_id):
+            # 다시 학습해 같은 경로에 저장하면 가중치 파일의 크기나 수정 시각이 바뀜 (샤드된 가중치 포함)
+            weights = sorted(name for name in os.listdir(self.model_id) if name.endswith((".safetensors", ".bin")))
+            if weights:
+                digest = hashlib.sha256()
+                for name in weights:
+                    stat = os.stat(os.path.join(self.model_id, name))
+                    digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+                return f"local-{digest.hexdigest()[:16]}"
+        return None
+
+    def cache_params(self, target: str = None) -> str:
+        """캐시 키에 쓰는 전처리/디코딩 설정 (결과에 영향을 주는 값만, JSON 문자열)"""
+        params = {
+            "backend": self.backend,
+            "quantize": self.config["model"].get("quantize", False) if self.backend == "onnx" else False,
+            "sampling_rate": self.sampling_rate,
+            "beam_width": self.beam_width,
+            "vad": {key: self.vad.get(key) for key in ("enabled", "threshold_db", "pad_ms", "split_pause_ms")},
+        }
+        if self.beam_width > 1 or target:
+            params.update(bias_weight=self.bias_weight, bias_order=self.bias_order, target=target)
+        return json.dumps(params, ensure_ascii=False, sort_keys=True)
+
+    def _group_by_params(self, count, targets):
+        groups = {}
+        for i in range(count):
+            groups.setdefault(self.cache_params(targets[i] if targets else None), []).append(i)
+        return groups.items()
+
+    def cached_transcripts(self, audio_hashes, targets=None) -> list:
+        """
+        캐시에 저장된 전사 결과 조회
+
+        Args:
+            audio_hashes: 발화별 원본 오디오 바이트의 sha256
+            targets: 발화별 목표 문장 (디코딩 설정의 일부), None이면 편향 없음
+
+        Returns:
+            list: 입력 순서대로의 전사 결과 (캐시를 쓰지 않거나 없으면 None)
+        """
+        results = [None] * len(audio_hashes)
+        if self.transcript_cache is None:
+            return results
+        for params, indices in self._group_by_params(len(audio_hashes), targets):
+            texts = self.transcript_cache.get_many([audio_hashes[i] for i in indices],
+                                                   self.model_id, self.revision, params)
+            for i, text in zip(indices, texts):
+                results[i] = text
+        return results
+
+    def store_transcripts(self, audio_hashes, texts, targets=None):
+        """전사 결과를 캐시에 저장 (캐시를 쓰지 않으면 무시)"""
+        if self.transcript_cache is None:
+            return
+        for params, indices in self._group_by_params(len(audio_hashes), targets):
+            self.transcript_cache.put_many([(audio_hashes[i], texts[i]) for i in indices],
+                                           self.model_id, self.revision, params)
+
     def preprocess_audio(self, audio_data: torch.Tensor, original_sr: int) -> np.ndarray:
-        """오디오 데이터 전처리"""
-        # 샘플링 레이트 변환
-        if original_sr != self.sampling_rate:
-            resampler = torchaudio.transforms.Resample(original_sr, self.sampling_rate)
-            audio_data = resampler(audio_data)
+        """
+        오디오 데이터 전처리 (모노 변환, float32 변환, 리샘플링, 볼륨 정규화를 CPU에서 한 번에 처리)
+        프로세서와 VAD가 numpy 배열을 받으므로 GPU에서 전처리하면 CPU로 복사했다가 추론 때 다시 GPU로 옮기게 됨
+        """
+        # 프로세서 입력용 numpy 배열 (CPU 텐서라 복사 없음)
+        audio = prepare_waveform(audio_data, original_sr, self.sampling_rate, device="cpu").numpy()
+
+        # 앞뒤 무음 제거 (음성을 찾지 못하면 그대로 둠)
+        if self.vad.get("enabled", False):
+            segments = self._speech_segments(audio, min_pause_ms=None)
+            kept = audio[segments[0][0]:segments[0][1]] if segments else audio
+            self._record_vad(len(audio), len(kept))
+            audio = kept
+        return audio
+
+    def preprocess_segments(self, audio_data, original_sr: int) -> tuple:
+        """
+        전처리 후 VAD로 앞뒤 무음을 자르고 split_pause_ms보다 긴 쉼에서 나눈 음성 구간 목록
+
+        Returns:
+            tuple: (음성 구간 목록, 이 요청에서 VAD로 줄인 추론 길이(초), VAD를 끄면 0.0)
+        """
+        audio = prepare_waveform(audio_data, original_sr, self.sampling_rate, device="cpu").numpy()
+        if not self.vad.get("enabled", False):
+            return [audio], 0.0
+
+        # split_pause_ms가 없으면 앞뒤 무음만 제거한 구간 하나
+        spans = self._speech_segments(audio, self.vad.get("split_pause_ms"))
+        segments = [audio[start:end] for start, end in spans] or [audio]
+        return segments, self._record_vad(len(audio), sum(len(segment) for segment in segments))
+
+    def _speech_segments(self, audio, min_pause_ms):
+        return speech_segments(
+            audio, self.sampling_rate,
+            threshold_db=self.vad.get("threshold_db", -35),
+            pad_ms=self.vad.get("pad_ms", 200),
+            min_pause_ms=min_pause_ms,
+        )
+
+    def _record_vad(self, input_samples, kept_samples) -> float:
+        """VAD로 줄인 추론 분량을 누적 통계에 더하고 이 요청에서 줄인 길이(초) 반환 (log가 켜져 있으면 요청마다 출력)"""
+        input_seconds = input_samples / self.sampling_rate
+        speech_seconds = kept_samples / self.sampling_rate
+        saved_seconds = input_seconds - speech_seconds
+        self.vad_stats["requests"] += 1
+        self.vad_stats["input_seconds"] += input_seconds
+        self.vad_stats["speech_seconds"] += speech_seconds
+        if self.vad.get("log", False):
+            print(f"[VAD] {input_seconds:.2f}s -> {speech_seconds:.2f}s ({saved_seconds:.2f}s 절약)")
+        return saved_seconds
+    
+    def transcribe_array(self, audio_data, sample_rate: int, target: str = None) -> str:
+        """디코딩된 오디오 (torch.Tensor 또는 [채널, 샘플] numpy 배열)를 텍스트로 변환 (target: 편향을 줄 목표 문장)"""
+        return self.transcribe_batch([audio_data], sample_rate, targets=[target])[0]
+
+    def transcribe_batch(self, waveforms, sample_rates=None, max_batch_seconds=None, targets=None,
+                         return_vad_savings: bool = False):
+        """
+        여러 발화를 길이순으로 정렬해 버킷 단위로 한 번에 추론
+        버킷마다 (발화 수 x 가장 긴 발화 길이)가 max_batch_seconds를 넘지 않도록 묶고, 결과는 입력 순서로 반환
         
-        # numpy로 변환
-        if isinstance(audio_data, torch.Tensor):
-            audio_data = audio_data.numpy()
-            
-        # 스테레오를 모노로 변환 (필요한 경우)
-        if len(audio_data.shape) > 1:
-            audio_data = np.mean(audio_data, axis=0)
+        Args:
+            waveforms: torch.Tensor / np.ndarray 목록 ([채널, 샘플] 또는 [샘플])
+            sample_rates: 입력 샘플링 레이트 (정수 하나 또는 발화별 목록, None이면 모델 샘플링 레이트)
+            max_batch_seconds: 버킷당 최대 오디오 길이 (패딩 포함, 초), None이면 설정값
+            targets: 발화별 목표 문장 목록 (빔 탐색에서 해당 문장의 음절 n-gram 쪽으로 편향), None이면 편향 없음
+            return_vad_savings: True면 발화별로 VAD가 줄인 추론 길이(초)도 함께 반환
         
-        # float32로 변환
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
-            
-        # 볼륨 정규화
-        if np.max(np.abs(audio_data)) > 0:
-            audio_data = audio_data / np.max(np.abs(audio_data))
-            
-        return audio_data
+        Returns:
+            list[str]: 입력 순서대로의 전사 결과
+            (return_vad_savings가 True면 (전사 결과 목록, 발화별 절약한 길이(초) 목록) 튜플)
+        """
+        if sample_rates is None:
+            sample_rates = self.sampling_rate
+        if isinstance(sample_rates, int):
+            sample_rates = [sample_rates] * len(waveforms)
+        if targets is None:
+            targets = [None] * len(waveforms)
+        budget = int((max_batch_seconds or self.max_batch_seconds) * self.sampling_rate)
+
+        # 전처리 (긴 쉼에서 나뉜 구간은 각각 별도 항목으로 추론한 뒤 이어 붙임)
+        audios, owners, vad_savings = [], [], []
+        for index, (w, sr) in enumerate(zip(waveforms, sample_rates)):
+            segments, saved_seconds = self.preprocess_segments(w, sr)
+            vad_savings.append(saved_seconds)
+            for segment in segments:
+                audios.append(segment)
+                owners.append(index)
+        segment_targets = [targets[owner] for owner in owners]
+
+        # 길이순으로 정렬해 패딩이 적은 버킷 구성 (예산보다 긴 발화는 단독 버킷)
+        transcriptions = [None] * len(audios)
+        bucket = []
+        for i in sorted(range(len(audios)), key=lambda i: len(audios[i])):
+            if bucket:
+                over_budget = (len(bucket) + 1) * len(audios[i]) > budget
+                needs_padding = not self.pad_batches and len(audios[i]) != len(audios[bucket[0]])
+                if over_budget or needs_padding:
+                    self._transcribe_bucket(audios, bucket, transcriptions, segment_targets)
+                    bucket = []
+            bucket.append(i)
+        if bucket:
+            self._transcribe_bucket(audios, bucket, transcriptions, segment_targets)
+
+        results = [[] for _ in waveforms]
+        for owner, text in zip(owners, transcriptions):
+            if text:
+                results[owner].append(text)
+        texts = [' '.join(texts) for texts in results]
+        return (texts, vad_savings) if return_vad_savings else texts
+
+    def _transcribe_bucket(self, audios, indices, transcriptions, targets):
+        """버킷 하나를 패딩해 한 번의 forward로 추론하고 transcriptions[i]에 결과 기록"""
+        # 모델 입력 준비 (attention mask는 프로세서 설정을 따름)
+        inputs = self.processor(
+            [audios[i] for i in indices], 
+            sampling_rate=self.sampling_rate, 
+            return_tensors="pt", 
+            padding=True
+        )
+        
+        # 디바이스 이동
+        inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
+        
+        # 추론
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+        
+        # 패딩 구간의 프레임을 제외하고 디코딩
+        input_lengths = torch.tensor([len(audios[i]) for i in indices])
+        output_lengths = self.model._get_feat_extract_output_lengths(input_lengths).tolist()
+        for i, utterance_logits, length in zip(indices, logits, output_lengths):
+            transcriptions[i] = self.decode_logits(utterance_logits[:length], targets[i])
+
+    def decode_logits(self, logits: torch.Tensor, target: str = None) -> str:
+        """
+        [프레임, 어휘] 로짓을 텍스트로 디코딩
+        beam_width가 1이고 목표 문장이 없으면 greedy(argmax), 그 외에는 CTC prefix beam search
+        """
+        if self.beam_width <= 1 and not target:
+            return self.processor.decode(torch.argmax(logits, dim=-1).cpu()).strip()
+        return self.decoder.decode(logits, targets=target)
+
+    def transcribe_stream(self, audio_data, sample_rate: int, chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+                          stride_seconds: float = DEFAULT_STRIDE_SECONDS):
+        """
+        긴 녹음을 겹치는 창 단위로 추론하는 스트리밍 전사 (녹음 길이와 관계없이 창 하나만큼의 추론 메모리 사용)
+        창마다 CTC 출력에서 앞뒤 stride 구간(이웃 창과 겹치는 부분)을 잘라내고, 새로 얻은 토큰만 디코딩해 이어 붙임
+        디코딩은 항상 greedy(argmax)이며 decode.beam_width와 목표 문장 편향은 적용하지 않음 (필요하면 transcribe_array 사용)
+        
+        Args:
+            audio_data: torch.Tensor 또는 np.ndarray ([채널, 샘플] 또는 [샘플])
+            sample_rate: 입력 샘플링 레이트
+            chunk_seconds: 한 번에 추론할 창 길이 (초)
+            stride_seconds: 창 양쪽의 문맥용 겹침 길이 (초)
+        
+        Yields:
+            str: 지금까지 처리한 구간의 전사 결과 (마지막 값이 전체 전사 결과)
+        """
+        audio = self.preprocess_audio(audio_data, sample_rate)
+        chunk_length = int(chunk_seconds * self.sampling_rate)
+        stride = int(stride_seconds * self.sampling_rate)
+        if chunk_length <= 2 * stride:
+            raise ValueError("chunk_seconds must be greater than twice stride_seconds")
+
+        # 출력 프레임 하나당 입력 샘플 수
+        hop = int(np.prod(self.model.config.conv_stride))
+        tokenizer = self.processor.tokenizer
+
+        # 다음 창은 이전 창의 유효 구간 끝에서 stride만큼 앞에서 시작
+        step = chunk_length - 2 * stride
+        text, last_id = "", None
+        for start in range(0, len(audio), step):
+            window = audio[start:start + chunk_length]
+            is_last = start + chunk_length >= len(audio)
+
+            inputs = self.processor(window, sampling_rate=self.sampling_rate, return_tensors="pt")
+            inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
+            with torch.no_grad():
+                logits = self.model(**inputs).logits[0]
+
+            # 이 창이 맡는 샘플 구간 (첫 창은 왼쪽, 마지막 창은 오른쪽 겹침을 남김)에서 시작하는 프레임만 사용
+            keep_start = 0 if start == 0 else stride
+            keep_end = len(window) if is_last else chunk_length - stride
+            left, right = -(-keep_start // hop), min(logits.shape[0], -(-keep_end // hop))
+            piece, last_id = self._ctc_piece(torch.argmax(logits[left:right], dim=-1).cpu().numpy(), last_id)
+            text += piece
+
+            result = text.strip()
+            if tokenizer.clean_up_tokenization_spaces:
+                result = tokenizer.clean_up_tokenization(result)
+            yield result
+            if is_last:
+                break
+
+    def _ctc_piece(self, ids: np.ndarray, last_id):
+        """
+        greedy 토큰 id 조각을 CTC 규칙(연속된 같은 토큰 합치기, blank 제거)으로 문자열 조각으로 변환
+        앞 조각의 마지막 토큰(last_id)을 이어 받아 창 경계에서도 processor.decode와 같게 합침
+
+        Returns:
+            tuple: (문자열 조각, 이 조각의 마지막 토큰 id)
+        """
+        if len(ids) == 0:
+            return "", last_id
+        tokenizer = self.processor.tokenizer
+        previous = np.concatenate(([-1 if last_id is None else last_id], ids[:-1]))
+        kept = ids[(ids != previous) & (ids != tokenizer.pad_token_id)]
+        piece = "".join(tokenizer.replace_word_delimiter_char if token == tokenizer.word_delimiter_token else token
+                        for token in tokenizer.convert_ids_to_tokens(kept.tolist()))
+        if tokenizer.do_lower_case:
+            piece = piece.lower()
+        return piece, int(ids[-1])
     
-    def transcribe(self, audio_file_path: str) -> str:
-        """오디오 파일을 텍스트로 변환"""
+    def transcribe(self, audio_file_path: str, target: str = None) -> str:
+        """오디오 파일을 텍스트로 변환 (target: 학습자가 읽어야 하는 목표 문장, 빔 탐색 편향에 사용)"""
         try:
             # 오디오 파일 로드
             audio_data, sample_rate = torchaudio.load(audio_file_path)
-            
-            # 전처리
-            audio_data = self.preprocess_audio(audio_data, sample_rate)
-            
-            # 모델 입력 준비
-            inputs = self.processor(
-                audio_data, 
-                sampling_rate=self.sampling_rate, 
-                return_tensors="pt", 
-                padding=True
-            )
-            
-            # 디바이스 이동
-            inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
-            
-            # 추론
-            with torch.no_grad():
-                logits = self.model(**inputs).logits
-            
-            # 디코딩
-            predicted_ids = torch.argmax(logits, dim=-1)
-            transcription = self.processor.batch_decode(predicted_ids)[0]
-            
-            return transcription.strip()
+            return self.transcribe_array(audio_data, sample_rate, target)
             
         except Exception as e:
             raise Exception(f"Audio transcription failed: {str(e)}")
     
-    def transcribe_from_bytes(self, audio_bytes: bytes, filename: str = "temp.wav") -> str:
-        """바이트 데이터에서 직접 음성 인식"""
-        import tempfile
-        import os
-        
+    def transcribe_from_bytes(self, audio_bytes: bytes, filename: str = "temp.wav", target: str = None) -> str:
+        """바이트 데이터에서 직접 음성 인식 (임시 파일 없이 메모리에서 디코딩, 캐시 사용 시 결과 재사용, filename은 호환용)"""
         try:
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-                temp_file.write(audio_bytes)
-                temp_file_path = temp_file.name
-            
-            # 음성 인식 수행
-            result = self.transcribe(temp_file_path)
-            
-            # 임시 파일 삭제
-            os.unlink(temp_file_path)
-            
-            return result
+            # 같은 오디오 바이트의 전사 결과가 캐시에 있으면 디코딩과 추론 생략
+            audio_hash = audio_sha256(audio_bytes) if self.transcript_cache is not None else None
+            if audio_hash is not None:
+                cached = self.cached_transcripts([audio_hash], [target])[0]
+                if cached is not None:
+                    return cached
+
+            audio_data, sample_rate = decode_audio_bytes(audio_bytes, self.sampling_rate)
+            text = self.transcribe_array(audio_data, sample_rate, target)
+            if audio_hash is not None:
+                self.store_transcripts([audio_hash], [text], [target])
+            return text
             
         except Exception as e:
-            raise Exception(f"Audio transcription from bytes failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Audio transcription from bytes failed: {str(e)}")